@@ -0,0 +1,113 @@
+"""
+OMNIOPSIS - Batched Metric Kernels
+===================================
+
+Array-level versions of the per-image metrics of beacon_search.py,
+statistical_validation.py and validation_multires.py.
+
+Every kernel takes a (batch, H, W, 3) uint8 tensor and returns one value
+per image, using a single bincount / fft2 / reduction over the whole stack
+instead of one small NumPy call per image.
+
+Two conventions exist in the scripts and both are available:
+- beacon_search (eps=None): exact entropy, spectral flatness over the
+  magnitudes above 1e-10
+- statistical_validation / validation_multires (eps=1e-10): epsilon added
+  inside the logarithms and to the arithmetic mean
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+
+from compression import batch_compression_ratios
+
+# ============================================================================
+# HISTOGRAM METRICS
+# ============================================================================
+
+def batch_histograms(images):
+    """256-bin histogram of each image, shape (batch, 256), via one bincount."""
+    flat = images.reshape(len(images), -1)
+    offsets = (np.arange(len(images), dtype=np.int64) * 256)[:, None]
+    counts = np.bincount((flat + offsets).ravel(), minlength=256 * len(images))
+    return counts.reshape(len(images), 256)
+
+def batch_entropy(images, eps=None, histograms=None):
+    """Shannon entropy in bits of each image."""
+    hist = batch_histograms(images) if histograms is None else histograms
+    prob = hist / hist.sum(axis=1, keepdims=True)
+    present = prob > 0
+    log_prob = np.log2(np.where(present, prob + (eps or 0.0), 1.0))
+    return -np.sum(np.where(present, prob * log_prob, 0.0), axis=1)
+
+def batch_unique_values(images, histograms=None):
+    """Number of distinct component values in each image."""
+    hist = batch_histograms(images) if histograms is None else histograms
+    return np.count_nonzero(hist, axis=1)
+
+# ============================================================================
+# SPECTRAL FLATNESS
+# ============================================================================
+
+def batch_spectral_flatness(images, eps=None):
+    """
+    Spectral flatness of the grayscale FFT magnitude of each image.
+
+    One fft2 over the whole stack; fftshift is omitted since both means are
+    invariant to the ordering of the coefficients.
+    """
+    gray = images.mean(axis=3)
+    magnitude = np.abs(np.fft.fft2(gray)).reshape(len(images), -1)
+
+    if eps is not None:
+        geometric_mean = np.exp(np.mean(np.log(magnitude + eps), axis=1))
+        arithmetic_mean = np.mean(magnitude, axis=1)
+        return geometric_mean / (arithmetic_mean + eps)
+
+    mask = magnitude > 1e-10
+    n_positive = mask.sum(axis=1)
+    log_sum = np.sum(np.log(np.where(mask, magnitude, 1.0)), axis=1)
+    geometric_mean = np.exp(log_sum / n_positive)
+    arithmetic_mean = np.sum(np.where(mask, magnitude, 0.0), axis=1) / n_positive
+    return geometric_mean / arithmetic_mean
+
+# ============================================================================
+# PIXEL STATISTICS
+# ============================================================================
+
+def batch_pixel_std(images):
+    """Standard deviation of the components of each image."""
+    return images.reshape(len(images), -1).std(axis=1)
+
+def batch_pixel_range(images):
+    """max - min of the components of each image."""
+    flat = images.reshape(len(images), -1)
+    return flat.max(axis=1).astype(np.int64) - flat.min(axis=1)
+
+def batch_compression_ratio(images, backend='gzip', level=None, workers=None):
+    """Compression ratio of each image's raw bytes (see compression.py, thread-pooled)."""
+    return batch_compression_ratios(images.reshape(len(images), -1), backend, level, workers)
+
+# ============================================================================
+# ALL METRICS
+# ============================================================================
+
+def batch_compute_metrics(images, eps=None, compression_backend='gzip'):
+    """
+    Batched equivalent of beacon_search.compute_metrics.
+
+    Returns:
+        dict: metric name → array of shape (batch,)
+    """
+    images = np.ascontiguousarray(images, dtype=np.uint8)
+    hist = batch_histograms(images)
+    return {
+        'shannon_entropy': batch_entropy(images, eps=eps, histograms=hist),
+        'compression_ratio': batch_compression_ratio(images, compression_backend),
+        'spectral_flatness': batch_spectral_flatness(images, eps=eps),
+        'pixel_std': batch_pixel_std(images),
+        'pixel_range': batch_pixel_range(images),
+        'unique_values': batch_unique_values(images, histograms=hist),
+    }
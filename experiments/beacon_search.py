@@ -18,101 +18,34 @@ sys.set_int_max_str_digits(500000)
 import numpy as np
 from pathlib import Path
 import json
-import gzip
 from datetime import datetime
-from PIL import Image
 
 # ============================================================================
 # MATHEMATICAL CONSTANTS TO TEST
 # ============================================================================
 
-CONSTANTS = {
-    # Algebraic
-    'sqrt2': np.sqrt(2),           # √2 ≈ 1.41421
-    'sqrt3': np.sqrt(3),           # √3 ≈ 1.73205
-    'sqrt5': np.sqrt(5),           # √5 ≈ 2.23607
-    'golden_phi': (1 + np.sqrt(5)) / 2,  # φ ≈ 1.61803
-    'silver': 1 + np.sqrt(2),      # δₛ ≈ 2.41421
-    
-    # Transcendental
-    'pi': np.pi,                   # π ≈ 3.14159
-    'e': np.e,                     # e ≈ 2.71828
-    'tau': 2 * np.pi,              # τ = 2π ≈ 6.28318
-    'ln2': np.log(2),              # ln(2) ≈ 0.69315
-    'log10_e': np.log10(np.e),     # log₁₀(e) ≈ 0.43429
-    
-    # Mathematical constants
-    'euler_gamma': 0.5772156649,   # γ (Euler-Mascheroni)
-    'apery': 1.2020569,            # ζ(3) (Apéry's constant)
-    'catalan': 0.915965594,        # G (Catalan's constant)
-    'khinchin': 2.6854520010,      # K₀ (Khinchin's constant)
-    'glaisher': 1.2824271291,      # A (Glaisher-Kinkelin)
-    
-    # Multiples for testing
-    'pi_2': np.pi / 2,
-    'pi_4': np.pi / 4,
-    '2pi': 2 * np.pi,
-    '3pi': 3 * np.pi,
-    'e_2': np.e / 2,
-    '2e': 2 * np.e,
-}
+#
+# Declared (as values or expressions such as "2 * pi") in registry.py.
+
+from registry import CONSTANTS
 
 # ============================================================================
 # GENERATION FUNCTIONS TO TEST
 # ============================================================================
+#
+# The generators are declared as expressions in registry.py and compiled
+# into the whole-array NumPy kernels of generators.py, shared by every
+# experiment script.
 
-def gen_sin_i2(i, c):
-    """Original: sin(i² × c)"""
-    return 128 + 127 * np.sin(i**2 * c)
-
-def gen_cos_i2(i, c):
-    """Cosine variant: cos(i² × c)"""
-    return 128 + 127 * np.cos(i**2 * c)
-
-def gen_sin_i(i, c):
-    """Linear: sin(i × c)"""
-    return 128 + 127 * np.sin(i * c)
-
-def gen_sin_i3(i, c):
-    """Cubic: sin(i³ × c)"""
-    return 128 + 127 * np.sin(i**3 * c)
-
-def gen_mod_i2(i, c):
-    """Modulo: (i² × c) mod 256"""
-    return int((i**2 * c)) % 256
-
-def gen_mod_i(i, c):
-    """Linear modulo: (i × c) mod 256"""
-    return int((i * c)) % 256
-
-def gen_frac_i2(i, c):
-    """Fractional part scaled: frac(i² × c) × 256"""
-    return int(((i**2 * c) % 1) * 256)
-
-def gen_tan_i2(i, c):
-    """Tangent (bounded): tanh(i² × c)"""
-    return int(128 + 127 * np.tanh(i**2 * c * 0.001))  # Scaled to avoid overflow
-
-def gen_sin_log(i, c):
-    """Logarithmic: sin(log(i+1) × c)"""
-    return 128 + 127 * np.sin(np.log(i + 1) * c)
-
-def gen_sin_sqrt(i, c):
-    """Square root: sin(√i × c)"""
-    return 128 + 127 * np.sin(np.sqrt(i) * c)
-
-GENERATORS = {
-    'sin_i2': gen_sin_i2,
-    'cos_i2': gen_cos_i2,
-    'sin_i': gen_sin_i,
-    'sin_i3': gen_sin_i3,
-    'mod_i2': gen_mod_i2,
-    'mod_i': gen_mod_i,
-    'frac_i2': gen_frac_i2,
-    'tan_i2': gen_tan_i2,
-    'sin_log': gen_sin_log,
-    'sin_sqrt': gen_sin_sqrt,
-}
+from generators import (
+    GENERATORS,
+    gen_sin_i2, gen_cos_i2, gen_sin_i, gen_sin_i3, gen_mod_i2,
+    gen_mod_i, gen_frac_i2, gen_tan_i2, gen_sin_log, gen_sin_sqrt,
+    generate_digits,
+)
+from compression import compression_ratio
+from image_store import ImageStore
+from search_log import TopN, SearchLog
 
 # ============================================================================
 # IMAGE GENERATION
@@ -121,22 +54,16 @@ GENERATORS = {
 def generate_image(generator_func, constant, resolution=8):
     """Generate image using specified generator and constant."""
     n = 3 * resolution * resolution
-    digits = []
-    
-    for i in range(n):
-        val = generator_func(i, constant)
-        digit = int(np.floor(val)) % 256  # Ensure [0, 255]
-        digits.append(digit)
-    
-    img_array = np.array(digits, dtype=np.uint8).reshape(resolution, resolution, 3)
+    digits = generate_digits(generator_func, constant, n)
+    img_array = digits.reshape(resolution, resolution, 3)
     return img_array, digits
 
 # ============================================================================
 # METRICS COMPUTATION
 # ============================================================================
 
-def compute_metrics(img_array, digits):
-    """Compute all metrics for a single image."""
+def compute_metrics(img_array, digits, compression_backend='gzip'):
+    """Compute all metrics for a single image (compression backend: see compression.py)."""
     
     # Shannon Entropy
     hist, _ = np.histogram(img_array.flatten(), bins=256, range=(0, 256))
@@ -145,9 +72,7 @@ def compute_metrics(img_array, digits):
     shannon_entropy = -np.sum(prob * np.log2(prob))
     
     # Compression
-    data = bytes(digits)
-    compressed = gzip.compress(data, compresslevel=9)
-    compression_ratio = len(compressed) / len(data)
+    ratio = compression_ratio(digits, compression_backend)
     
     # Spectral Flatness
     gray = np.mean(img_array, axis=2)
@@ -165,7 +90,7 @@ def compute_metrics(img_array, digits):
     
     return {
         'shannon_entropy': float(shannon_entropy),
-        'compression_ratio': float(compression_ratio),
+        'compression_ratio': float(ratio),
         'spectral_flatness': float(spectral_flatness),
         'pixel_std': pixel_std,
         'pixel_range': pixel_range,
@@ -216,26 +141,51 @@ def compute_transmodal_score(metrics):
 # SYSTEMATIC SEARCH
 # ============================================================================
 
-def systematic_search(resolution=8, top_n=20):
+def systematic_search(resolution=8, top_n=20, workers=1, chunksize=16, log_file=None,
+                      resume=True):
     """
     Systematically test all combinations of generators and constants.
     Return top N candidates ranked by transmodality score.
+    
+    With workers != 1 the grid is sharded over a process pool
+    (see parallel_search.py; workers=None uses every core).
+    
+    Only the top N are kept in memory. With log_file, every evaluated
+    combination is appended to a JSONL log that doubles as a checkpoint:
+    with resume=True a restarted search skips the logged combinations
+    (see search_log.py).
     """
     
+    if workers != 1:
+        from parallel_search import parallel_search
+        return parallel_search(resolutions=(resolution,), top_n=top_n,
+                               workers=workers, chunksize=chunksize,
+                               log_file=log_file, resume=resume)
+    
     print("="*70)
     print("SYSTEMATIC TRANSMODAL BEACON SEARCH")
     print("="*70)
     print(f"Constants to test: {len(CONSTANTS)}")
     print(f"Generators to test: {len(GENERATORS)}")
     print(f"Total combinations: {len(CONSTANTS) * len(GENERATORS)}")
-    print()
     
-    results = []
+    top = TopN(top_n)
     total = len(CONSTANTS) * len(GENERATORS)
     count = 0
+    log = None
+    if log_file is not None:
+        from parallel_search import search_grid
+        log = SearchLog(log_file, search_grid(CONSTANTS, GENERATORS, (resolution,)), total, resume)
+        count = log.open(top)
+        print(f"Log: {log_file} ({count} combinations already done)")
+    print()
     
+    index = -1
     for const_name, const_value in CONSTANTS.items():
         for gen_name, gen_func in GENERATORS.items():
+            index += 1
+            if log is not None and log.done[index]:
+                continue
             count += 1
             
             combo_name = f"{gen_name}_{const_name}"
@@ -250,41 +200,53 @@ def systematic_search(resolution=8, top_n=20):
                 # Compute score
                 score = compute_transmodal_score(metrics)
                 
-                result = {
-                    'name': combo_name,
-                    'generator': gen_name,
-                    'constant': const_name,
-                    'constant_value': float(const_value),
-                    'metrics': metrics,
-                    'score': score
-                }
-                
-                results.append(result)
-                
-                # Progress
-                if count % 20 == 0 or score['total'] > 50:
-                    status = "★★★" if score['total'] > 60 else "★★" if score['total'] > 40 else "★"
-                    print(f"[{count:3d}/{total}] {combo_name:30s} | Score: {score['total']:5.1f} {status}")
-                    if score['total'] > 50:
-                        print(f"         → Entropy: {metrics['shannon_entropy']:.2f} | "
-                              f"Compress: {metrics['compression_ratio']:.4f} | "
-                              f"Spectral: {metrics['spectral_flatness']:.4f}")
-                
             except Exception as e:
                 print(f"[{count:3d}/{total}] {combo_name:30s} | ERROR: {e}")
+                if log is not None:
+                    log.write(index, {'name': combo_name, 'error': str(e)})
                 continue
+            
+            result = {
+                'name': combo_name,
+                'generator': gen_name,
+                'constant': const_name,
+                'constant_value': float(const_value),
+                'metrics': metrics,
+                'score': score
+            }
+            
+            top.push(index, result)
+            if log is not None:
+                log.write(index, result)
+            
+            # Progress
+            if count % 20 == 0 or score['total'] > 50:
+                status = "★★★" if score['total'] > 60 else "★★" if score['total'] > 40 else "★"
+                print(f"[{count:3d}/{total}] {combo_name:30s} | Score: {score['total']:5.1f} {status}")
+                if score['total'] > 50:
+                    print(f"         → Entropy: {metrics['shannon_entropy']:.2f} | "
+                          f"Compress: {metrics['compression_ratio']:.4f} | "
+                          f"Spectral: {metrics['spectral_flatness']:.4f}")
     
-    # Sort by score
-    results.sort(key=lambda x: x['score']['total'], reverse=True)
+    if log is not None:
+        log.close()
     
-    return results[:top_n]
+    return top.results()
 
 # ============================================================================
 # RESULTS REPORTING
 # ============================================================================
 
-def report_top_candidates(candidates, output_dir):
-    """Generate detailed report of top candidates."""
+def report_top_candidates(candidates, output_dir, store=None, export_png=True, total_tested=None):
+    """
+    Generate detailed report of top candidates.
+    
+    Images are written once to the shared image store (image_store.py);
+    PNG export is optional. total_tested defaults to the size of the
+    CONSTANTS × GENERATORS grid.
+    """
+    
+    store = ImageStore() if store is None else store
     
     print("\n" + "="*70)
     print("TOP TRANSMODAL BEACONS DISCOVERED")
@@ -314,32 +276,31 @@ def report_top_candidates(candidates, output_dir):
         
         # Save image
         if i <= 10:  # Save top 10
-            img_array, _ = generate_image(
-                GENERATORS[candidate['generator']],
-                candidate['constant_value'],
-                resolution=8
-            )
-            img_pil = Image.fromarray(img_array, 'RGB')
+            key = (candidate['generator'], candidate['constant_value'], 8)
+            store.get_or_generate(*key)
             
-            # Small version
-            img_pil.save(output_dir / f"beacon_rank{i:02d}_{candidate['name']}_8x8.png")
-            
-            # Large version for visualization
-            img_large = img_pil.resize((128, 128), Image.NEAREST)
-            img_large.save(output_dir / f"beacon_rank{i:02d}_{candidate['name']}_128x128.png")
+            if export_png:
+                # Small version
+                store.export_png(*key, output_dir / f"beacon_rank{i:02d}_{candidate['name']}_8x8.png")
+                
+                # Large version for visualization
+                store.export_png(*key, output_dir / f"beacon_rank{i:02d}_{candidate['name']}_128x128.png",
+                                 size=128)
     
     # Save full results as JSON
     results_file = output_dir / "beacon_search_results.json"
     with open(results_file, 'w') as f:
         json.dump({
             'timestamp': datetime.now().isoformat(),
-            'total_tested': len(CONSTANTS) * len(GENERATORS),
+            'total_tested': len(CONSTANTS) * len(GENERATORS) if total_tested is None else total_tested,
             'top_candidates': candidates
         }, f, indent=2)
     
     print(f"\n{'='*70}")
     print(f"Results saved to: {results_file}")
-    print(f"Images saved to: {output_dir}")
+    print(f"Images stored in: {store.path}")
+    if export_png:
+        print(f"Images saved to: {output_dir}")
     print(f"{'='*70}")
 
 # ============================================================================
@@ -352,7 +313,9 @@ if __name__ == "__main__":
     
     try:
         # Run systematic search
-        top_candidates = systematic_search(resolution=8, top_n=20)
+        top_candidates = systematic_search(
+            resolution=8, top_n=20,
+            log_file="experiments/results/beacon_search/search_log.jsonl")
         
         # Report results
         report_top_candidates(top_candidates, "experiments/results/beacon_search")
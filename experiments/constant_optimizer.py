@@ -0,0 +1,249 @@
+"""
+OMNIOPSIS - Continuous Constant Optimizer
+==========================================
+
+Beacon search over c as a continuous parameter instead of the ~21 named
+values of CONSTANTS.
+
+For each generator:
+1. Coarse scan: the transmodality score is evaluated on a dense grid of c
+   over an interval. Images of a whole batch of constants are generated by
+   one kernel call (the kernels broadcast over a (batch, 1) constant column)
+   and measured with the batched kernels of batch_metrics.py; batches are
+   spread over a process pool.
+2. Refinement: every local maximum of the scan is refined inside the
+   bracket formed by its grid neighbours with Brent's bounded method
+   (golden-section steps with parabolic interpolation).
+
+The score of a fixed-resolution image is piecewise constant in c (digits
+are floored), so refinement mostly locates the best plateau near each scan
+peak; the reported maximum is the better of the scan and refined points.
+Each maximum is also labelled with the nearest named constant.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import os
+from multiprocessing import Pool
+
+import numpy as np
+from scipy.optimize import minimize_scalar
+from scipy.signal import find_peaks
+
+from beacon_search import CONSTANTS, GENERATORS, compute_transmodal_score
+from batch_metrics import batch_compute_metrics
+from generators import get_generator, values_to_digits
+
+DEFAULT_INTERVAL = (0.01, 10.0)
+
+# ============================================================================
+# BATCHED SCORING
+# ============================================================================
+
+def batch_generate_images(generator, constants, resolution=8):
+    """
+    Images of one generator for a batch of constants, in one kernel call.
+
+    Returns:
+        np.ndarray: uint8 array of shape (len(constants), resolution, resolution, 3)
+    """
+    constants = np.asarray(constants, dtype=np.float64)
+    n = 3 * resolution * resolution
+    i = np.broadcast_to(np.arange(n, dtype=np.int64), (len(constants), n))
+    digits = values_to_digits(get_generator(generator)(i, constants[:, None]))
+    return digits.reshape(len(constants), resolution, resolution, 3)
+
+def _metric_dicts(batch):
+    for j in range(len(batch['shannon_entropy'])):
+        yield {
+            'shannon_entropy': float(batch['shannon_entropy'][j]),
+            'compression_ratio': float(batch['compression_ratio'][j]),
+            'spectral_flatness': float(batch['spectral_flatness'][j]),
+            'pixel_std': float(batch['pixel_std'][j]),
+            'pixel_range': int(batch['pixel_range'][j]),
+            'unique_values': int(batch['unique_values'][j]),
+        }
+
+def score_constants(generator, constants, resolution=8, return_metrics=False):
+    """
+    Transmodality scores (and optionally metrics) of a batch of constants.
+
+    Returns:
+        np.ndarray: Total scores, shape (len(constants),)
+    """
+    if len(constants) == 0:
+        return (np.empty(0), []) if return_metrics else np.empty(0)
+    batch = batch_compute_metrics(batch_generate_images(generator, constants, resolution))
+    metrics = list(_metric_dicts(batch))
+    scores = np.array([compute_transmodal_score(m)['total'] for m in metrics])
+    if return_metrics:
+        return scores, metrics
+    return scores
+
+def _score_chunk(task):
+    generator, constants, resolution = task
+    return score_constants(generator, constants, resolution)
+
+# ============================================================================
+# COARSE SCAN
+# ============================================================================
+
+def coarse_scan(generator, interval=DEFAULT_INTERVAL, n_points=100_000, resolution=8,
+                batch_size=4096, pool=None):
+    """
+    Score a generator on a uniform grid of constants.
+
+    Args:
+        generator: Generator name
+        interval: (low, high) range of c
+        n_points: Number of grid points
+        batch_size: Constants per kernel call / worker task
+        pool: Optional multiprocessing Pool to spread the batches over
+
+    Returns:
+        tuple: (grid, scores) arrays
+    """
+    grid = np.linspace(interval[0], interval[1], n_points)
+    tasks = [(generator, grid[k:k + batch_size], resolution)
+             for k in range(0, n_points, batch_size)]
+    chunks = pool.map(_score_chunk, tasks) if pool is not None else map(_score_chunk, tasks)
+    return grid, np.concatenate([np.empty(0), *chunks])
+
+def scan_peaks(scores, n_peaks=10):
+    """Indices of the n_peaks highest local maxima of a scan (plateaus count once)."""
+    peaks, _ = find_peaks(np.concatenate([[-np.inf], scores, [-np.inf]]))
+    peaks = peaks - 1
+    order = np.argsort(-scores[peaks], kind='stable')
+    return peaks[order[:n_peaks]]
+
+# ============================================================================
+# REFINEMENT
+# ============================================================================
+
+def refine_peak(generator, low, high, resolution=8, xatol=1e-12, maxiter=200):
+    """
+    Maximize the score of a generator over c in [low, high] (Brent, bounded).
+
+    Returns:
+        dict: {'constant_value', 'score', 'evaluations'}
+    """
+    def negative_score(c):
+        return -score_constants(generator, [c], resolution)[0]
+
+    result = minimize_scalar(negative_score, bounds=(low, high), method='bounded',
+                             options={'xatol': xatol, 'maxiter': maxiter})
+    return {'constant_value': float(result.x), 'score': float(-result.fun),
+            'evaluations': int(result.nfev)}
+
+def nearest_constant(value):
+    """(name, relative distance) of the named constant closest to value."""
+    name = min(CONSTANTS, key=lambda k: abs(CONSTANTS[k] - value))
+    return name, abs(CONSTANTS[name] - value) / abs(CONSTANTS[name])
+
+def local_maxima(generator, interval=DEFAULT_INTERVAL, n_points=100_000, resolution=8,
+                 n_peaks=10, xatol=1e-12, batch_size=4096, pool=None):
+    """
+    Coarse scan then per-peak refinement for one generator.
+
+    Returns:
+        list: Local maxima as beacon_search result dicts (name, generator,
+              constant, constant_value, metrics, score) plus scan_score,
+              evaluations (Brent refinement) and nearest_constant, best first
+    """
+    grid, scores = coarse_scan(generator, interval, n_points, resolution, batch_size, pool)
+    maxima = []
+    for j in scan_peaks(scores, n_peaks):
+        low, high = grid[max(j - 1, 0)], grid[min(j + 1, len(grid) - 1)]
+        refined = refine_peak(generator, low, high, resolution, xatol)
+
+        value = refined['constant_value'] if refined['score'] > scores[j] else float(grid[j])
+        score_values, metrics = score_constants(generator, [value], resolution, return_metrics=True)
+        name, distance = nearest_constant(value)
+        maxima.append({
+            'name': f"{generator}_c={value:.12g}",
+            'generator': generator,
+            'constant': f"c={value:.12g}",
+            'constant_value': value,
+            'metrics': metrics[0],
+            'score': compute_transmodal_score(metrics[0]),
+            'scan_score': float(scores[j]),
+            'evaluations': refined['evaluations'],
+            'nearest_constant': name,
+            'nearest_constant_distance': float(distance),
+        })
+    maxima.sort(key=lambda m: m['score']['total'], reverse=True)
+    return maxima
+
+# ============================================================================
+# CONTINUOUS SEARCH
+# ============================================================================
+
+def continuous_search(generators=None, interval=DEFAULT_INTERVAL, n_points=100_000, resolution=8,
+                      n_peaks=10, top_n=20, xatol=1e-12, batch_size=4096, workers=None,
+                      return_evaluations=False):
+    """
+    Continuous-constant beacon search over several generators.
+
+    Args:
+        generators: Generator names (default: all GENERATORS)
+        interval: (low, high) range of c
+        n_points: Coarse grid points per generator
+        n_peaks: Scan peaks refined per generator
+        top_n: Number of maxima returned
+        workers: Processes for the coarse scans (default: all cores, 1 = in-process)
+        return_evaluations: Also return the number of scored constants (scan
+                            points, refinement evaluations and the final
+                            scoring of every maximum)
+
+    Returns:
+        list: Top N local maxima over all generators, best first (and the
+              evaluation count)
+    """
+    generators = list(GENERATORS) if generators is None else list(generators)
+    workers = workers or os.cpu_count() or 1
+
+    print("="*70)
+    print("CONTINUOUS-CONSTANT BEACON SEARCH")
+    print("="*70)
+    print(f"Generators: {len(generators)}")
+    print(f"Interval: c ∈ [{interval[0]}, {interval[1]}], {n_points} scan points each")
+    print(f"Resolution: {resolution}×{resolution} ({workers} workers)")
+    print()
+
+    pool = Pool(processes=workers) if workers > 1 else None
+    try:
+        maxima = []
+        for gen_name in generators:
+            found = local_maxima(gen_name, interval, n_points, resolution, n_peaks, xatol,
+                                 batch_size, pool)
+            maxima.extend(found)
+            if found:
+                best = found[0]
+                print(f"✓ {gen_name:10s} | best c = {best['constant_value']:.12g} "
+                      f"(≈ {best['nearest_constant']}) | Score: {best['score']['total']:5.1f}")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    maxima.sort(key=lambda m: m['score']['total'], reverse=True)
+    if return_evaluations:
+        evaluations = n_points * len(generators) + sum(m['evaluations'] + 1 for m in maxima)
+        return maxima[:top_n], evaluations
+    return maxima[:top_n]
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    from beacon_search import report_top_candidates
+
+    top_candidates, evaluations = continuous_search(n_points=100_000, return_evaluations=True)
+    report_top_candidates(top_candidates, "experiments/results/continuous_search",
+                          total_tested=evaluations)
+
+    print("\n" + "="*70)
+    print("✓ CONTINUOUS SEARCH COMPLETE")
+    print("="*70)
@@ -0,0 +1,161 @@
+"""
+OMNIOPSIS - Cubical Persistence
+================================
+
+Sublevel-set persistent homology computed directly on the pixel grid.
+
+Instead of turning an image into a point cloud and building a Rips
+complex, the grayscale (or one channel) values filter a cubical complex
+on the grid:
+- 'V' construction: pixels are vertices, edges and squares enter at the
+  maximum of their pixels (4-connected sublevel sets)
+- 'T' construction: pixels are squares, shared edges and vertices enter
+  at the minimum of their pixels (8-connected sublevel sets)
+
+H0 is a union-find sweep over the pixels in increasing order (elder rule).
+H1 follows from Alexander duality: the holes of a sublevel set are the
+bounded components of its complement, so H1 is a union-find sweep in
+decreasing order with the dual connectivity and a virtual pixel outside
+the image. Both sweeps are O(N log N) for N pixels (sort + union-find),
+which keeps 512×512 beacons within seconds.
+
+Diagrams are returned in Ripser format ([H0, H1], (birth, death) rows).
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+
+CUBICAL_METHOD = 'cubical (sublevel sets)'
+
+# Neighbour offsets (dy, dx)
+CONNECTIVITY = {
+    4: ((-1, 0), (1, 0), (0, -1), (0, 1)),
+    8: ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)),
+}
+
+# (sublevel connectivity for H0, complement connectivity for H1)
+CONSTRUCTIONS = {'V': (4, 8), 'T': (8, 4)}
+
+# ============================================================================
+# FILTRATION VALUES
+# ============================================================================
+
+def image_filtration(img_array, channel='gray'):
+    """Pixel values filtering the grid: 'gray' (channel mean) or a channel index."""
+    img_array = np.asarray(img_array)
+    if img_array.ndim == 2:
+        return img_array.astype(np.float64)
+    if channel == 'gray':
+        return np.mean(img_array, axis=2)
+    return img_array[..., int(channel)].astype(np.float64)
+
+# ============================================================================
+# UNION-FIND SWEEP
+# ============================================================================
+
+def _sweep(values, connectivity, descending=False, outside=False):
+    """
+    Elder-rule union-find sweep over the pixels of a 2D array.
+
+    Pixels enter in increasing (or decreasing) order of value and are
+    merged with their already-entered neighbours; when two components
+    meet, the younger one dies at the current value.
+
+    Args:
+        values: (h, w) float array
+        connectivity: 4 or 8
+        descending: Sweep from the highest value down
+        outside: Add a virtual pixel, present from the start, adjacent to
+                 the whole image border
+
+    Returns:
+        list: (birth, death) pairs of the components that died
+    """
+    h, w = values.shape
+    flat = values.ravel().tolist()
+    order = np.argsort(-values.ravel() if descending else values.ravel(), kind='stable').tolist()
+    offsets = CONNECTIVITY[connectivity]
+
+    n = h * w
+    parent = list(range(n + 1))
+    entered = [False] * (n + 1)
+    birth = flat + [np.inf if descending else -np.inf]
+    # For a descending sweep the component with the higher birth is the elder
+    elder = (lambda a, b: birth[a] >= birth[b]) if descending else (lambda a, b: birth[a] <= birth[b])
+    if outside:
+        entered[n] = True
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    pairs = []
+    for p in order:
+        entered[p] = True
+        value = flat[p]
+        y, x = divmod(p, w)
+
+        neighbors = [(y + dy) * w + (x + dx) for dy, dx in offsets
+                     if 0 <= y + dy < h and 0 <= x + dx < w]
+        if outside and (y == 0 or x == 0 or y == h - 1 or x == w - 1):
+            neighbors.append(n)
+
+        for q in neighbors:
+            if not entered[q]:
+                continue
+            a, b = find(p), find(q)
+            if a == b:
+                continue
+            if not elder(a, b):
+                a, b = b, a
+            # b (the younger root) dies here
+            if birth[b] != value:
+                pairs.append((birth[b], value))
+            parent[b] = a
+
+    return pairs
+
+# ============================================================================
+# PERSISTENCE
+# ============================================================================
+
+def cubical_persistence(img_array, channel='gray', construction='V'):
+    """
+    H0 and H1 sublevel-set persistence of an image.
+
+    Args:
+        img_array: (h, w, 3) image or (h, w) array of values
+        channel: 'gray' or a channel index (see image_filtration)
+        construction: 'V' (pixels as vertices) or 'T' (pixels as squares)
+
+    Returns:
+        dict: Persistence result in the format of the Rips backends
+              (diagrams [H0, H1], method, n_points, max_dimension)
+    """
+    if construction not in CONSTRUCTIONS:
+        raise ValueError(f"Unknown cubical construction: {construction!r}")
+    values = image_filtration(img_array, channel)
+    h0_connectivity, h1_connectivity = CONSTRUCTIONS[construction]
+
+    # H0: sublevel components, plus the essential class born at the minimum
+    h0 = _sweep(values, h0_connectivity)
+    h0.append((float(values.min()), np.inf))
+
+    # H1: complement components in decreasing order; a component that
+    # splits off at v and vanishes at b is a hole (v, b) of the sublevel sets
+    h1 = [(death, birth) for birth, death in
+          _sweep(values, h1_connectivity, descending=True, outside=True)]
+
+    return {
+        'diagrams': [np.array(h0, dtype=np.float64).reshape(-1, 2),
+                     np.array(sorted(h1), dtype=np.float64).reshape(-1, 2)],
+        'method': CUBICAL_METHOD,
+        'n_points': int(values.size),
+        'max_dimension': 1,
+        'channel': channel,
+        'construction': construction
+    }
@@ -0,0 +1,294 @@
+"""
+OMNIOPSIS - Persistence Diagram Similarity Index
+=================================================
+
+"Which beacon is topologically closest to this image?"
+
+Exact diagram distances (bottleneck, p-Wasserstein) need an optimal
+matching per pair, O((n+m)³), so all-pairs comparisons of thousands of
+homology results are out of reach. DiagramIndex answers nearest-neighbour
+queries in two stages:
+
+1. Approximate: every diagram is turned into a fixed-length vector
+   (persistence landscapes or persistence images on a grid shared by the
+   whole index); candidates are the nearest vectors in Euclidean distance
+2. Exact: candidates are re-ranked with the bottleneck or Wasserstein
+   distance. A candidate is skipped without any matching when the lower
+   bound |maxpers(X) - maxpers(Y)| / 2 ≤ d_B ≤ W_p already exceeds the
+   current k-th best distance
+
+Distances use the L∞ ground metric between points and match essential
+(infinite) bars by sorted birth; different numbers of essential bars give
+an infinite distance.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import json
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching
+
+from persistence_diagram import PersistenceDiagram
+
+SUMMARIES = ['landscape', 'image']
+METRICS = ['bottleneck', 'wasserstein']
+
+# ============================================================================
+# EXACT DISTANCES
+# ============================================================================
+
+def _augmented_costs(X, Y):
+    """
+    (n+m)×(n+m) matching costs between finite diagrams X (n, 2) and Y (m, 2).
+
+    Rows are X then the diagonal copies of Y, columns Y then the diagonal
+    copies of X; a point may go to its own diagonal projection only.
+    """
+    n, m = len(X), len(Y)
+    costs = np.full((n + m, n + m), np.inf)
+    costs[:n, :m] = np.maximum(np.abs(X[:, None, 0] - Y[None, :, 0]),
+                               np.abs(X[:, None, 1] - Y[None, :, 1]))
+    costs[np.arange(n), m + np.arange(n)] = (X[:, 1] - X[:, 0]) / 2
+    costs[n + np.arange(m), np.arange(m)] = (Y[:, 1] - Y[:, 0]) / 2
+    costs[n:, m:] = 0.0
+    return costs
+
+def _split_essential(pairs):
+    pairs = np.asarray(pairs, dtype=np.float64).reshape(-1, 2)
+    finite = np.isfinite(pairs[:, 1])
+    return pairs[finite], np.sort(pairs[~finite, 0])
+
+def _bottleneck_finite(X, Y):
+    if len(X) + len(Y) == 0:
+        return 0.0
+    costs = _augmented_costs(X, Y)
+    candidates = np.unique(costs[np.isfinite(costs)])
+
+    # Smallest threshold admitting a perfect matching (binary search)
+    lo, hi = 0, len(candidates) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        graph = csr_matrix(costs <= candidates[mid])
+        if np.all(maximum_bipartite_matching(graph, perm_type='column') >= 0):
+            hi = mid
+        else:
+            lo = mid + 1
+    return float(candidates[lo])
+
+def _wasserstein_finite(X, Y, p):
+    if len(X) + len(Y) == 0:
+        return 0.0
+    costs = _augmented_costs(X, Y)
+    costs = np.where(np.isfinite(costs), costs, 2 * np.nanmax(costs[np.isfinite(costs)]) + 1) ** p
+    rows, cols = linear_sum_assignment(costs)
+    return float(costs[rows, cols].sum())
+
+def bottleneck_distance(X, Y):
+    """Bottleneck distance between two (n, 2) diagrams of one dimension."""
+    X, X_essential = _split_essential(X)
+    Y, Y_essential = _split_essential(Y)
+    if len(X_essential) != len(Y_essential):
+        return np.inf
+    essential = float(np.max(np.abs(X_essential - Y_essential))) if len(X_essential) else 0.0
+    return max(_bottleneck_finite(X, Y), essential)
+
+def wasserstein_distance(X, Y, p=1.0):
+    """p-Wasserstein distance between two (n, 2) diagrams of one dimension."""
+    X, X_essential = _split_essential(X)
+    Y, Y_essential = _split_essential(Y)
+    if len(X_essential) != len(Y_essential):
+        return np.inf
+    total = _wasserstein_finite(X, Y, p) + float(np.sum(np.abs(X_essential - Y_essential) ** p))
+    return total ** (1.0 / p)
+
+def diagram_distance(diagram_a, diagram_b, metric='bottleneck', p=1.0, dimensions=(0, 1)):
+    """
+    Distance between two PersistenceDiagrams over several dimensions.
+
+    Bottleneck: max over dimensions. Wasserstein: (Σ_dim W_p^p)^(1/p).
+    """
+    if metric == 'bottleneck':
+        return max(bottleneck_distance(diagram_a.pairs(dim), diagram_b.pairs(dim))
+                   for dim in dimensions)
+    if metric == 'wasserstein':
+        return sum(wasserstein_distance(diagram_a.pairs(dim), diagram_b.pairs(dim), p) ** p
+                   for dim in dimensions) ** (1.0 / p)
+    raise ValueError(f"Unknown diagram metric: {metric!r}")
+
+def _max_persistence(diagram, dim):
+    pairs = diagram.pairs(dim, finite=True)
+    return float(np.max(pairs[:, 1] - pairs[:, 0])) if len(pairs) else 0.0
+
+# ============================================================================
+# DIAGRAM INDEX
+# ============================================================================
+
+class DiagramIndex:
+    """
+    Approximate k-NN over diagram summaries, refined with exact distances.
+
+    Args:
+        summary: 'landscape' or 'image' (persistence images)
+        dimensions: Homology dimensions taken into account
+        resolution: Grid size of the summaries
+        n_layers: Number of landscape functions
+        sigma: Gaussian width of persistence images (default: 2 grid steps)
+    """
+
+    def __init__(self, summary='landscape', dimensions=(0, 1), resolution=32, n_layers=5,
+                 sigma=None):
+        if summary not in SUMMARIES:
+            raise ValueError(f"Unknown diagram summary: {summary!r}")
+        self.summary = summary
+        self.dimensions = tuple(dimensions)
+        self.resolution = resolution
+        self.n_layers = n_layers
+        self.sigma = sigma
+        self.keys = []
+        self.diagrams = []
+        self.vectors = None
+
+    # ------------------------------------------------------------------------
+    # Summaries
+    # ------------------------------------------------------------------------
+
+    def _fit_ranges(self):
+        """Per-dimension (lo, hi) of births and finite deaths over the index."""
+        self.ranges = {}
+        for dim in self.dimensions:
+            pairs = [d.pairs(dim, finite=True) for d in self.diagrams]
+            pairs = np.vstack(pairs) if pairs else np.empty((0, 2))
+            if len(pairs) == 0:
+                self.ranges[dim] = (0.0, 1.0)
+            else:
+                lo, hi = float(pairs[:, 0].min()), float(pairs[:, 1].max())
+                self.ranges[dim] = (lo, hi if hi > lo else lo + 1.0)
+
+    def _persistence_image(self, diagram, dim):
+        lo, hi = self.ranges[dim]
+        pairs = diagram.pairs(dim, finite=True).astype(np.float64)
+        births, persistence = pairs[:, 0], pairs[:, 1] - pairs[:, 0]
+
+        birth_grid = np.linspace(lo, hi, self.resolution)
+        persistence_grid = np.linspace(0.0, hi - lo, self.resolution)
+        sigma = self.sigma or 2 * (hi - lo) / (self.resolution - 1)
+
+        # Separable Gaussians, weighted by persistence: Σ_i w_i g_b(i) ⊗ g_p(i)
+        gb = np.exp(-(birth_grid[None, :] - births[:, None])**2 / (2 * sigma**2))
+        gp = np.exp(-(persistence_grid[None, :] - persistence[:, None])**2 / (2 * sigma**2))
+        return ((persistence[:, None] * gb).T @ gp).ravel()
+
+    def summary_vector(self, diagram):
+        """Fixed-length summary of a PersistenceDiagram on the grids of the index."""
+        parts = []
+        for dim in self.dimensions:
+            if self.summary == 'landscape':
+                grid = np.linspace(*self.ranges[dim], self.resolution)
+                parts.append(diagram.landscape(dim, grid, self.n_layers).ravel())
+            else:
+                parts.append(self._persistence_image(diagram, dim))
+        return np.concatenate(parts)
+
+    # ------------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------------
+
+    def fit(self, keys, diagrams):
+        """Index diagrams (PersistenceDiagram or backend result dicts) under keys."""
+        self.keys = list(keys)
+        self.diagrams = [d if isinstance(d, PersistenceDiagram) else PersistenceDiagram.from_result(d)
+                         for d in diagrams]
+        self._fit_ranges()
+        self.vectors = np.vstack([self.summary_vector(d) for d in self.diagrams])
+        self._max_persistence = np.array([[_max_persistence(d, dim) for dim in self.dimensions]
+                                          for d in self.diagrams])
+        return self
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def query(self, diagram, k=5, n_candidates=50, metric='bottleneck', p=1.0, exclude=None):
+        """
+        k nearest indexed diagrams by exact distance among the approximate candidates.
+
+        Args:
+            diagram: PersistenceDiagram (or backend result dict)
+            k: Number of neighbours
+            n_candidates: Size of the approximate shortlist
+            metric: 'bottleneck' or 'wasserstein'
+            exclude: Index position to leave out (the query itself)
+
+        Returns:
+            list: [{'key', 'distance', 'summary_distance'}] by distance
+        """
+        if not isinstance(diagram, PersistenceDiagram):
+            diagram = PersistenceDiagram.from_result(diagram)
+
+        summary_distances = np.linalg.norm(self.vectors - self.summary_vector(diagram), axis=1)
+        if exclude is not None:
+            summary_distances[exclude] = np.inf
+        n_candidates = min(max(n_candidates, k), len(self.keys))
+        candidates = np.argpartition(summary_distances, n_candidates - 1)[:n_candidates]
+        candidates = candidates[np.argsort(summary_distances[candidates], kind='stable')]
+        candidates = candidates[np.isfinite(summary_distances[candidates])]
+
+        query_max = np.array([_max_persistence(diagram, dim) for dim in self.dimensions])
+        lower_bounds = np.max(np.abs(self._max_persistence[candidates] - query_max), axis=1) / 2
+
+        neighbors = []
+        kth_best = np.inf
+        for i, bound in zip(candidates, lower_bounds):
+            if len(neighbors) >= k and bound >= kth_best:
+                continue
+            distance = diagram_distance(diagram, self.diagrams[i], metric, p, self.dimensions)
+            neighbors.append({'key': self.keys[i], 'distance': distance,
+                              'summary_distance': float(summary_distances[i])})
+            neighbors.sort(key=lambda neighbor: neighbor['distance'])
+            del neighbors[k:]
+            if len(neighbors) == k:
+                kth_best = neighbors[-1]['distance']
+        return neighbors
+
+    def nearest_neighbors(self, k=5, n_candidates=50, metric='bottleneck', p=1.0):
+        """k nearest neighbours of every indexed diagram (e.g. for clustering)."""
+        return {key: self.query(diagram, k, n_candidates, metric, p, exclude=i)
+                for i, (key, diagram) in enumerate(zip(self.keys, self.diagrams))}
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_homology_runs(path='experiments/results/homology/homology_runs.json'):
+    """(keys, PersistenceDiagrams) of the successful jobs of parallel_homology.py."""
+    with open(path, 'r') as f:
+        records = json.load(f)
+
+    keys, diagrams = [], []
+    for record in records:
+        if record['status'] != 'ok':
+            continue
+        dims = [np.array([[b, np.inf if d is None else d] for b, d in dgm], dtype=np.float64)
+                for dgm in record['diagrams']]
+        keys.append(record['job_id'])
+        diagrams.append(PersistenceDiagram.from_dimensions(dims))
+    return keys, diagrams
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    keys, diagrams = load_homology_runs()
+    index = DiagramIndex().fit(keys, diagrams)
+
+    print("="*70)
+    print("NEAREST DIAGRAMS (bottleneck)")
+    print("="*70)
+    for key, neighbors in index.nearest_neighbors(k=3).items():
+        closest = ", ".join(f"{n['key']} ({n['distance']:.3f})" for n in neighbors)
+        print(f"{key:45s} → {closest}")
@@ -0,0 +1,173 @@
+"""
+OMNIOPSIS - Enumeration Codec
+==============================
+
+Linear-time conversion between coordinates and images.
+
+For a fixed resolution w×h the coordinate of an image is
+    k = Σ c_i · 256^i,   i = 0 .. 3wh-1
+i.e. the pixel buffer read as a little-endian base-256 integer, so both
+directions are a single int.from_bytes / int.to_bytes call.
+
+The full enumeration F(n) = (w(n), h(n), k(n)) orders the images by pixel
+count p = w·h, then by width w among the divisors of p, then by k. Block p
+holds d(p)·256^(3p) images (d = number of divisors), hence
+    offset(p) = Σ_{q<p} d(q) · 2^(24q)
+which is itself a base-2^24 number whose digits are d(1), d(2), ... and is
+assembled from bytes in linear time as well.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+from decimal import Decimal, localcontext, MAX_EMAX, MIN_EMIN
+
+import numpy as np
+
+BITS_PER_PIXEL = 24  # 3 components × 8 bits
+
+# ============================================================================
+# FIXED RESOLUTION: k ↔ PIXEL BYTES
+# ============================================================================
+
+def digits_to_coordinate(digits):
+    """Coordinate k of a flat base-256 digit buffer (little-endian)."""
+    return int.from_bytes(np.ascontiguousarray(digits, dtype=np.uint8).tobytes(), 'little')
+
+def coordinate_to_digits(k, n_components):
+    """Base-256 digits (uint8) of coordinate k, padded to n_components."""
+    if k < 0 or k.bit_length() > 8 * n_components:
+        raise ValueError(f"Coordinate does not fit in {n_components} components")
+    return np.frombuffer(k.to_bytes(n_components, 'little'), dtype=np.uint8)
+
+def image_to_coordinate(img_array):
+    """Return (w, h, k) for an RGB image of shape (h, w, 3)."""
+    h, w, _ = img_array.shape
+    return w, h, digits_to_coordinate(img_array.reshape(-1))
+
+def coordinate_to_image(w, h, k):
+    """Image of resolution w×h at coordinate k, shape (h, w, 3)."""
+    return coordinate_to_digits(k, 3 * w * h).reshape(h, w, 3)
+
+# ============================================================================
+# FULL ENUMERATION: n ↔ (w, h, k)
+# ============================================================================
+
+def divisor_counts(limit):
+    """d(m) for m = 0 .. limit-1 (d(0) = 0), sieved over w ≤ √m."""
+    d = np.zeros(max(limit, 1), dtype=np.uint32)
+    w = 1
+    while w * w < limit:
+        d[w * w] += 1
+        d[w * (w + 1)::w] += 2
+        w += 1
+    return d
+
+def divisors(p):
+    """Sorted divisors of p."""
+    small = [w for w in range(1, int(p ** 0.5) + 2) if w * w <= p and p % w == 0]
+    large = [p // w for w in reversed(small) if w * w != p]
+    return small + large
+
+def resolution_offset(p):
+    """Index of the first image with p pixels in the full enumeration."""
+    d = divisor_counts(p)
+    # Each d(q) is one base-2^24 digit: keep the 3 low bytes of the uint32
+    packed = d.astype('<u4').view(np.uint8).reshape(-1, 4)[:, :3]
+    return int.from_bytes(packed.tobytes(), 'little')
+
+def encode(w, h, k):
+    """Enumeration index n such that F(n) is the w×h image at coordinate k."""
+    p = w * h
+    if w < 1 or h < 1:
+        raise ValueError("Resolution must be at least 1×1")
+    if k < 0 or k.bit_length() > BITS_PER_PIXEL * p:
+        raise ValueError(f"Coordinate out of range for {w}×{h}")
+    j = divisors(p).index(w)
+    return resolution_offset(p) + ((j << (BITS_PER_PIXEL * p)) | k)
+
+def decode(n):
+    """Triplet (w, h, k) = F(n) of the full enumeration."""
+    if n < 0:
+        raise ValueError("Enumeration index must be non-negative")
+    # n lies in [2^(24q), 2^(24(q+1))), and offset(q) < 2^(24q) ≤ offset(q+1),
+    # so the block is q or q + 1
+    p = max((n.bit_length() - 1) // BITS_PER_PIXEL, 1)
+    offset = resolution_offset(p)
+    block = divisors(p)
+    if n >= offset + (len(block) << (BITS_PER_PIXEL * p)):
+        offset += len(block) << (BITS_PER_PIXEL * p)
+        p += 1
+        block = divisors(p)
+    r = n - offset
+    j = r >> (BITS_PER_PIXEL * p)
+    k = r & ((1 << (BITS_PER_PIXEL * p)) - 1)
+    w = block[j]
+    return w, p // w, k
+
+def enumerate_image(n):
+    """F(n) as an RGB image array of shape (h, w, 3)."""
+    w, h, k = decode(n)
+    return coordinate_to_image(w, h, k)
+
+def image_index(img_array):
+    """Enumeration index n of an RGB image, inverse of enumerate_image."""
+    return encode(*image_to_coordinate(img_array))
+
+# ============================================================================
+# COORDINATE RENDERING
+# ============================================================================
+#
+# str(k) is quadratic in the size of k and needs sys.set_int_max_str_digits
+# for anything beyond 4300 digits. Reports only ever show the leading digits,
+# so these are computed from the top bits of k instead.
+
+GUARD_DIGITS = 30
+
+def _leading_decimal(k, n_digits):
+    """Leading decimal digits of k and its total digit count, or None if ambiguous."""
+    prec = n_digits + GUARD_DIGITS
+    shift = k.bit_length() - 4 * prec - 64
+    if shift <= 0:
+        text = str(k)
+        return text[:n_digits], len(text)
+    with localcontext() as ctx:
+        ctx.prec = prec
+        ctx.Emax = MAX_EMAX
+        ctx.Emin = MIN_EMIN
+        approx = Decimal(k >> shift) * Decimal(2) ** shift
+    _, digs, exp = approx.as_tuple()
+    text = ''.join(map(str, digs))
+    # A run of 9s or 0s in the guard digits means rounding may have carried
+    # into the requested prefix (or the digit count)
+    guard = text[n_digits:prec - 5]
+    if not guard.strip('9') or not guard.strip('0'):
+        return None
+    return text[:n_digits], len(digs) + exp
+
+def coordinate_prefix(k, n_digits=100, base=10):
+    """
+    Leading digits of k, equal to str(k)[:n_digits] (or hex(k)[2:][:n_digits]).
+
+    Runs in time linear in the size of k, without building the full string.
+    """
+    if base == 16:
+        excess = (k.bit_length() + 3) // 4 - n_digits
+        return format(k >> (4 * excess) if excess > 0 else k, 'x')
+    if base != 10:
+        raise ValueError("Only base 10 and base 16 are supported")
+    result = _leading_decimal(k, n_digits)
+    if result is None:
+        return str(k)[:n_digits]
+    return result[0]
+
+def coordinate_num_digits(k, base=10):
+    """Number of digits of k, equal to len(str(k)) (or len(hex(k)) - 2)."""
+    if base == 16:
+        return max(1, (k.bit_length() + 3) // 4)
+    if base != 10:
+        raise ValueError("Only base 10 and base 16 are supported")
+    result = _leading_decimal(k, 1)
+    if result is None:
+        return len(str(k))
+    return max(1, result[1])
@@ -26,6 +26,9 @@ import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 from PIL import Image
 
+from image_store import ImageStore
+from registry import CONSTANTS
+
 # Set publication-quality defaults
 plt.rcParams['font.family'] = 'serif'
 plt.rcParams['font.size'] = 10
@@ -39,41 +42,31 @@ plt.rcParams['legend.fontsize'] = 9
 # FIGURE 1: GRID OF TOP BEACONS
 # ============================================================================
 
-def generate_figure1_beacon_grid(beacon_dir, output_path):
+def generate_figure1_beacon_grid(results_file, output_path, store=None, n_beacons=10,
+                                 resolution=8, size=128):
     """
     Create 2×5 grid showing top 10 transmodal beacons.
+    
+    Beacons, names and scores are read from the beacon search results JSON;
+    images come from the shared image store (generated on first use) and
+    are upscaled (nearest) to size×size in memory.
     """
-    beacon_dir = Path(beacon_dir)
+    store = ImageStore() if store is None else store
     
-    # Top 10 beacons (from beacon_search results)
-    beacons = [
-        ('beacon_rank01_sin_i2_tau_128x128.png', 'τ = 2π (sin i²)\nScore: 96.94'),
-        ('beacon_rank02_sin_i2_2pi_128x128.png', '2π (sin i²)\nScore: 96.94'),
-        ('beacon_rank03_sin_i3_tau_128x128.png', 'τ (sin i³)\nScore: 96.82'),
-        ('beacon_rank04_sin_i3_2pi_128x128.png', '2π (sin i³)\nScore: 96.82'),
-        ('beacon_rank05_sin_i_tau_128x128.png', 'τ (sin i)\nScore: 96.78'),
-        ('beacon_rank06_sin_i_2pi_128x128.png', '2π (sin i)\nScore: 96.78'),
-        ('beacon_rank07_sin_i_pi_128x128.png', 'π (sin i)\nScore: 96.03'),
-        ('beacon_rank08_sin_i2_pi_128x128.png', 'π (sin i²)\nScore: 96.00'),
-        ('beacon_rank09_sin_i3_pi_128x128.png', 'π (sin i³)\nScore: 95.99'),
-        ('beacon_rank10_sin_i3_3pi_128x128.png', '3π (sin i³)\nScore: 95.92'),
-    ]
+    with open(results_file, 'r') as f:
+        candidates = json.load(f)['top_candidates'][:n_beacons]
     
     fig = plt.figure(figsize=(14, 6))
     
-    for i, (filename, label) in enumerate(beacons):
+    for i, candidate in enumerate(candidates):
         ax = fig.add_subplot(2, 5, i + 1)
         
-        # Load image
-        img_path = beacon_dir / filename
-        if img_path.exists():
-            img = Image.open(img_path)
-            ax.imshow(img)
-        else:
-            # Placeholder if image not found
-            ax.text(0.5, 0.5, 'Image\nNot Found', ha='center', va='center', 
-                   fontsize=10, transform=ax.transAxes)
+        img = store.get_or_generate(candidate['generator'], candidate['constant_value'], resolution)
+        scale = size // resolution
+        ax.imshow(np.repeat(np.repeat(img, scale, axis=0), scale, axis=1))
         
+        label = (f"{candidate['constant']} ({candidate['generator']})\n"
+                 f"Score: {candidate['score']['total']:.2f}")
         ax.set_title(label, fontsize=9, fontweight='bold')
         ax.axis('off')
     
@@ -164,16 +157,19 @@ def generate_figure2_entropy_compression(results_file, output_path):
 # FIGURE 3: FFT SPECTRAL COMPARISON
 # ============================================================================
 
-def generate_figure3_spectral_analysis(beacon_dir, output_path):
+def generate_figure3_spectral_analysis(beacon_dir, output_path, store=None):
     """
     Compare FFT spectra of transmodal vs random images.
+    
+    Images are read from the shared image store (generated on first use).
     """
-    # Generate fresh images for analysis
+    store = ImageStore() if store is None else store
+    
     beacons = [
-        {'name': 'τ = 2π', 'constant': 2*np.pi, 'func': lambda i, c: 128 + 127*np.sin(i**2*c)},
-        {'name': 'π', 'constant': np.pi, 'func': lambda i, c: 128 + 127*np.sin(i**2*c)},
-        {'name': 'π/2', 'constant': np.pi/2, 'func': lambda i, c: 128 + 127*np.cos(i**2*c)},
-        {'name': 'Random', 'constant': None, 'func': None},
+        {'name': 'τ = 2π', 'constant': CONSTANTS['tau'], 'generator': 'sin_i2'},
+        {'name': 'π', 'constant': CONSTANTS['pi'], 'generator': 'sin_i2'},
+        {'name': 'π/2', 'constant': CONSTANTS['pi_2'], 'generator': 'cos_i2'},
+        {'name': 'Random', 'constant': None, 'generator': None},
     ]
     
     fig, axes = plt.subplots(2, 4, figsize=(16, 8))
@@ -183,19 +179,16 @@ def generate_figure3_spectral_analysis(beacon_dir, output_path):
         ax_fft = axes[1, idx]
         
         # Generate image
-        if beacon['func'] is None:
+        if beacon['generator'] is None:
             # Random
-            np.random.seed(42)
-            img = np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8)
+            img = store.get('random', 42, 64)
+            if img is None:
+                np.random.seed(42)
+                img = store.put('random', 42, 64,
+                                np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8))
         else:
             # Transmodal
-            n = 3 * 64 * 64
-            digits = []
-            for i in range(n):
-                val = beacon['func'](i, beacon['constant'])
-                digit = int(np.floor(val)) % 256
-                digits.append(digit)
-            img = np.array(digits, dtype=np.uint8).reshape(64, 64, 3)
+            img = store.get_or_generate(beacon['generator'], beacon['constant'], 64)
         
         # Show image
         ax_img.imshow(img)
@@ -378,7 +371,7 @@ if __name__ == "__main__":
     try:
         # Figure 1: Beacon grid
         print("Generating Figure 1: Top 10 Beacons Grid...")
-        generate_figure1_beacon_grid(beacon_dir, output_dir / 'figure1_beacon_grid.png')
+        generate_figure1_beacon_grid(results_file, output_dir / 'figure1_beacon_grid.png')
         
         # Figure 2: Entropy vs Compression
         print("\nGenerating Figure 2: Entropy vs Compression...")
@@ -0,0 +1,103 @@
+"""
+OMNIOPSIS - Prefix-Sharing Generation Cache
+============================================
+
+Every generator is a pure function of the flat index i and the constant c,
+so the 192 digits of an 8×8 image are exactly the first 192 digits of the
+16×16 image (768), of the 32×32 image, and so on.
+
+GenerationCache keeps, per (generator, constant), the longest digit array
+computed so far. A request for n digits is a slice of that array when it
+is long enough; otherwise only the missing indices [size, n) are generated
+and appended (capacity doubling, so extensions are amortized O(new
+digits)). Any resolution of a beacon then costs a slice plus, at most, one
+incremental extension.
+
+Returned arrays are read-only views into the cache.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from generators import generate_digits, get_generator
+
+# ============================================================================
+# GENERATION CACHE
+# ============================================================================
+
+class GenerationCache:
+    """
+    Longest generated digit prefix per (generator, constant).
+
+    Args:
+        max_bytes: Total capacity of the buffers; least recently used
+                   entries are evicted beyond it (None = unbounded)
+    """
+
+    def __init__(self, max_bytes=2**30):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key → [buffer, size]
+
+    @staticmethod
+    def key(generator, constant):
+        return get_generator(generator), float(constant)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer, _ in self.entries.values())
+
+    def _evict(self, keep):
+        while self.max_bytes is not None and self.nbytes > self.max_bytes and len(self.entries) > 1:
+            oldest = next(iter(self.entries))
+            if oldest == keep:
+                self.entries.move_to_end(oldest)
+                continue
+            del self.entries[oldest]
+
+    def digits(self, generator, constant, n):
+        """Read-only view of the first n digits of (generator, constant)."""
+        key = self.key(generator, constant)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [np.empty(0, dtype=np.uint8), 0]
+        self.entries.move_to_end(key)
+
+        buffer, size = entry
+        if n > size:
+            if n > len(buffer):
+                grown = np.empty(max(n, 2 * len(buffer)), dtype=np.uint8)
+                grown[:size] = buffer[:size]
+                entry[0] = buffer = grown
+            buffer[size:n] = generate_digits(key[0], key[1], n - size, start=size)
+            entry[1] = n
+            self._evict(key)
+
+        view = buffer[:n]
+        view.flags.writeable = False
+        return view
+
+    def image(self, generator, constant, resolution):
+        """Read-only (resolution, resolution, 3) view of the beacon image."""
+        return self.digits(generator, constant, 3 * resolution * resolution).reshape(
+            resolution, resolution, 3)
+
+    def clear(self):
+        self.entries.clear()
+
+# Cache shared by the stages of a process
+DEFAULT_CACHE = GenerationCache()
+
+def cached_digits(generator, constant, n):
+    """First n digits of (generator, constant) from the shared cache."""
+    return DEFAULT_CACHE.digits(generator, constant, n)
+
+def cached_image(generator, constant, resolution):
+    """Beacon image of (generator, constant) from the shared cache."""
+    return DEFAULT_CACHE.image(generator, constant, resolution)
@@ -0,0 +1,120 @@
+"""
+OMNIOPSIS - Vectorized Generator Engine
+========================================
+
+Shared generation functions for transmodal coordinates.
+
+Every generator is a whole-array NumPy kernel over the flat component
+index i = arange(n), compiled from its expression in registry.py: it
+receives the index vector and the constant c and returns the raw (float)
+values for all 3·w·h components at once. The engine floors them into
+base-256 digits and returns a uint8 buffer, so no script has to loop over
+pixels in Python anymore.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+
+# ============================================================================
+# GENERATION KERNELS
+# ============================================================================
+#
+# The kernels are compiled from the symbolic expressions declared in
+# registry.py. Powers of i are taken in float64 as repeated products
+# (i*i, i*i*i) rather than in int64: the products are correctly rounded,
+# exactly like float(i**2) in the original scalar code, and i**3 cannot
+# overflow at large resolutions.
+
+from registry import GENERATORS
+from high_precision import high_precision_values
+from recurrence import recurrence_values
+
+gen_sin_i2 = GENERATORS['sin_i2']
+gen_cos_i2 = GENERATORS['cos_i2']
+gen_sin_i = GENERATORS['sin_i']
+gen_sin_i3 = GENERATORS['sin_i3']
+gen_mod_i2 = GENERATORS['mod_i2']
+gen_mod_i = GENERATORS['mod_i']
+gen_frac_i2 = GENERATORS['frac_i2']
+gen_tan_i2 = GENERATORS['tan_i2']
+gen_sin_log = GENERATORS['sin_log']
+gen_sin_sqrt = GENERATORS['sin_sqrt']
+
+# ============================================================================
+# DIGIT / IMAGE GENERATION
+# ============================================================================
+
+def get_generator(generator):
+    """Resolve a generator given by name or as a kernel."""
+    if callable(generator):
+        return generator
+    try:
+        return GENERATORS[generator]
+    except KeyError:
+        raise ValueError(f"Unknown generator: {generator!r}") from None
+
+def values_to_digits(values):
+    """Floor raw generator values into base-256 digits (uint8)."""
+    return (np.floor(values) % 256).astype(np.uint8)
+
+def generate_digits(generator, constant, n, start=0, precision='float64', method='direct'):
+    """
+    Generate the base-256 digits of components [start, start + n).
+
+    Args:
+        generator: Generator name (key of GENERATORS) or array kernel
+        constant: Constant c ('high' precision also accepts a registry
+                  name or expression, e.g. 'tau', for the exact constant)
+        n: Number of components
+        start: Index of the first component
+        precision: 'float64' (kernels) or 'high' (exact phase reduction of
+                   the polynomial-phase generators, see high_precision.py)
+        method: 'direct' or 'recurrence' (blockwise phasor products for
+                sin_i, sin_i2, cos_i2, sin_i3; identical digits, faster
+                with precision='high' only, see recurrence.py)
+
+    Returns:
+        np.ndarray: uint8 digit buffer of length n
+    """
+    if method == 'recurrence':
+        return values_to_digits(recurrence_values(generator, constant, n, start, reference=precision))
+    if method != 'direct':
+        raise ValueError(f"Unknown generation method: {method!r}")
+    if precision == 'high':
+        return values_to_digits(high_precision_values(generator, constant, n, start))
+    if precision != 'float64':
+        raise ValueError(f"Unknown precision: {precision!r}")
+    gen_func = get_generator(generator)
+    i = np.arange(start, start + n, dtype=np.int64)
+    return values_to_digits(gen_func(i, constant))
+
+def generate_image(generator, constant, resolution=8, precision='float64', method='direct'):
+    """
+    Generate a resolution×resolution RGB image.
+
+    Returns:
+        np.ndarray: uint8 array of shape (resolution, resolution, 3)
+    """
+    n = 3 * resolution * resolution
+    return generate_digits(generator, constant, n, precision=precision, method=method).reshape(
+        resolution, resolution, 3)
+
+def generate_tiles(generator, constant, resolution, tile_rows, precision='float64',
+                   method='direct'):
+    """
+    Generate a resolution×resolution image as horizontal tiles of tile_rows rows.
+
+    Tile t covers components [3·resolution·t·tile_rows, ...), so only one
+    tile is ever held in memory.
+
+    Yields:
+        np.ndarray: uint8 arrays of shape (rows, resolution, 3)
+    """
+    row_size = 3 * resolution
+    for y0 in range(0, resolution, tile_rows):
+        rows = min(tile_rows, resolution - y0)
+        digits = generate_digits(generator, constant, rows * row_size, start=y0 * row_size,
+                                 precision=precision, method=method)
+        yield digits.reshape(rows, resolution, 3)
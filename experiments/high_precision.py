@@ -0,0 +1,305 @@
+"""
+OMNIOPSIS - High-Precision Generation Mode
+===========================================
+
+Exact phase reduction for the polynomial-phase generators, and a
+diagnostic of the float64 phase error.
+
+In float64, sin(i²·c) is evaluated at fl(fl(i·i)·c): once i²·c reaches
+~10^8 the argument keeps only a few fractional bits, and at 2048×2048
+(i ≈ 1.2·10^7, i²·c ≈ 10^15) the phase is essentially rounding noise.
+
+Here the phase is reduced exactly, in turns:
+
+    i^k · c mod M  =  M · frac(i^k · q),    q = c / M
+
+where M is 2π (sin/cos), 256 (mod) or 1 (frac). q is expanded once, with
+Decimal arithmetic, into a 192-bit binary fraction Q; i^k is formed
+exactly in 32-bit limbs; the product i^k·Q mod 2^192 is a vectorized
+multi-limb integer multiplication in uint64 arrays, and its top bits are
+the phase fraction. The remaining error is that of the final float64 sin,
+independently of i.
+
+The constant may be a float (its exact binary value is used, isolating
+the rounding of the float kernel) or a registry name / expression such as
+'tau' or "2*pi" (the mathematical constant, evaluated in Decimal).
+
+generate_digits(..., precision='high') (generators.py) uses this mode;
+phase_error / phase_error_report give the per-pixel float64 phase error.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import ast
+from decimal import Decimal, localcontext, ROUND_FLOOR
+
+import numpy as np
+
+from registry import GENERATORS, CONSTANTS, CONSTANT_EXPRESSIONS
+
+# 32-bit limbs of the phase fraction: 192 bits, enough for i³ with i < 2^32
+LIMBS = 6
+FRACTION_BITS = 32 * LIMBS
+DECIMAL_PRECISION = 150
+MASK = np.uint64(0xFFFFFFFF)
+SHIFT = np.uint64(32)
+
+PI = Decimal(
+    '3.14159265358979323846264338327950288419716939937510582097494459230781640628620899862803'
+    '48253421170679821480865132823066470938446095505822317253594081284811174502841027019385'
+)
+TWO_PI = 2 * PI
+
+# ============================================================================
+# GENERATOR PHASES
+# ============================================================================
+
+def _sin_values(turns):
+    return 128 + 127 * np.sin(2 * np.pi * turns)
+
+def _cos_values(turns):
+    return 128 + 127 * np.cos(2 * np.pi * turns)
+
+def _scaled_fraction(turns):
+    return np.floor(turns * 256)
+
+# name → (power of i, phase modulus M, values from the phase in turns)
+POLYNOMIAL_PHASE_GENERATORS = {
+    'sin_i': (1, TWO_PI, _sin_values),
+    'sin_i2': (2, TWO_PI, _sin_values),
+    'cos_i2': (2, TWO_PI, _cos_values),
+    'sin_i3': (3, TWO_PI, _sin_values),
+    'mod_i': (1, Decimal(256), _scaled_fraction),
+    'mod_i2': (2, Decimal(256), _scaled_fraction),
+    'frac_i2': (2, Decimal(1), _scaled_fraction),
+}
+
+def phase_generator(generator):
+    """(name, (power, modulus, values)) of a polynomial-phase generator (name or kernel)."""
+    if callable(generator):
+        generator = next((name for name, kernel in GENERATORS.items() if kernel is generator), None)
+    if generator not in POLYNOMIAL_PHASE_GENERATORS:
+        raise ValueError(f"No high-precision mode for generator: {generator!r} "
+                         f"(supported: {', '.join(POLYNOMIAL_PHASE_GENERATORS)})")
+    return generator, POLYNOMIAL_PHASE_GENERATORS[generator]
+
+# ============================================================================
+# PRECISE CONSTANTS
+# ============================================================================
+
+def _decimal_eval(node):
+    if isinstance(node, ast.Expression):
+        return _decimal_eval(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return Decimal(repr(node.value)) if isinstance(node.value, float) else Decimal(node.value)
+    if isinstance(node, ast.Name) and node.id in ('pi', 'tau', 'e'):
+        return {'pi': PI, 'tau': TWO_PI, 'e': Decimal(1).exp()}[node.id]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _decimal_eval(node.operand)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp):
+        left, right = _decimal_eval(node.left), _decimal_eval(node.right)
+        operations = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+                      ast.Mult: lambda a, b: a * b, ast.Div: lambda a, b: a / b,
+                      ast.Pow: lambda a, b: a ** b}
+        if type(node.op) in operations:
+            return operations[type(node.op)](left, right)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and len(node.args) == 1:
+        functions = {'sqrt': Decimal.sqrt, 'log': Decimal.ln, 'log10': Decimal.log10,
+                     'exp': Decimal.exp}
+        if node.func.id in functions:
+            return functions[node.func.id](_decimal_eval(node.args[0]))
+    raise ValueError(f"Cannot evaluate in high precision: {ast.unparse(node)!r}")
+
+def precise_constant(constant):
+    """
+    Decimal value of a constant.
+
+    Floats are taken exactly (their binary value); strings are registry
+    names or expressions in pi, e, tau, sqrt, log, log10, exp.
+    """
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        if isinstance(constant, str):
+            expression = CONSTANT_EXPRESSIONS.get(constant, constant)
+            if not isinstance(expression, str):
+                expression = repr(expression)
+            return +_decimal_eval(ast.parse(expression, mode='eval'))
+        return Decimal(float(constant))
+
+def float_constant(constant):
+    """float64 value used by the float kernels for a constant (name, expression or float)."""
+    if isinstance(constant, str):
+        return CONSTANTS[constant] if constant in CONSTANTS else float(precise_constant(constant))
+    return float(constant)
+
+def _fraction_bits(value):
+    """floor(frac(value) · 2^FRACTION_BITS) as an int."""
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        fraction = value - value.to_integral_value(rounding=ROUND_FLOOR)
+        return int((fraction * (1 << FRACTION_BITS)).to_integral_value(rounding=ROUND_FLOOR))
+
+# ============================================================================
+# MULTI-LIMB ARITHMETIC
+# ============================================================================
+
+def _split(values):
+    """Two 32-bit limbs of uint64 values."""
+    values = values.astype(np.uint64)
+    return [values & MASK, values >> SHIFT]
+
+def _limbs_of_int(value):
+    return [np.uint64((value >> (32 * j)) & 0xFFFFFFFF) for j in range(LIMBS)]
+
+def _mul_mod(a, b, lowest=0):
+    """
+    Product of two little-endian 32-bit limb lists, modulo 2^FRACTION_BITS.
+
+    Partial products below limb `lowest` are skipped: the result is then
+    exact up to the dropped carries (< 2^(32·lowest) · len(a)·len(b)).
+    """
+    acc = [np.uint64(0)] * (LIMBS + 1)
+    for ia, x in enumerate(a):
+        for ib, y in enumerate(b):
+            p = ia + ib
+            if p >= LIMBS:
+                break
+            if p < lowest or not (np.any(x) and np.any(y)):
+                continue
+            product = x * y
+            acc[p] = acc[p] + (product & MASK)
+            acc[p + 1] = acc[p + 1] + (product >> SHIFT)
+    for p in range(LIMBS):
+        acc[p + 1] = acc[p + 1] + (acc[p] >> SHIFT)
+        acc[p] = acc[p] & MASK
+    return acc[:LIMBS]
+
+def _turns(multiplier, q_bits):
+    """frac(multiplier · q) as float64, multiplier given as limbs, q as FRACTION_BITS bits."""
+    # Only the top three limbs are read: products below limb LIMBS-4 can
+    # only carry ~2^-128 turns into them
+    limbs = _mul_mod(multiplier, _limbs_of_int(q_bits), lowest=LIMBS - 4)
+    turns = (limbs[-1].astype(np.float64) * 2.0**-32
+             + limbs[-2].astype(np.float64) * 2.0**-64
+             + limbs[-3].astype(np.float64) * 2.0**-96)
+    turns = np.broadcast_to(turns, np.shape(multiplier[0]))
+    return np.where(turns >= 1.0, turns - 1.0, turns)
+
+def _power_limbs(i, power):
+    """Exact i^power (mod 2^FRACTION_BITS) in 32-bit limbs."""
+    i = i.astype(np.uint64)
+    bound = int(i.max()) if len(i) else 0
+
+    # Plain uint64 products while they cannot overflow, limbs beyond
+    value, exponent = i, 1
+    while exponent < power and bound ** (exponent + 1) < 2**64:
+        value = value * i
+        exponent += 1
+
+    limbs, base = _split(value), _split(i)
+    for _ in range(power - exponent):
+        limbs = _mul_mod(limbs, base)
+    return limbs
+
+def exact_turns_at(generator, constant, i):
+    """Exact phase fraction frac(i^k · c / M) at the (non-negative) component indices i."""
+    _, (power, modulus, _) = phase_generator(generator)
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        q_bits = _fraction_bits(precise_constant(constant) / modulus)
+    return _turns(_power_limbs(np.asarray(i, dtype=np.int64).ravel(), power), q_bits).reshape(np.shape(i))
+
+def exact_turns(generator, constant, n, start=0):
+    """Exact phase fraction frac(i^k · c / M) of components [start, start + n)."""
+    return exact_turns_at(generator, constant, np.arange(start, start + n, dtype=np.int64))
+
+def float_turns(phase, modulus):
+    """Exact frac(phase / M) of float64 phases (each float is an exact binary rational)."""
+    phase = np.asarray(phase, dtype=np.float64)
+    mantissa, exponent = np.frexp(np.abs(phase))
+    integer_mantissa = (mantissa * 2.0**53).astype(np.uint64)
+    exponent = exponent - 53
+
+    turns = np.zeros(phase.shape)
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        for e in np.unique(exponent):
+            group = exponent == e
+            q_bits = _fraction_bits(Decimal(2) ** int(e) / modulus)
+            turns[group] = _turns(_split(integer_mantissa[group]), q_bits)
+
+    negative = phase < 0
+    turns[negative] = (1.0 - turns[negative]) % 1.0
+    return turns
+
+# ============================================================================
+# HIGH-PRECISION GENERATION
+# ============================================================================
+
+def high_precision_values(generator, constant, n, start=0):
+    """Raw generator values of components [start, start + n) with exact phase reduction."""
+    _, (_, _, values) = phase_generator(generator)
+    return values(exact_turns(generator, constant, n, start))
+
+# ============================================================================
+# PHASE-ERROR DIAGNOSTIC
+# ============================================================================
+
+def float_phase(generator, constant, n, start=0):
+    """The float64 phase argument i^k · c exactly as the float kernels compute it."""
+    _, (power, _, _) = phase_generator(generator)
+    x = np.arange(start, start + n, dtype=np.int64).astype(np.float64)
+    product = x
+    for _ in range(power - 1):
+        product = product * x
+    return product * float_constant(constant)
+
+def phase_error(generator, constant, n, start=0):
+    """
+    Per-component absolute phase error of the float64 kernel.
+
+    |fl(i^k·c) - i^k·c| reduced modulo M, in phase units (radians for
+    sin/cos, value units for mod/frac). With a float constant only the
+    float64 evaluation error is measured; with a name or expression the
+    representation error of c is included.
+    """
+    _, (_, modulus, _) = phase_generator(generator)
+    difference = float_turns(float_phase(generator, constant, n, start), modulus) \
+        - exact_turns(generator, constant, n, start)
+    return np.abs((difference + 0.5) % 1.0 - 0.5) * float(modulus)
+
+def phase_error_report(generator, constant, resolution, tolerance=1e-6):
+    """
+    Phase-error summary of a resolution×resolution beacon.
+
+    Returns:
+        dict: Error statistics, float-vs-exact digit mismatch and the
+              per-pixel error image ('error_image', (r, r, 3))
+    """
+    from generators import generate_digits, values_to_digits
+
+    name, _ = phase_generator(generator)
+    n = 3 * resolution * resolution
+    errors = phase_error(name, constant, n)
+    float_digits = generate_digits(name, float_constant(constant), n)
+    exact_digits = values_to_digits(high_precision_values(name, constant, n))
+    mismatches = np.flatnonzero(float_digits != exact_digits)
+    unreliable = np.flatnonzero(errors > tolerance)
+
+    return {
+        'generator': name,
+        'constant': constant if isinstance(constant, str) else float(constant),
+        'resolution': resolution,
+        'max_phase_error': float(errors.max()),
+        'mean_phase_error': float(errors.mean()),
+        'p99_phase_error': float(np.quantile(errors, 0.99)),
+        'fraction_above_tolerance': float(len(unreliable) / n),
+        'first_index_above_tolerance': int(unreliable[0]) if len(unreliable) else None,
+        'digit_mismatch_fraction': float(len(mismatches) / n),
+        'first_digit_mismatch': int(mismatches[0]) if len(mismatches) else None,
+        'unique_values_float': int(len(np.unique(float_digits))),
+        'unique_values_exact': int(len(np.unique(exact_digits))),
+        'error_image': errors.reshape(resolution, resolution, 3),
+    }
@@ -0,0 +1,197 @@
+"""
+OMNIOPSIS - Memory-Mapped Image Store
+======================================
+
+One store for every generated beacon image, shared by all stages.
+
+All images live back to back in a single flat uint8 .npy file opened as a
+memmap; a JSON index maps (generator, definition, precision, constant,
+resolution) to the offset and shape of each image. Reads are zero-copy views into the memmap, each
+image is generated and written once, and PNG export is an optional,
+lazy step.
+
+Constants are keyed by the exact repr of their float value, so τ and 2π
+(the same float) share one entry. Generators are keyed by their name and a
+hash of their definition (registry expression, or kernel source), since
+register_generator can redefine a name: images of a redefined generator
+get new entries instead of being served stale. Entries stored under an
+older definition are never read again.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from generation_cache import cached_image
+from generators import generate_image
+from registry import GENERATORS
+
+STORE_DIR = Path("experiments/results/image_store")
+
+# ============================================================================
+# IMAGE STORE
+# ============================================================================
+
+def generator_definition(generator):
+    """
+    Short hash of a generator's definition.
+
+    Registered generators hash their expression, other kernels their source;
+    names outside the registry (e.g. 'random') hash the name itself.
+    """
+    if not callable(generator):
+        generator = GENERATORS.get(generator, generator)
+    if isinstance(generator, str):
+        definition = generator
+    elif hasattr(generator, 'expression'):
+        definition = generator.expression
+    else:
+        try:
+            definition = inspect.getsource(generator)
+        except (OSError, TypeError):
+            definition = f"{generator.__module__}.{generator.__qualname__}"
+    return hashlib.sha256(definition.encode('utf-8')).hexdigest()[:16]
+
+def generator_name(generator):
+    return generator if isinstance(generator, str) else generator.__name__
+
+def image_key(generator, constant, resolution, precision='float64'):
+    """Index key of an image; constant may be a float or a seed for 'random'."""
+    return (f"{generator_name(generator)}|{generator_definition(generator)}|{precision}"
+            f"|{float(constant)!r}|{int(resolution)}")
+
+class ImageStore:
+    """
+    Append-only store of uint8 images backed by a memmapped .npy file.
+
+    Args:
+        path: Store directory (images.npy + index.json)
+        initial_capacity: Initial size of the data file in bytes
+    """
+
+    def __init__(self, path=STORE_DIR, initial_capacity=2**20):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.data_file = self.path / 'images.npy'
+        self.index_file = self.path / 'index.json'
+
+        if self.index_file.exists() and self.data_file.exists():
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+            self.entries = index['entries']
+            self.size = index['size']
+            self.data = np.load(self.data_file, mmap_mode='r+')
+        else:
+            self.entries = {}
+            self.size = 0
+            self.data = np.lib.format.open_memmap(self.data_file, mode='w+', dtype=np.uint8,
+                                                  shape=(initial_capacity,))
+
+    # ------------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------------
+
+    def _reserve(self, n_bytes):
+        """Grow the data file (capacity doubling) so that n_bytes more fit."""
+        capacity = len(self.data)
+        if self.size + n_bytes <= capacity:
+            return
+
+        while capacity < self.size + n_bytes:
+            capacity *= 2
+        tmp_file = self.path / 'images.npy.tmp'
+        grown = np.lib.format.open_memmap(tmp_file, mode='w+', dtype=np.uint8, shape=(capacity,))
+        grown[:self.size] = self.data[:self.size]
+        grown.flush()
+        del grown
+        self.data.flush()
+        self.data = None
+        os.replace(tmp_file, self.data_file)
+        self.data = np.load(self.data_file, mmap_mode='r+')
+
+    def flush(self):
+        """Write pending data and the index to disk."""
+        self.data.flush()
+        tmp_file = self.path / 'index.json.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'size': self.size, 'entries': self.entries}, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    # ------------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------------
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return list(self.entries)
+
+    def get(self, generator, constant, resolution, precision='float64'):
+        """Zero-copy view of a stored image, or None."""
+        entry = self.entries.get(image_key(generator, constant, resolution, precision))
+        if entry is None:
+            return None
+        offset = entry['offset']
+        n_bytes = int(np.prod(entry['shape']))
+        return self.data[offset:offset + n_bytes].reshape(entry['shape'])
+
+    def put(self, generator, constant, resolution, image, flush=True, precision='float64'):
+        """Store an image (once) and return its view in the store."""
+        key = image_key(generator, constant, resolution, precision)
+        if key in self.entries:
+            return self.get(generator, constant, resolution, precision)
+
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        self._reserve(image.size)
+        self.data[self.size:self.size + image.size] = image.reshape(-1)
+        self.entries[key] = {
+            'generator': generator_name(generator),
+            'definition': generator_definition(generator),
+            'precision': precision,
+            'constant': float(constant),
+            'resolution': int(resolution),
+            'offset': self.size,
+            'shape': list(image.shape),
+        }
+        self.size += image.size
+        if flush:
+            self.flush()
+        return self.get(generator, constant, resolution, precision)
+
+    def get_or_generate(self, generator, constant, resolution, precision='float64'):
+        """
+        Stored image, generated on first use (float64 images through the
+        prefix-sharing generation cache).
+        """
+        image = self.get(generator, constant, resolution, precision)
+        if image is None:
+            if precision == 'float64':
+                generated = cached_image(generator, constant, resolution)
+            else:
+                generated = generate_image(generator, constant, resolution, precision=precision)
+            image = self.put(generator, constant, resolution, generated, precision=precision)
+        return image
+
+    def export_png(self, generator, constant, resolution, output_path, size=None,
+                   precision='float64'):
+        """Write a stored image as PNG, optionally upscaled (nearest) to size×size."""
+        image = self.get(generator, constant, resolution, precision)
+        if image is None:
+            raise KeyError(image_key(generator, constant, resolution, precision))
+        img_pil = Image.fromarray(np.asarray(image), 'RGB')
+        if size is not None:
+            img_pil = img_pil.resize((size, size), Image.NEAREST)
+        img_pil.save(output_path)
+        return output_path
@@ -0,0 +1,142 @@
+"""
+OMNIOPSIS - Null Distribution Cache
+====================================
+
+Content-addressed on-disk cache for bootstrap null distributions.
+
+A null distribution is fully determined by the resolution, the number of
+samples, the RNG seed and the code that scores each sample. The cache key
+combines these, the code being represented by a hash of the source of the
+scoring functions and of the modules they call into, so editing
+calculate_transmodal_score (or a metric, or a helper it uses) invalidates
+the entries it produced.
+
+Each entry is a directory holding one .npy file per array (scores and
+per-metric arrays) plus a meta.json, and is loaded memory-mapped.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR = Path("experiments/results/null_cache")
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+def formula_hash(*funcs):
+    """SHA-256 of the source code of the given functions and modules."""
+    digest = hashlib.sha256()
+    for func in funcs:
+        source = inspect.getsource(func).replace('\r\n', '\n')
+        name = func.__name__ if inspect.ismodule(func) else f"{func.__module__}.{func.__qualname__}"
+        digest.update(f"{name}\n".encode())
+        digest.update(source.encode())
+    return digest.hexdigest()
+
+def cache_key(resolution, n_samples, seed, formula):
+    """Cache key of a null distribution (hex string)."""
+    params = {
+        'resolution': int(resolution),
+        'n_samples': int(n_samples),
+        'seed': seed,
+        'formula': formula,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:24]
+
+# ============================================================================
+# LOAD / SAVE
+# ============================================================================
+
+def load_null_distribution(key, cache_dir=CACHE_DIR, mmap_mode='r'):
+    """
+    Load a cached null distribution.
+
+    Returns:
+        dict: array name → (memory-mapped) array, or None if not cached
+    """
+    entry = Path(cache_dir) / key
+    meta_file = entry / 'meta.json'
+    if not meta_file.exists():
+        return None
+
+    with open(meta_file, 'r') as f:
+        meta = json.load(f)
+
+    return {name: np.load(entry / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in meta['arrays']}
+
+def save_null_distribution(key, arrays, meta=None, cache_dir=CACHE_DIR):
+    """
+    Store a null distribution under key.
+
+    The entry is written to a temporary directory and renamed into place,
+    so a crash never leaves a partial entry behind.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    entry = cache_dir / key
+
+    tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=cache_dir))
+    try:
+        for name, array in arrays.items():
+            np.save(tmp / f"{name}.npy", np.asarray(array))
+        with open(tmp / 'meta.json', 'w') as f:
+            json.dump({
+                **(meta or {}),
+                'key': key,
+                'arrays': sorted(arrays),
+                'timestamp': datetime.now().isoformat(),
+            }, f, indent=2)
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp, entry)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    return entry
+
+# ============================================================================
+# CACHED COMPUTATION
+# ============================================================================
+
+def cached_null_distribution(compute, resolution, n_samples, seed, funcs,
+                             cache_dir=CACHE_DIR, mmap_mode='r'):
+    """
+    Return the null distribution for (resolution, n_samples, seed), computing
+    and storing it with compute(n_samples=..., resolution=..., seed=...) on a miss.
+
+    Args:
+        compute: Function producing a dict of arrays
+        funcs: Functions and modules whose source determines the scores
+               (hashed into the key)
+    """
+    formula = formula_hash(*funcs)
+    key = cache_key(resolution, n_samples, seed, formula)
+
+    cached = load_null_distribution(key, cache_dir, mmap_mode)
+    if cached is not None:
+        print(f"  ✓ Null distribution loaded from cache ({key})")
+        return cached
+
+    arrays = compute(n_samples=n_samples, resolution=resolution, seed=seed)
+    save_null_distribution(key, arrays, {
+        'resolution': int(resolution),
+        'n_samples': int(n_samples),
+        'seed': seed,
+        'formula_hash': formula,
+    }, cache_dir)
+    print(f"  ✓ Null distribution stored in cache ({key})")
+    return load_null_distribution(key, cache_dir, mmap_mode)
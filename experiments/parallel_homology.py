@@ -0,0 +1,221 @@
+"""
+OMNIOPSIS - Parallel Persistent Homology Runner
+================================================
+
+Fans (beacon, point-cloud method, subsample seed) jobs out to worker
+processes and collects every persistence diagram into one results file.
+The method 'cubical' runs grid-native cubical persistence on the image
+instead of a point cloud.
+
+Each job runs in its own process so that it can be bounded:
+- timeout: the process is terminated once its wall-clock budget is spent
+- memory cap: RLIMIT_AS is set in the child (POSIX), so a runaway Rips
+  complex raises MemoryError instead of swapping the machine
+
+A job that times out, runs out of memory or crashes is recorded with its
+status and the remaining jobs continue.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from pathlib import Path
+
+import numpy as np
+
+from persistent_homology_analysis import (
+    BEACONS,
+    generate_beacon_image,
+    image_to_point_cloud,
+    compute_persistent_homology_ripser,
+    compute_persistence_metrics,
+    persistence_diagram,
+)
+from point_cloud import POINT_CLOUD_METHODS, collapse_duplicate_points
+from cubical_persistence import cubical_persistence
+
+# Grid-native alternative to a point-cloud method (cubical_persistence.py)
+CUBICAL = 'cubical'
+
+# ============================================================================
+# JOBS
+# ============================================================================
+
+def homology_jobs(beacons=BEACONS, methods=POINT_CLOUD_METHODS, seeds=(0,),
+                  resolution=64, max_dimension=2, sampling='maxmin'):
+    """Enumerate the (beacon, method, seed) jobs."""
+    for beacon in beacons:
+        for method in methods:
+            for seed in seeds:
+                yield {
+                    'job_id': f"{beacon['name']}/{method}/{seed}",
+                    'beacon': beacon,
+                    'method': method,
+                    'seed': seed,
+                    'resolution': resolution,
+                    'max_dimension': max_dimension,
+                    'sampling': sampling,
+                }
+
+def diagrams_by_dimension(persistence):
+    """Persistence diagrams as a list of (n, 2) arrays indexed by dimension."""
+    diagram = persistence_diagram(persistence)
+    return [diagram.pairs(dim) for dim in diagram.dimensions]
+
+def run_homology_job(job):
+    """Compute persistence and metrics for one job (inside a worker)."""
+    start = time.perf_counter()
+    img_array = generate_beacon_image(job['beacon'], job['resolution'])
+
+    if job['method'] == CUBICAL:
+        persistence = cubical_persistence(img_array)
+    else:
+        points, counts = collapse_duplicate_points(image_to_point_cloud(img_array, method=job['method']))
+        persistence = compute_persistent_homology_ripser(points, max_dimension=job['max_dimension'],
+                                                         sampling=job['sampling'], seed=job['seed'],
+                                                         weights=counts)
+
+    return {
+        'metrics': compute_persistence_metrics(persistence),
+        'persistence_method': persistence['method'],
+        'n_points': persistence['n_points'],
+        'diagrams': diagrams_by_dimension(persistence),
+        'elapsed': time.perf_counter() - start,
+    }
+
+def _job_process(job, conn, memory_limit):
+    """Process entry point: apply the memory cap, run the job, send the outcome."""
+    if memory_limit:
+        try:
+            import resource
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ImportError, ValueError, OSError):
+            pass
+
+    try:
+        outcome = {'status': 'ok', **run_homology_job(job)}
+    except MemoryError:
+        outcome = {'status': 'memory', 'error': 'memory limit exceeded'}
+    except Exception as e:
+        outcome = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+    conn.send(outcome)
+    conn.close()
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+def _diagram_to_json(dgm):
+    """Diagram as [[birth, death], ...] with infinite deaths as null."""
+    return [[float(b), None if not np.isfinite(d) else float(d)] for b, d in dgm]
+
+def run_parallel_homology(beacons=BEACONS, methods=POINT_CLOUD_METHODS, seeds=(0,),
+                          resolution=64, max_dimension=2, sampling='maxmin', workers=None,
+                          timeout=600, memory_limit=None,
+                          output_file='experiments/results/homology/homology_runs.json'):
+    """
+    Run all (beacon, method, seed) jobs on up to `workers` processes.
+
+    Args:
+        sampling: Subsampling method (see subsampling.py)
+        timeout: Wall-clock seconds per job
+        memory_limit: Address-space cap per job in bytes (None = unlimited)
+        output_file: JSON file receiving every record and diagram
+
+    Returns:
+        list: One record per job, in job order
+    """
+    jobs = list(homology_jobs(beacons, methods, seeds, resolution, max_dimension, sampling))
+    workers = workers or os.cpu_count() or 1
+
+    print("="*70)
+    print("PARALLEL PERSISTENT HOMOLOGY")
+    print("="*70)
+    print(f"Jobs: {len(jobs)} ({len(beacons)} beacons × {len(methods)} methods × {len(seeds)} seeds)")
+    print(f"Sampling: {sampling} | Workers: {workers} | Timeout: {timeout}s | "
+          f"Memory cap: {memory_limit // 2**20 if memory_limit else '∞'} MB")
+    print()
+
+    pending = deque(enumerate(jobs))
+    running = {}  # receiving connection → (process, index, job, start time)
+    records = [None] * len(jobs)
+    done = 0
+
+    def finish(index, job, outcome):
+        nonlocal done
+        done += 1
+        records[index] = {
+            'job_id': job['job_id'],
+            'beacon_name': job['beacon']['name'],
+            'beacon_label': job['beacon']['label'],
+            'method': job['method'],
+            'seed': job['seed'],
+            'sampling': job['sampling'],
+            'resolution': job['resolution'],
+            **outcome,
+        }
+        detail = f"{outcome['elapsed']:.1f}s" if outcome['status'] == 'ok' else outcome.get('error', '')
+        print(f"[{done:3d}/{len(jobs)}] {job['job_id']:45s} | {outcome['status']:7s} {detail}")
+
+    while pending or running:
+        while pending and len(running) < workers:
+            index, job = pending.popleft()
+            recv_conn, send_conn = Pipe(duplex=False)
+            process = Process(target=_job_process, args=(job, send_conn, memory_limit), daemon=True)
+            process.start()
+            send_conn.close()
+            running[recv_conn] = (process, index, job, time.monotonic())
+
+        next_deadline = min(start + timeout for _, _, _, start in running.values())
+        ready = wait(list(running), timeout=max(0.0, next_deadline - time.monotonic()))
+
+        for conn in ready:
+            process, index, job, _ = running.pop(conn)
+            try:
+                outcome = conn.recv()
+            except EOFError:
+                outcome = {'status': 'crashed', 'error': f"worker exited with code {process.exitcode}"}
+            conn.close()
+            process.join()
+            finish(index, job, outcome)
+
+        now = time.monotonic()
+        for conn, (process, index, job, start) in list(running.items()):
+            if now - start >= timeout:
+                process.terminate()
+                process.join()
+                conn.close()
+                del running[conn]
+                finish(index, job, {'status': 'timeout', 'error': f"exceeded {timeout}s"})
+
+    # Collect every diagram into one results file
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump([{**record,
+                    'diagrams': [_diagram_to_json(dgm) for dgm in record.get('diagrams', [])]}
+                   for record in records], f, indent=2)
+
+    n_ok = sum(1 for record in records if record['status'] == 'ok')
+    print(f"\n✓ {n_ok}/{len(jobs)} jobs completed")
+    print(f"Results saved to: {output_file}")
+
+    return records
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    print(f"Python: {sys.version}")
+    print(f"NumPy: {np.__version__}\n")
+
+    run_parallel_homology(seeds=(0, 1, 2), resolution=64, timeout=900, memory_limit=4 * 2**30)
@@ -0,0 +1,215 @@
+"""
+OMNIOPSIS - Parallel Beacon Search
+===================================
+
+Sharded version of beacon_search.systematic_search.
+
+The CONSTANTS × GENERATORS × resolutions grid is cut into independent work
+units (constant, generator, resolution) that are evaluated by a process
+pool. Each worker receives a chunk of units at the same resolution and
+measures them with the batched kernels of batch_metrics.py. Results stream
+back as soon as each chunk finishes and feed a running top-N heap, so the
+best candidates are always current and memory does not grow with the size
+of the grid. With a log file every result is also appended to a JSONL log
+that checkpoints the search (search_log.py): a restarted run skips the
+units already logged.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import os
+from itertools import groupby, islice
+from multiprocessing import Pool
+
+import numpy as np
+
+import batch_metrics
+import compression
+import generators as generator_module
+import registry
+from beacon_search import (
+    CONSTANTS,
+    GENERATORS,
+    generate_image,
+    compute_metrics,
+    compute_transmodal_score,
+)
+from batch_metrics import batch_compute_metrics
+from null_cache import formula_hash
+from search_log import TopN, SearchLog
+
+# ============================================================================
+# WORK UNITS
+# ============================================================================
+
+def work_units(constants=None, generators=None, resolutions=(8,)):
+    """
+    Enumerate the search grid as (index, constant name, constant value,
+    generator name, resolution) tuples.
+
+    Generators are referenced by name so that units stay cheap to pickle;
+    workers look the kernel up in GENERATORS.
+    """
+    constants = CONSTANTS if constants is None else constants
+    generators = list(GENERATORS) if generators is None else list(generators)
+
+    index = 0
+    for resolution in resolutions:
+        for const_name, const_value in constants.items():
+            for gen_name in generators:
+                yield (index, const_name, float(const_value), gen_name, resolution)
+                index += 1
+
+def work_chunks(units, chunksize):
+    """Group consecutive work units into lists of at most chunksize units sharing a resolution."""
+    for _, same_resolution in groupby(units, key=lambda unit: unit[4]):
+        while True:
+            chunk = list(islice(same_resolution, chunksize))
+            if not chunk:
+                break
+            yield chunk
+
+def evaluate_work_chunk(chunk):
+    """Generate, measure and score a chunk of work units (runs inside a worker)."""
+    results = []
+    images = []
+
+    for index, const_name, const_value, gen_name, resolution in chunk:
+        result = {
+            'index': index,
+            'name': f"{gen_name}_{const_name}",
+            'generator': gen_name,
+            'constant': const_name,
+            'constant_value': const_value,
+            'resolution': resolution,
+        }
+        try:
+            img_array, _ = generate_image(GENERATORS[gen_name], const_value, resolution)
+            images.append(img_array)
+        except Exception as e:
+            result['error'] = str(e)
+        results.append(result)
+
+    if images:
+        batch = batch_compute_metrics(np.stack(images))
+        valid = [result for result in results if 'error' not in result]
+        for j, result in enumerate(valid):
+            metrics = {
+                'shannon_entropy': float(batch['shannon_entropy'][j]),
+                'compression_ratio': float(batch['compression_ratio'][j]),
+                'spectral_flatness': float(batch['spectral_flatness'][j]),
+                'pixel_std': float(batch['pixel_std'][j]),
+                'pixel_range': int(batch['pixel_range'][j]),
+                'unique_values': int(batch['unique_values'][j]),
+            }
+            result['metrics'] = metrics
+            result['score'] = compute_transmodal_score(metrics)
+
+    return results
+
+# ============================================================================
+# PARALLEL SEARCH
+# ============================================================================
+
+def _stream_results(units, workers, chunksize):
+    """Yield evaluated units in completion order."""
+    chunks = work_chunks(units, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from evaluate_work_chunk(chunk)
+        return
+
+    with Pool(processes=workers) as pool:
+        for results in pool.imap_unordered(evaluate_work_chunk, chunks):
+            yield from results
+
+def search_code():
+    """Functions and modules whose source determines the scores of a search."""
+    return (generate_image, compute_metrics, compute_transmodal_score, evaluate_work_chunk,
+            batch_metrics, compression, generator_module, registry)
+
+def search_grid(constants, generators, resolutions):
+    """
+    JSON description of a search grid, recorded at the top of its log.
+
+    Besides the grid itself it records the generator expressions and a hash
+    of the generation, metric and scoring code, so a log is never resumed
+    with scores produced by different code.
+    """
+    generators = list(generators)
+    return {
+        'constants': {name: float(value) for name, value in constants.items()},
+        'generators': generators,
+        'resolutions': list(resolutions),
+        'expressions': {name: GENERATORS[name].expression for name in generators},
+        'code': formula_hash(*search_code()),
+    }
+
+def parallel_search(constants=None, generators=None, resolutions=(8,), top_n=20,
+                    workers=None, chunksize=16, log_file=None, resume=True):
+    """
+    Search the constant × generator × resolution grid on a process pool.
+
+    Args:
+        constants: {name: value} mapping (default: CONSTANTS)
+        generators: Iterable of generator names (default: all GENERATORS)
+        resolutions: Resolutions to evaluate
+        top_n: Number of candidates to keep
+        workers: Number of worker processes (default: all cores, 1 = in-process)
+        chunksize: Work units sent to a worker at a time
+        log_file: JSONL log of every evaluated unit, also used as checkpoint
+        resume: Skip the units already in log_file (False starts it over)
+
+    Returns:
+        list: Top N results, best first (ties keep grid order)
+    """
+    constants = CONSTANTS if constants is None else constants
+    generators = list(GENERATORS) if generators is None else list(generators)
+    workers = workers or os.cpu_count() or 1
+    total = len(constants) * len(generators) * len(resolutions)
+
+    print("="*70)
+    print("PARALLEL TRANSMODAL BEACON SEARCH")
+    print("="*70)
+    print(f"Constants to test: {len(constants)}")
+    print(f"Generators to test: {len(generators)}")
+    print(f"Resolutions: {', '.join(f'{r}×{r}' for r in resolutions)}")
+    print(f"Work units: {total} ({workers} workers, chunks of {chunksize})")
+
+    top = TopN(top_n)
+    log = None
+    count = 0
+    if log_file is not None:
+        log = SearchLog(log_file, search_grid(constants, generators, resolutions), total, resume)
+        count = log.open(top)
+        print(f"Log: {log_file} ({count} units already done)")
+    print()
+
+    units = work_units(constants, generators, resolutions)
+    if log is not None:
+        units = (unit for unit in units if not log.done[unit[0]])
+
+    try:
+        for result in _stream_results(units, workers, chunksize):
+            count += 1
+            label = f"{result['name']} @ {result['resolution']}"
+            if log is not None:
+                log.write(result['index'], result)
+
+            if 'error' in result:
+                print(f"[{count:5d}/{total}] {label:36s} | ERROR: {result['error']}")
+                continue
+
+            score = result['score']['total']
+            top.push(result['index'], result)
+
+            # Progress
+            if count % 100 == 0 or score > 50:
+                status = "★★★" if score > 60 else "★★" if score > 40 else "★"
+                print(f"[{count:5d}/{total}] {label:36s} | Score: {score:5.1f} {status}")
+    finally:
+        if log is not None:
+            log.close()
+
+    return top.results()
@@ -0,0 +1,163 @@
+"""
+OMNIOPSIS - Persistence Diagrams
+=================================
+
+One diagram container for every homology backend.
+
+Ripser (and the native H0 / cubical engines) return a list of (n, 2)
+arrays indexed by dimension, giotto-tda returns one (n, 3) array of
+(birth, death, dimension) rows. PersistenceDiagram normalizes both into a
+compact float32 (birth, death, dim) array sorted by dimension, so each
+dimension is a contiguous view, and everything downstream (metrics,
+summaries, plots, distances) runs on one code path.
+
+Vectorized summaries:
+- metrics: total / max persistence, number of features and persistence
+  entropy per dimension (finite bars), computed once per diagram
+- betti_curve: number of bars alive at each filtration value
+- landscape: the first k persistence landscape functions on a grid
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+
+# ============================================================================
+# DIAGRAM CONTAINER
+# ============================================================================
+
+class PersistenceDiagram:
+    """
+    Persistence diagram as a float32 (birth, death, dim) array.
+
+    Args:
+        points: (n, 3) array of (birth, death, dim) rows; infinite deaths
+                are kept as inf, zero-length bars are dropped
+    """
+
+    def __init__(self, points):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        points = points[points[:, 1] > points[:, 0]]
+        order = np.lexsort((points[:, 0], points[:, 2]))
+        self.points = np.ascontiguousarray(points[order])
+
+        dims = self.points[:, 2].astype(np.int64)
+        self.max_dimension = int(dims.max()) if len(dims) else -1
+        self._bounds = np.searchsorted(dims, np.arange(self.max_dimension + 2))
+        self._metrics = None
+
+    @classmethod
+    def from_dimensions(cls, diagrams):
+        """From a list of (n, 2) (birth, death) arrays indexed by dimension."""
+        rows = [np.column_stack([np.asarray(dgm, dtype=np.float32).reshape(-1, 2),
+                                 np.full(len(dgm), dim, dtype=np.float32)])
+                for dim, dgm in enumerate(diagrams)]
+        return cls(np.vstack(rows) if rows else np.empty((0, 3)))
+
+    @classmethod
+    def from_result(cls, persistence_result):
+        """From the result dict of any homology backend (list or (n, 3) format)."""
+        diagrams = persistence_result['diagrams']
+        if isinstance(diagrams, np.ndarray) and diagrams.ndim == 2 and diagrams.shape[1] == 3:
+            return cls(diagrams)
+        return cls.from_dimensions(diagrams)
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def dimensions(self):
+        return range(self.max_dimension + 1)
+
+    def dimension(self, dim):
+        """(n, 3) view of the bars of one dimension."""
+        if dim > self.max_dimension:
+            return self.points[:0]
+        return self.points[self._bounds[dim]:self._bounds[dim + 1]]
+
+    def pairs(self, dim, finite=False):
+        """(n, 2) (birth, death) view of one dimension, optionally finite bars only."""
+        pairs = self.dimension(dim)[:, :2]
+        return pairs[np.isfinite(pairs[:, 1])] if finite else pairs
+
+    # ------------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------------
+
+    @property
+    def metrics(self):
+        """
+        Scalar metrics per dimension over the finite bars (computed once).
+
+        Keys: H{dim}_total_persistence, H{dim}_max_persistence,
+        H{dim}_n_features, H{dim}_entropy (when the total is positive).
+        """
+        if self._metrics is None:
+            metrics = {}
+            for dim in self.dimensions:
+                pairs = self.pairs(dim, finite=True).astype(np.float64)
+                if len(pairs) == 0:
+                    continue
+                lifetimes = pairs[:, 1] - pairs[:, 0]
+                total = float(np.sum(lifetimes))
+
+                metrics[f'H{dim}_total_persistence'] = total
+                metrics[f'H{dim}_max_persistence'] = float(np.max(lifetimes))
+                metrics[f'H{dim}_n_features'] = int(len(lifetimes))
+                if total > 0:
+                    probs = lifetimes / total
+                    metrics[f'H{dim}_entropy'] = float(-np.sum(probs * np.log(probs + 1e-12)))
+            self._metrics = metrics
+        return self._metrics
+
+    def finite_range(self):
+        """(min birth, max finite death) over all dimensions."""
+        finite = self.points[np.isfinite(self.points[:, 1])]
+        if len(finite) == 0:
+            lo = float(self.points[:, 0].min()) if len(self.points) else 0.0
+            return lo, lo + 1.0
+        return float(self.points[:, 0].min()), float(finite[:, 1].max())
+
+    def grid(self, n_steps=100):
+        """Filtration grid spanning the finite range of the diagram."""
+        lo, hi = self.finite_range()
+        return np.linspace(lo, hi, n_steps)
+
+    # ------------------------------------------------------------------------
+    # Functional summaries
+    # ------------------------------------------------------------------------
+
+    def betti_curve(self, dim, grid):
+        """Number of bars of dimension dim alive (birth ≤ t < death) at each t of grid."""
+        pairs = self.pairs(dim)
+        births = np.sort(pairs[:, 0])
+        deaths = np.sort(pairs[:, 1])
+        return (np.searchsorted(births, grid, side='right')
+                - np.searchsorted(deaths, grid, side='right'))
+
+    def landscape(self, dim, grid, n_layers=5):
+        """
+        First n_layers persistence landscapes of dimension dim on grid.
+
+        λ_k(t) is the k-th largest tent value max(0, min(t - b, d - t));
+        infinite deaths are capped at the end of the grid.
+
+        Returns:
+            (n_layers, len(grid)) float64 array
+        """
+        grid = np.asarray(grid, dtype=np.float64)
+        pairs = self.pairs(dim).astype(np.float64)
+        layers = np.zeros((n_layers, len(grid)))
+        if len(pairs) == 0:
+            return layers
+
+        births = pairs[:, :1]
+        deaths = np.minimum(pairs[:, 1:], grid[-1])
+        tents = np.maximum(0.0, np.minimum(grid - births, deaths - grid))
+
+        k = min(n_layers, len(pairs))
+        if len(pairs) > k:
+            tents = np.partition(tents, len(pairs) - k, axis=0)[-k:]
+        layers[:k] = -np.sort(-tents, axis=0)
+        return layers
@@ -20,15 +20,23 @@ import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
 import matplotlib.pyplot as plt
 
+from generation_cache import cached_image
+from registry import CONSTANTS
+from subsampling import subsample
+from point_cloud import image_to_point_cloud, collapse_duplicate_points, multiplicity_metrics
+from h0_persistence import H0_METHOD, h0_persistence, h0_persistence_from_distance_matrix
+from cubical_persistence import cubical_persistence
+from persistence_diagram import PersistenceDiagram
+
 # ============================================================================
 # TOP 5 BEACONS TO ANALYZE
 # ============================================================================
 
 BEACONS = [
-    {'name': 'tau_champion', 'constant': 2 * np.pi, 'generator': 'sin_i2', 'label': 'τ = 2π (sin i²)'},
-    {'name': 'pi_original', 'constant': np.pi, 'generator': 'sin_i2', 'label': 'π (sin i²)'},
-    {'name': 'pi_linear', 'constant': np.pi, 'generator': 'sin_i', 'label': 'π (sin i)'},
-    {'name': 'pi_half', 'constant': np.pi / 2, 'generator': 'cos_i2', 'label': 'π/2 (cos i²)'},
+    {'name': 'tau_champion', 'constant': CONSTANTS['tau'], 'generator': 'sin_i2', 'label': 'τ = 2π (sin i²)'},
+    {'name': 'pi_original', 'constant': CONSTANTS['pi'], 'generator': 'sin_i2', 'label': 'π (sin i²)'},
+    {'name': 'pi_linear', 'constant': CONSTANTS['pi'], 'generator': 'sin_i', 'label': 'π (sin i)'},
+    {'name': 'pi_half', 'constant': CONSTANTS['pi_2'], 'generator': 'cos_i2', 'label': 'π/2 (cos i²)'},
     {'name': 'random', 'constant': None, 'generator': 'random', 'label': 'Random (baseline)'},
 ]
 
@@ -36,15 +44,6 @@ BEACONS = [
 # IMAGE GENERATION
 # ============================================================================
 
-def gen_sin_i2(i, c):
-    return 128 + 127 * np.sin(i**2 * c)
-
-def gen_sin_i(i, c):
-    return 128 + 127 * np.sin(i * c)
-
-def gen_cos_i2(i, c):
-    return 128 + 127 * np.cos(i**2 * c)
-
 def generate_beacon_image(beacon, resolution=64):
     """Generate image for a beacon."""
     if beacon['generator'] == 'random':
@@ -52,120 +51,82 @@ def generate_beacon_image(beacon, resolution=64):
         np.random.seed(42)
         img_array = np.random.randint(0, 256, (resolution, resolution, 3), dtype=np.uint8)
     else:
-        # Deterministic generation
-        gen_func = {
-            'sin_i2': gen_sin_i2,
-            'sin_i': gen_sin_i,
-            'cos_i2': gen_cos_i2
-        }[beacon['generator']]
-        
-        n = 3 * resolution * resolution
-        digits = []
-        for i in range(n):
-            val = gen_func(i, beacon['constant'])
-            digit = int(np.floor(val)) % 256
-            digits.append(digit)
-        
-        img_array = np.array(digits, dtype=np.uint8).reshape(resolution, resolution, 3)
+        # Deterministic generation (prefix shared across resolutions)
+        img_array = cached_image(beacon['generator'], beacon['constant'], resolution)
     
     return img_array
 
-# ============================================================================
-# POINT CLOUD EXTRACTION
-# ============================================================================
-
-def image_to_point_cloud(img_array, method='rgb_pixels'):
-    """
-    Convert image to point cloud for TDA.
-    
-    Methods:
-    - 'rgb_pixels': Each pixel as 3D point (R, G, B)
-    - 'spatial_rgb': Each pixel as 5D point (x, y, R, G, B)
-    - 'grayscale_patches': 3×3 grayscale patches as 9D points
-    """
-    h, w, c = img_array.shape
-    
-    if method == 'rgb_pixels':
-        # Simple: each pixel's RGB values
-        points = img_array.reshape(-1, 3).astype(np.float64)
-        
-    elif method == 'spatial_rgb':
-        # Include spatial coordinates
-        points = []
-        for y in range(h):
-            for x in range(w):
-                r, g, b = img_array[y, x]
-                points.append([x, y, r, g, b])
-        points = np.array(points, dtype=np.float64)
-        
-    elif method == 'grayscale_patches':
-        # 3×3 patches of grayscale values
-        gray = np.mean(img_array, axis=2)
-        points = []
-        for y in range(1, h-1):
-            for x in range(1, w-1):
-                patch = gray[y-1:y+2, x-1:x+2].flatten()
-                points.append(patch)
-        points = np.array(points, dtype=np.float64)
-    
-    return points
-
 # ============================================================================
 # PERSISTENT HOMOLOGY (RIPSER IMPLEMENTATION)
 # ============================================================================
 
-def compute_persistent_homology_ripser(points, max_dimension=2, max_edge_length=100):
+def compute_persistent_homology_ripser(points, max_dimension=2, max_edge_length=100,
+                                       sampling='maxmin', seed=0, n_samples=None, weights=None):
     """
     Compute persistent homology using Ripser (lightweight, works on Windows).
     
+    Points are subsampled with subsampling.subsample (method `sampling`,
+    explicit `seed`, n_samples from the compute budget by default).
+    `weights` are the multiplicities of collapsed duplicate points
+    (point_cloud.collapse_duplicate_points). Their metrics describe the
+    full cloud and are taken before subsampling ('multiplicity'); the
+    weights of the sampled points are kept for the persistence backend.
+    
     Returns persistence diagrams for H0, H1, H2 (if computed).
     """
     try:
         from ripser import ripser
-        from persim import plot_diagrams
         
-        # Subsample if too many points (Ripser can be slow)
-        if len(points) > 500:
-            indices = np.random.choice(len(points), 500, replace=False)
-            points_sampled = points[indices]
-        else:
-            points_sampled = points
+        # Subsample (Ripser can be slow on large clouds)
+        sample = subsample(points, n_samples, sampling, seed, max_dimension)
         
-        # Compute persistence
-        result = ripser(points_sampled, maxdim=max_dimension, thresh=max_edge_length)
+        # Compute persistence (witness complex: landmark distance matrix)
+        if 'distance_matrix' in sample:
+            result = ripser(sample['distance_matrix'], maxdim=max_dimension,
+                            thresh=max_edge_length, distance_matrix=True)
+        else:
+            result = ripser(sample['points'], maxdim=max_dimension, thresh=max_edge_length)
         diagrams = result['dgms']
         
         return {
             'diagrams': diagrams,
             'method': 'ripser',
-            'n_points': len(points_sampled),
-            'max_dimension': max_dimension
+            'n_points': len(sample['indices']),
+            'max_dimension': max_dimension,
+            'sampling': sampling,
+            'seed': seed,
+            'weights': None if weights is None else weights[sample['indices']],
+            'multiplicity': None if weights is None else multiplicity_metrics(weights)
         }
         
     except ImportError:
         print("⚠ Ripser not installed. Attempting giotto-tda...")
-        return compute_persistent_homology_giotto(points, max_dimension)
+        return compute_persistent_homology_giotto(points, max_dimension, sampling, seed, n_samples,
+                                                  weights)
 
-def compute_persistent_homology_giotto(points, max_dimension=2):
+def compute_persistent_homology_giotto(points, max_dimension=2, sampling='maxmin', seed=0,
+                                       n_samples=None, weights=None):
     """
     Compute persistent homology using giotto-tda (more comprehensive).
     """
     try:
         from gtda.homology import VietorisRipsPersistence
         
-        # Subsample if needed
-        if len(points) > 500:
-            indices = np.random.choice(len(points), 500, replace=False)
-            points_sampled = points[indices]
-        else:
-            points_sampled = points
+        # Subsample
+        sample = subsample(points, n_samples, sampling, seed, max_dimension)
         
-        # Reshape for giotto-tda (expects shape: (n_samples, n_points, n_features))
-        X = points_sampled.reshape(1, len(points_sampled), -1)
+        # Reshape for giotto-tda (expects shape: (n_samples, n_points, n_features)
+        # or (n_samples, n_points, n_points) for a precomputed distance matrix)
+        if 'distance_matrix' in sample:
+            X = sample['distance_matrix'][np.newaxis]
+            metric = 'precomputed'
+        else:
+            X = sample['points'].reshape(1, len(sample['points']), -1)
+            metric = 'euclidean'
         
         # Create persistence object
         persistence = VietorisRipsPersistence(
-            metric='euclidean',
+            metric=metric,
             homology_dimensions=[0, 1, 2] if max_dimension >= 2 else [0, 1],
             n_jobs=1
         )
@@ -176,136 +137,74 @@ def compute_persistent_homology_giotto(points, max_dimension=2):
         return {
             'diagrams': diagrams[0],  # First sample
             'method': 'giotto-tda',
-            'n_points': len(points_sampled),
-            'max_dimension': max_dimension
+            'n_points': len(sample['indices']),
+            'max_dimension': max_dimension,
+            'sampling': sampling,
+            'seed': seed,
+            'weights': None if weights is None else weights[sample['indices']],
+            'multiplicity': None if weights is None else multiplicity_metrics(weights)
         }
         
     except ImportError:
         print("✗ Neither Ripser nor giotto-tda installed.")
-        return compute_persistent_homology_manual(points)
+        return compute_persistent_homology_manual(points, sampling, seed, n_samples, weights)
 
-def compute_persistent_homology_manual(points):
+def compute_persistent_homology_manual(points, sampling='maxmin', seed=0, n_samples=None,
+                                       weights=None):
     """
-    Manual computation of basic persistence statistics when libraries unavailable.
-    """
-    from scipy.spatial.distance import pdist, squareform
-    from scipy.cluster.hierarchy import linkage
+    Exact H0 persistence with the native engine when libraries are unavailable.
     
-    # Compute pairwise distances
-    if len(points) > 500:
-        indices = np.random.choice(len(points), 500, replace=False)
-        points_sampled = points[indices]
+    The KD-tree MST (h0_persistence.py) needs no distance matrix, so the full
+    cloud is used unless n_samples is given or the witness complex is requested.
+    """
+    if n_samples is None and sampling != 'witness':
+        indices = np.arange(len(points))
+        h0_diagram = h0_persistence(points)
     else:
-        points_sampled = points
-    
-    distances = pdist(points_sampled, metric='euclidean')
-    dist_matrix = squareform(distances)
-    
-    # Hierarchical clustering as proxy for H0 persistence
-    Z = linkage(distances, method='single')
-    
-    # Births and deaths from dendrogram
-    births = np.zeros(len(Z))
-    deaths = Z[:, 2]
-    
-    # Create mock H0 diagram
-    h0_diagram = np.column_stack([births, deaths])
+        sample = subsample(points, n_samples, sampling, seed)
+        indices = sample['indices']
+        if 'distance_matrix' in sample:
+            h0_diagram = h0_persistence_from_distance_matrix(sample['distance_matrix'])
+        else:
+            h0_diagram = h0_persistence(sample['points'])
     
     return {
-        'diagrams': [h0_diagram],  # Only H0
-        'method': 'manual (hierarchical clustering)',
-        'n_points': len(points_sampled),
-        'max_dimension': 0
+        'diagrams': [h0_diagram],  # Only H0 (Ripser format)
+        'method': H0_METHOD,
+        'n_points': len(indices),
+        'max_dimension': 0,
+        'sampling': sampling,
+        'seed': seed,
+        'weights': None if weights is None else weights[indices],
+        'multiplicity': None if weights is None else multiplicity_metrics(weights)
     }
 
 # ============================================================================
 # PERSISTENCE METRICS
 # ============================================================================
 
+def persistence_diagram(persistence_result):
+    """Normalized PersistenceDiagram of a backend result (built once, cached in the result)."""
+    if 'diagram' not in persistence_result:
+        persistence_result['diagram'] = PersistenceDiagram.from_result(persistence_result)
+    return persistence_result['diagram']
+
 def compute_persistence_metrics(persistence_result):
     """
     Extract quantitative metrics from persistence diagrams.
     
-    Metrics:
+    Metrics (per dimension, finite bars, any backend):
     - Total persistence (sum of lifetimes)
     - Longest persistence (max lifetime)
     - Number of features
     - Persistence entropy
+    - Point multiplicities of the full cloud (when duplicate points were
+      collapsed; independent of the subsampling)
     """
-    diagrams = persistence_result['diagrams']
-    method = persistence_result['method']
-    
-    metrics = {}
+    metrics = dict(persistence_diagram(persistence_result).metrics)
     
-    if method == 'ripser':
-        # Ripser format: list of arrays [(birth, death), ...]
-        for dim, dgm in enumerate(diagrams):
-            if len(dgm) == 0:
-                continue
-            
-            # Filter infinite death times (connected components)
-            finite_dgm = dgm[np.isfinite(dgm).all(axis=1)]
-            
-            if len(finite_dgm) == 0:
-                continue
-            
-            births = finite_dgm[:, 0]
-            deaths = finite_dgm[:, 1]
-            lifetimes = deaths - births
-            
-            # Metrics for this dimension
-            metrics[f'H{dim}_total_persistence'] = float(np.sum(lifetimes))
-            metrics[f'H{dim}_max_persistence'] = float(np.max(lifetimes))
-            metrics[f'H{dim}_n_features'] = int(len(lifetimes))
-            
-            # Persistence entropy
-            if np.sum(lifetimes) > 0:
-                probs = lifetimes / np.sum(lifetimes)
-                entropy = -np.sum(probs * np.log(probs + 1e-12))
-                metrics[f'H{dim}_entropy'] = float(entropy)
-    
-    elif method == 'giotto-tda':
-        # Giotto-tda format: array of (birth, death, dimension)
-        dgm = diagrams
-        for dim in [0, 1, 2]:
-            dim_dgm = dgm[dgm[:, 2] == dim]
-            
-            if len(dim_dgm) == 0:
-                continue
-            
-            births = dim_dgm[:, 0]
-            deaths = dim_dgm[:, 1]
-            finite_mask = np.isfinite(deaths)
-            
-            lifetimes = deaths[finite_mask] - births[finite_mask]
-            
-            if len(lifetimes) == 0:
-                continue
-            
-            metrics[f'H{dim}_total_persistence'] = float(np.sum(lifetimes))
-            metrics[f'H{dim}_max_persistence'] = float(np.max(lifetimes))
-            metrics[f'H{dim}_n_features'] = int(len(lifetimes))
-            
-            if np.sum(lifetimes) > 0:
-                probs = lifetimes / np.sum(lifetimes)
-                entropy = -np.sum(probs * np.log(probs + 1e-12))
-                metrics[f'H{dim}_entropy'] = float(entropy)
-    
-    elif method == 'manual (hierarchical clustering)':
-        # Manual H0 only
-        dgm = diagrams[0]
-        births = dgm[:, 0]
-        deaths = dgm[:, 1]
-        lifetimes = deaths - births
-        
-        metrics['H0_total_persistence'] = float(np.sum(lifetimes))
-        metrics['H0_max_persistence'] = float(np.max(lifetimes))
-        metrics['H0_n_features'] = int(len(lifetimes))
-        
-        if np.sum(lifetimes) > 0:
-            probs = lifetimes / np.sum(lifetimes)
-            entropy = -np.sum(probs * np.log(probs + 1e-12))
-            metrics['H0_entropy'] = float(entropy)
+    if persistence_result.get('multiplicity') is not None:
+        metrics.update(persistence_result['multiplicity'])
     
     return metrics
 
@@ -314,35 +213,34 @@ def compute_persistence_metrics(persistence_result):
 # ============================================================================
 
 def plot_persistence_diagram(persistence_result, title, output_path):
-    """Plot persistence diagram."""
-    diagrams = persistence_result['diagrams']
-    method = persistence_result['method']
+    """Plot persistence diagram (any backend)."""
+    diagram = persistence_diagram(persistence_result)
     
     fig, ax = plt.subplots(figsize=(8, 8))
     
     colors = ['red', 'blue', 'green']
     labels = ['H₀ (components)', 'H₁ (loops)', 'H₂ (voids)']
     
-    if method == 'ripser':
-        for dim, dgm in enumerate(diagrams):
-            if len(dgm) == 0:
-                continue
-            
-            # Separate finite and infinite points
-            finite_mask = np.isfinite(dgm).all(axis=1)
-            finite_dgm = dgm[finite_mask]
-            infinite_dgm = dgm[~finite_mask]
-            
-            # Plot finite points
-            if len(finite_dgm) > 0:
-                ax.scatter(finite_dgm[:, 0], finite_dgm[:, 1], 
-                          c=colors[dim], label=labels[dim], alpha=0.6, s=50)
-            
-            # Plot infinite points (on diagonal extension)
-            if len(infinite_dgm) > 0:
-                max_birth = np.max(finite_dgm[:, 0]) if len(finite_dgm) > 0 else 1
-                for pt in infinite_dgm:
-                    ax.scatter(pt[0], max_birth * 1.5, c=colors[dim], marker='^', s=100)
+    for dim in diagram.dimensions:
+        dgm = diagram.pairs(dim)
+        if len(dgm) == 0 or dim >= len(colors):
+            continue
+        
+        # Separate finite and infinite points
+        finite_mask = np.isfinite(dgm).all(axis=1)
+        finite_dgm = dgm[finite_mask]
+        infinite_dgm = dgm[~finite_mask]
+        
+        # Plot finite points
+        if len(finite_dgm) > 0:
+            ax.scatter(finite_dgm[:, 0], finite_dgm[:, 1], 
+                      c=colors[dim], label=labels[dim], alpha=0.6, s=50)
+        
+        # Plot infinite points (on diagonal extension)
+        if len(infinite_dgm) > 0:
+            max_birth = np.max(finite_dgm[:, 0]) if len(finite_dgm) > 0 else 1
+            for pt in infinite_dgm:
+                ax.scatter(pt[0], max_birth * 1.5, c=colors[dim], marker='^', s=100)
     
     # Diagonal line
     max_val = 100
@@ -397,21 +295,30 @@ def analyze_all_beacons(resolution=64, output_dir='experiments/results/homology'
             # Extract point cloud
             print(f"  ├─ Extracting point cloud...")
             points = image_to_point_cloud(img_array, method='rgb_pixels')
-            print(f"  │  └─ {len(points)} points in 3D RGB space")
+            n_points = len(points)
+            points, counts = collapse_duplicate_points(points)
+            print(f"  │  └─ {n_points} points in 3D RGB space ({len(points)} distinct)")
             
             # Compute persistent homology
             print(f"  ├─ Computing persistent homology...")
-            persistence = compute_persistent_homology_ripser(points, max_dimension=2)
+            persistence = compute_persistent_homology_ripser(points, max_dimension=2, weights=counts)
             print(f"  │  └─ Method: {persistence['method']}")
             
             # Compute metrics
             print(f"  ├─ Computing metrics...")
             metrics = compute_persistence_metrics(persistence)
             
+            # Grid-native signature: cubical persistence of the grayscale image
+            print(f"  ├─ Computing cubical persistence...")
+            cubical_metrics = compute_persistence_metrics(cubical_persistence(img_array))
+            
             # Print metrics
             print(f"  ├─ Metrics:")
             for key, value in sorted(metrics.items()):
                 print(f"  │  ├─ {key}: {value}")
+            print(f"  ├─ Cubical metrics:")
+            for key, value in sorted(cubical_metrics.items()):
+                print(f"  │  ├─ {key}: {value}")
             
             # Plot persistence diagram
             print(f"  └─ Plotting persistence diagram...")
@@ -423,6 +330,7 @@ def analyze_all_beacons(resolution=64, output_dir='experiments/results/homology'
             results.append({
                 'beacon': beacon,
                 'metrics': metrics,
+                'cubical_metrics': cubical_metrics,
                 'persistence_method': persistence['method'],
                 'n_points': persistence['n_points']
             })
@@ -442,6 +350,7 @@ def analyze_all_beacons(resolution=64, output_dir='experiments/results/homology'
                 'beacon_name': r['beacon']['name'],
                 'beacon_label': r['beacon']['label'],
                 'metrics': r['metrics'],
+                'cubical_metrics': r['cubical_metrics'],
                 'persistence_method': r['persistence_method'],
                 'n_points': r['n_points']
             })
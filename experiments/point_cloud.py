@@ -0,0 +1,141 @@
+"""
+OMNIOPSIS - Point-Cloud Construction
+=====================================
+
+Point clouds extracted from beacon images for persistent homology.
+
+Methods:
+- 'rgb_pixels': each pixel as a 3D point (R, G, B)
+- 'spatial_rgb': each pixel as a 5D point (x, y, R, G, B)
+- 'grayscale_patches': p×p grayscale patches as p²-D points
+
+Clouds are built with array operations only: pixel coordinates come from
+np.indices and patches from sliding_window_view, a strided view of the
+grayscale image, so nothing is copied until the final (N, D) array.
+Patch size, stride and normalization are configurable.
+
+Structured beacons have very few distinct colours (sin_i2 with τ has a
+handful of unique values), so most 'rgb_pixels' points are exact
+duplicates. Duplicates do not change the Vietoris–Rips homology beyond
+zero-length H0 bars, so they are collapsed into weighted points before
+persistence: the distance cost then depends on the number of distinct
+points, and the multiplicities are kept for the metrics.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+POINT_CLOUD_METHODS = ['rgb_pixels', 'spatial_rgb', 'grayscale_patches']
+
+NORMALIZATIONS = ['none', 'minmax', 'standard', 'center', 'contrast']
+
+# ============================================================================
+# POINT CLOUD CONSTRUCTION
+# ============================================================================
+
+def image_patches(gray, patch_size=3, stride=1):
+    """(n_y, n_x, patch_size, patch_size) strided view of the patches of a 2D array."""
+    return sliding_window_view(gray, (patch_size, patch_size))[::stride, ::stride]
+
+def normalize_points(points, normalization='none'):
+    """
+    Normalize a point cloud.
+
+    - 'none': unchanged
+    - 'minmax': each coordinate scaled to [0, 1]
+    - 'standard': each coordinate to zero mean and unit variance
+    - 'center': each point minus its own mean (patch brightness removed)
+    - 'contrast': centered, then scaled to unit norm (flat points stay 0)
+    """
+    if normalization == 'none':
+        return points
+    if normalization == 'minmax':
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        return (points - lo) / np.where(hi > lo, hi - lo, 1.0)
+    if normalization == 'standard':
+        std = points.std(axis=0)
+        return (points - points.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    if normalization in ('center', 'contrast'):
+        centered = points - points.mean(axis=1, keepdims=True)
+        if normalization == 'center':
+            return centered
+        norm = np.linalg.norm(centered, axis=1, keepdims=True)
+        return centered / np.where(norm > 0, norm, 1.0)
+    raise ValueError(f"Unknown normalization: {normalization!r}")
+
+def image_to_point_cloud(img_array, method='rgb_pixels', patch_size=3, stride=1,
+                         normalization='none'):
+    """
+    Convert image to point cloud for TDA.
+
+    Args:
+        img_array: (h, w, 3) image
+        method: One of POINT_CLOUD_METHODS
+        patch_size: Side of the 'grayscale_patches' patches
+        stride: Pixel step between consecutive points (patch centers for
+                'grayscale_patches')
+        normalization: One of NORMALIZATIONS (see normalize_points)
+
+    Returns:
+        (N, D) float64 array, pixels in row-major order
+    """
+    h, w, c = img_array.shape
+
+    if method == 'rgb_pixels':
+        points = img_array[::stride, ::stride].reshape(-1, 3).astype(np.float64)
+
+    elif method == 'spatial_rgb':
+        ys, xs = np.indices((h, w))[:, ::stride, ::stride]
+        points = np.column_stack([xs.ravel(), ys.ravel(),
+                                  img_array[::stride, ::stride].reshape(-1, c)]).astype(np.float64)
+
+    elif method == 'grayscale_patches':
+        gray = np.mean(img_array, axis=2)
+        patches = image_patches(gray, patch_size, stride)
+        points = patches.reshape(-1, patch_size * patch_size)
+
+    else:
+        raise ValueError(f"Unknown point cloud method: {method!r}")
+
+    return normalize_points(points, normalization)
+
+# ============================================================================
+# DUPLICATE COLLAPSE
+# ============================================================================
+
+def collapse_duplicate_points(points):
+    """
+    Collapse identical points into weighted points.
+
+    Args:
+        points: (N, D) array
+
+    Returns:
+        tuple: (unique points (M, D), counts (M,) int64 summing to N)
+    """
+    unique_points, counts = np.unique(points, axis=0, return_counts=True)
+    return unique_points, counts.astype(np.int64)
+
+def multiplicity_metrics(weights):
+    """
+    Metrics of the point multiplicities.
+
+    Each collapsed duplicate is a zero-length H0 bar of the full cloud, so
+    H0 of the full cloud is the H0 of the distinct points plus
+    H0_zero_persistence_features bars at (0, 0).
+    """
+    weights = np.asarray(weights, dtype=np.int64)
+    n_total = int(weights.sum())
+    probs = weights / n_total
+
+    return {
+        'n_points_total': n_total,
+        'n_unique_points': int(len(weights)),
+        'duplicate_fraction': float(1 - len(weights) / n_total),
+        'H0_zero_persistence_features': int(n_total - len(weights)),
+        'multiplicity_entropy': float(-np.sum(probs * np.log(probs))),
+        'max_multiplicity': int(weights.max()),
+    }
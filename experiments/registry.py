@@ -0,0 +1,245 @@
+"""
+OMNIOPSIS - Generator / Constant Registry
+==========================================
+
+Single declaration point for the generators and constants of every sweep.
+
+Generators are symbolic expressions in the flat component index i and the
+constant c, e.g. "128 + 127*sin(i**2*c)". Each expression is compiled once
+into a vectorized NumPy kernel:
+- the expression is parsed with `ast` and checked against a whitelist
+  (numbers, i, c, named constants, + - * / // % **, NumPy functions)
+- subexpressions that depend on neither i nor c are folded to float
+  constants at compile time
+- small integer powers of i become repeated products (i*i*i), which are
+  correctly rounded exactly like the historical kernels
+- the result is emitted as Python source over np.* calls and compiled, so
+  a kernel call costs no more than a hand-written one
+
+i is evaluated in float64. Constants are declared the same way ("2*pi",
+"(1 + sqrt(5))/2") and evaluated once. Adding a family to a sweep is a
+register_generator call or an entry in a JSON config (load_registry).
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import ast
+import json
+
+import numpy as np
+
+# ============================================================================
+# EXPRESSION COMPILER
+# ============================================================================
+
+FUNCTIONS = {
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan',
+    'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh',
+    'arcsin': 'arcsin', 'arccos': 'arccos', 'arctan': 'arctan',
+    'exp': 'exp', 'log': 'log', 'log2': 'log2', 'log10': 'log10',
+    'sqrt': 'sqrt', 'floor': 'floor', 'ceil': 'ceil', 'abs': 'abs',
+}
+
+NAMED_CONSTANTS = {
+    'pi': np.pi,
+    'e': np.e,
+    'tau': 2 * np.pi,
+}
+
+BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+# Largest integer power of i expanded into repeated products
+MAX_EXPANDED_POWER = 4
+
+class ExpressionError(ValueError):
+    """Raised for expressions outside the supported grammar."""
+
+def _check(node, variables):
+    """Validate the AST of an expression against the whitelist."""
+    if isinstance(node, ast.Expression):
+        return _check(node.body, variables)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        return
+    if isinstance(node, ast.Name):
+        if node.id not in variables and node.id not in NAMED_CONSTANTS:
+            raise ExpressionError(f"Unknown name: {node.id!r}")
+        return
+    if isinstance(node, ast.BinOp) and isinstance(node.op, BINARY_OPERATORS):
+        _check(node.left, variables)
+        _check(node.right, variables)
+        return
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, UNARY_OPERATORS):
+        _check(node.operand, variables)
+        return
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+            and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords:
+        _check(node.args[0], variables)
+        return
+    raise ExpressionError(f"Unsupported syntax: {ast.unparse(node)!r}")
+
+def _depends(node, variables):
+    return any(isinstance(n, ast.Name) and n.id in variables for n in ast.walk(node))
+
+def _evaluate(node):
+    """Numeric value of a variable-free subexpression (float64 semantics)."""
+    source = ast.unparse(_to_numpy(node, {}))
+    return float(eval(compile(source, '<constant>', 'eval'), {'np': np, '__builtins__': {}}))
+
+def _to_numpy(node, renames):
+    """Rewrite names and function calls into NumPy source form."""
+    class Rewriter(ast.NodeTransformer):
+        def visit_Name(self, n):
+            if n.id in renames:
+                return ast.copy_location(ast.Name(renames[n.id], ast.Load()), n)
+            if n.id in NAMED_CONSTANTS:
+                return ast.copy_location(ast.Constant(float(NAMED_CONSTANTS[n.id])), n)
+            return n
+
+        def visit_Call(self, n):
+            self.generic_visit(n)
+            func = ast.Attribute(ast.Name('np', ast.Load()), FUNCTIONS[n.func.id], ast.Load())
+            return ast.copy_location(ast.Call(func, n.args, []), n)
+
+    return ast.fix_missing_locations(Rewriter().visit(ast.parse(ast.unparse(node), mode='eval')).body)
+
+def _fold(node, variables):
+    """Fold variable-free subtrees; expand small integer powers of a variable."""
+    if not _depends(node, variables):
+        if isinstance(node, ast.Constant):
+            return node
+        return ast.Constant(_evaluate(node))
+
+    if isinstance(node, ast.BinOp):
+        left, right = _fold(node.left, variables), _fold(node.right, variables)
+        if isinstance(node.op, ast.Pow) and isinstance(left, ast.Name) \
+                and isinstance(right, ast.Constant) and isinstance(right.value, int) \
+                and 1 <= right.value <= MAX_EXPANDED_POWER:
+            product = left
+            for _ in range(right.value - 1):
+                product = ast.BinOp(product, ast.Mult(), ast.Name(left.id, ast.Load()))
+            return product
+        return ast.BinOp(left, node.op, right)
+    if isinstance(node, ast.UnaryOp):
+        return ast.UnaryOp(node.op, _fold(node.operand, variables))
+    if isinstance(node, ast.Call):
+        return ast.Call(node.func, [_fold(node.args[0], variables)], [])
+    return node
+
+def compile_expression(expression, name=None):
+    """
+    Compile an expression in i and c into a kernel f(i, c) → float64 array.
+
+    Args:
+        expression: e.g. "128 + 127*sin(i**2*c)"
+        name: Kernel name (for repr and caching)
+
+    Returns:
+        callable: Vectorized kernel with .expression and .source attributes
+    """
+    tree = ast.parse(expression.strip(), mode='eval')
+    _check(tree, {'i', 'c'})
+    folded = _fold(tree.body, {'i', 'c'})
+    body = ast.unparse(_to_numpy(folded, {'i': 'x'}))
+
+    source = (f"def kernel(i, c):\n"
+              f"    x = np.asarray(i).astype(np.float64)\n"
+              f"    return np.broadcast_to({body}, x.shape)\n")
+    namespace = {'np': np}
+    exec(compile(source, f"<generator {name or expression}>", 'exec'), namespace)
+
+    kernel = namespace['kernel']
+    kernel.__name__ = kernel.__qualname__ = f"gen_{name}" if name else 'kernel'
+    kernel.__doc__ = expression
+    kernel.expression = expression
+    kernel.source = source
+    return kernel
+
+def evaluate_constant(expression):
+    """Value of a constant given as a number or an expression such as "2*pi"."""
+    if isinstance(expression, (int, float, np.floating)):
+        return float(expression)
+    tree = ast.parse(str(expression).strip(), mode='eval')
+    _check(tree, set())
+    return _evaluate(tree.body)
+
+# ============================================================================
+# DECLARATIONS
+# ============================================================================
+
+GENERATOR_EXPRESSIONS = {
+    'sin_i2': '128 + 127*sin(i**2*c)',              # Original: sin(i² × c)
+    'cos_i2': '128 + 127*cos(i**2*c)',              # Cosine variant: cos(i² × c)
+    'sin_i': '128 + 127*sin(i*c)',                  # Linear: sin(i × c)
+    'sin_i3': '128 + 127*sin(i**3*c)',              # Cubic: sin(i³ × c)
+    'mod_i2': 'floor(i**2*c) % 256',                # Modulo: (i² × c) mod 256
+    'mod_i': 'floor(i*c) % 256',                    # Linear modulo: (i × c) mod 256
+    'frac_i2': 'floor(((i**2*c) % 1)*256)',         # Fractional part scaled: frac(i² × c) × 256
+    'tan_i2': 'floor(128 + 127*tanh(i**2*c*0.001))',  # Tangent (bounded), scaled to avoid overflow
+    'sin_log': '128 + 127*sin(log(i + 1)*c)',       # Logarithmic: sin(log(i+1) × c)
+    'sin_sqrt': '128 + 127*sin(sqrt(i)*c)',         # Square root: sin(√i × c)
+}
+
+CONSTANT_EXPRESSIONS = {
+    # Algebraic
+    'sqrt2': 'sqrt(2)',                 # √2 ≈ 1.41421
+    'sqrt3': 'sqrt(3)',                 # √3 ≈ 1.73205
+    'sqrt5': 'sqrt(5)',                 # √5 ≈ 2.23607
+    'golden_phi': '(1 + sqrt(5)) / 2',  # φ ≈ 1.61803
+    'silver': '1 + sqrt(2)',            # δₛ ≈ 2.41421
+
+    # Transcendental
+    'pi': 'pi',                         # π ≈ 3.14159
+    'e': 'e',                           # e ≈ 2.71828
+    'tau': '2 * pi',                    # τ = 2π ≈ 6.28318
+    'ln2': 'log(2)',                    # ln(2) ≈ 0.69315
+    'log10_e': 'log10(e)',              # log₁₀(e) ≈ 0.43429
+
+    # Mathematical constants
+    'euler_gamma': 0.5772156649,        # γ (Euler-Mascheroni)
+    'apery': 1.2020569,                 # ζ(3) (Apéry's constant)
+    'catalan': 0.915965594,             # G (Catalan's constant)
+    'khinchin': 2.6854520010,           # K₀ (Khinchin's constant)
+    'glaisher': 1.2824271291,           # A (Glaisher-Kinkelin)
+
+    # Multiples for testing
+    'pi_2': 'pi / 2',
+    'pi_4': 'pi / 4',
+    '2pi': '2 * pi',
+    '3pi': '3 * pi',
+    'e_2': 'e / 2',
+    '2e': '2 * e',
+}
+
+GENERATORS = {}
+CONSTANTS = {}
+
+def register_generator(name, expression):
+    """Compile and register a generator; returns its kernel."""
+    GENERATORS[name] = compile_expression(expression, name)
+    return GENERATORS[name]
+
+def register_constant(name, expression):
+    """Evaluate and register a constant; returns its value."""
+    CONSTANTS[name] = evaluate_constant(expression)
+    return CONSTANTS[name]
+
+def load_registry(path):
+    """
+    Register the generators and constants of a JSON config:
+    {"generators": {name: expression}, "constants": {name: number or expression}}
+    """
+    with open(path, 'r') as f:
+        config = json.load(f)
+    for name, expression in config.get('constants', {}).items():
+        register_constant(name, expression)
+    for name, expression in config.get('generators', {}).items():
+        register_generator(name, expression)
+    return config
+
+for _name, _expression in GENERATOR_EXPRESSIONS.items():
+    register_generator(_name, _expression)
+for _name, _expression in CONSTANT_EXPRESSIONS.items():
+    register_constant(_name, _expression)
@@ -0,0 +1,154 @@
+"""
+OMNIOPSIS - Search Log and Top-N Heap
+======================================
+
+Constant-memory bookkeeping for beacon searches.
+
+- TopN keeps only the best N results in a bounded min-heap instead of
+  collecting and sorting every result.
+- SearchLog appends every evaluated work unit to a JSONL log as soon as it
+  is scored, and doubles as the checkpoint: reopening the log of the same
+  search grid marks the logged units as done (one bool per unit) and
+  replays their results into the heap, so an interrupted sweep resumes
+  where it stopped. A line cut short by the interruption is dropped.
+  Units logged with an error are not marked done, so a resumed run
+  retries them.
+
+The first line of the log describes the search grid (for the beacon
+searches: constants, generators, resolutions, generator expressions and a
+hash of the scoring code); resuming with a different grid raises a
+ValueError instead of mixing incompatible or stale results.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import heapq
+import json
+from pathlib import Path
+
+import numpy as np
+
+# ============================================================================
+# TOP-N HEAP
+# ============================================================================
+
+class TopN:
+    """
+    Best n results by score['total']; on equal scores the earlier unit wins.
+
+    Args:
+        n: Number of results kept
+    """
+
+    def __init__(self, n):
+        self.n = n
+        # Min-heap of (score, -index, result): the root is the weakest candidate,
+        # and on equal scores the later unit is evicted first
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, index, result):
+        if self.n <= 0:
+            return
+        item = (result['score']['total'], -index, result)
+        if len(self.heap) < self.n:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def results(self):
+        """Kept results, best first."""
+        return [item[2] for item in sorted(self.heap, key=lambda item: (-item[0], -item[1]))]
+
+# ============================================================================
+# SEARCH LOG
+# ============================================================================
+
+class SearchLog:
+    """
+    Append-only JSONL log of a search, usable as a checkpoint.
+
+    Args:
+        path: Log file
+        grid: JSON-serializable description of the search grid
+        total: Number of work units of the grid
+        resume: Continue an existing log of the same grid (False overwrites it)
+    """
+
+    def __init__(self, path, grid, total, resume=True):
+        self.path = Path(path)
+        self.grid = json.loads(json.dumps(grid))
+        self.done = np.zeros(total, dtype=bool)
+        self.resume = resume and self.path.exists()
+        self.file = None
+
+    @property
+    def n_done(self):
+        return int(self.done.sum())
+
+    def open(self, top=None):
+        """
+        Open the log for appending, replaying logged results into top (a TopN).
+
+        Returns:
+            int: Number of work units already logged
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.resume:
+            self.file = open(self.path, 'w')
+            self.file.write(json.dumps({'grid': self.grid}) + '\n')
+            self.file.flush()
+            return 0
+
+        with open(self.path, 'rb') as f:
+            header = f.readline()
+            if not header.endswith(b'\n'):
+                self.resume = False
+                return self.open(top)
+            logged = json.loads(header).get('grid') or {}
+            if logged != self.grid:
+                changed = sorted(key for key in set(logged) | set(self.grid)
+                                 if logged.get(key) != self.grid.get(key))
+                raise ValueError(f"{self.path} logs a different search grid "
+                                 f"(changed: {', '.join(changed)}); "
+                                 f"use another log file or resume=False")
+            valid_bytes = len(header)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_bytes += len(line)
+                if 'error' in record['result']:
+                    continue
+                self.done[record['index']] = True
+                if top is not None and 'score' in record['result']:
+                    top.push(record['index'], record['result'])
+
+        self.file = open(self.path, 'r+')
+        self.file.truncate(valid_bytes)
+        self.file.seek(valid_bytes)
+        return self.n_done
+
+    def write(self, index, result):
+        """Log one evaluated work unit (units with an 'error' stay pending)."""
+        self.file.write(json.dumps({'index': index, 'result': result}) + '\n')
+        self.file.flush()
+        if 'error' not in result:
+            self.done[index] = True
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
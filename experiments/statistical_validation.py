@@ -5,18 +5,25 @@ Tests Statistiques : Bootstrap et P-Values
 Question critique : Les scores élevés des phares-π sont-ils significatifs statistiquement,
 ou pourraient-ils apparaître par hasard en testant 210 combinaisons ?
 
-Méthode : Bootstrap avec génération de 1000 coordonnées aléatoires pour établir
+Méthode : Bootstrap avec génération de 100 000 coordonnées aléatoires pour établir
 la distribution nulle et calculer les p-values.
 """
 
 import numpy as np
 import json
 from pathlib import Path
-import gzip
 from scipy.fft import fft2, fftshift
 from scipy import stats
 import matplotlib.pyplot as plt
 
+import batch_metrics
+import compression
+from batch_metrics import batch_entropy, batch_spectral_flatness
+from compression import compression_ratio, batch_compressed_sizes
+from null_cache import cached_null_distribution
+from pvalue_index import PValueIndex
+from generators import generate_digits
+
 def generate_random_coordinate(resolution=8, seed=None):
     """Génère une coordonnée aléatoire"""
     if seed is not None:
@@ -31,12 +38,9 @@ def calculate_entropy(data):
     entropy = -np.sum(probabilities * np.log2(probabilities + 1e-10))
     return entropy
 
-def calculate_compression(data):
-    """Ratio de compression gzip"""
-    original_size = len(data)
-    compressed = gzip.compress(data.tobytes(), compresslevel=9)
-    compressed_size = len(compressed)
-    return compressed_size / original_size
+def calculate_compression(data, backend='gzip', level=None):
+    """Ratio de compression (gzip par défaut, autres backends : voir compression.py)"""
+    return compression_ratio(data.tobytes(), backend, level)
 
 def calculate_spectral_flatness(data, resolution):
     """Platitude spectrale FFT"""
@@ -51,49 +55,100 @@ def calculate_spectral_flatness(data, resolution):
     return flatness
 
 def calculate_transmodal_score(entropy, compression, flatness):
-    """Score de transmodalité"""
-    entropy_norm = max(0, 1 - entropy / 8.0)
-    compression_norm = max(0, 1 - compression)
-    flatness_norm = max(0, 1 - flatness)
+    """Score de transmodalité (scalaires ou vecteurs de métriques)"""
+    entropy_norm = np.maximum(0, 1 - entropy / 8.0)
+    compression_norm = np.maximum(0, 1 - compression)
+    flatness_norm = np.maximum(0, 1 - flatness)
     score = (0.4 * entropy_norm + 0.4 * compression_norm + 0.2 * flatness_norm) * 100
     return score
 
-def bootstrap_null_distribution(n_samples=1000, resolution=8):
+# Mémoire de travail d'un bloc, par échantillon : n octets de pixels uint8, en vie
+# pendant tout le bloc, plus le pic de la métrique la plus gourmande de batch_metrics.
+# - batch_spectral_flatness : niveaux de gris float64 (8 o/pixel), fft2 complex128
+#   (16 o/pixel), puis magnitudes et temporaires de log float64 (16 o/pixel), soit
+#   40/3 o par composante. Cela couvre l'index int64 de batch_histograms (8 o).
+# - batch_entropy : histogramme int64 de 256 cases et ses temporaires float64
+#   (probabilités, log, np.where), environ 36 octets par case. Ce terme fixe
+#   domine à 8×8.
+# Valeurs mesurées avec tracemalloc, arrondies au-dessus.
+BLOCK_BYTES_PER_COMPONENT = 15
+BLOCK_BYTES_PER_SAMPLE = 36 * 256
+
+def draw_random_coordinates(rng, n_coordinates, resolution):
+    """
+    Tire n_coordinates coordonnées aléatoires depuis le flux rng.
+    
+    Les octets proviennent de mots uint32 complets : le flux consommé ne dépend
+    pas de la découpe en blocs, donc l'échantillon i est le même quelle que
+    soit la taille de bloc.
+    """
+    n = 3 * resolution * resolution
+    words = rng.integers(0, 2**32, size=(n_coordinates, (n + 3) // 4), dtype='<u4')
+    return words.view(np.uint8)[:, :n].reshape(n_coordinates, resolution, resolution, 3)
+
+def bootstrap_null_distribution(n_samples=1000, resolution=8, seed=0,
+                                block_size=None, max_block_bytes=256 * 2**20):
     """
     Génère la distribution nulle par bootstrap :
     Créer n_samples coordonnées aléatoires et calculer leurs scores
+    
+    Tous les échantillons sont tirés d'un seul np.random.Generator (seed) et
+    évalués par blocs avec les noyaux de batch_metrics.py. La taille des blocs
+    est bornée par max_block_bytes, ce qui permet 10^5 à 10^6 échantillons
+    à 32×32 et 64×64 en mémoire constante.
     """
     print(f"Génération de {n_samples} coordonnées aléatoires pour distribution nulle...")
     print("(Ceci peut prendre quelques minutes)")
     
-    scores = []
-    entropies = []
-    compressions = []
-    flatnesses = []
+    rng = np.random.default_rng(seed)
+    n = 3 * resolution * resolution
+    if block_size is None:
+        bytes_per_sample = BLOCK_BYTES_PER_COMPONENT * n + BLOCK_BYTES_PER_SAMPLE
+        block_size = max(1, max_block_bytes // bytes_per_sample)
+    block_size = min(block_size, n_samples)
     
-    for i in range(n_samples):
-        if (i + 1) % 100 == 0:
-            print(f"  {i+1}/{n_samples} coordonnées générées...")
-        
-        data = generate_random_coordinate(resolution, seed=i)
+    entropies = np.empty(n_samples)
+    compressions = np.empty(n_samples)
+    flatnesses = np.empty(n_samples)
+    
+    for start in range(0, n_samples, block_size):
+        stop = min(start + block_size, n_samples)
+        images = draw_random_coordinates(rng, stop - start, resolution)
         
-        entropy = calculate_entropy(data)
-        compression = calculate_compression(data)
-        flatness = calculate_spectral_flatness(data, resolution)
-        score = calculate_transmodal_score(entropy, compression, flatness)
+        entropies[start:stop] = batch_entropy(images, eps=1e-10)
+        flatnesses[start:stop] = batch_spectral_flatness(images, eps=1e-10)
+        compressions[start:stop] = batch_compressed_sizes(images.reshape(stop - start, n)) / n
         
-        scores.append(score)
-        entropies.append(entropy)
-        compressions.append(compression)
-        flatnesses.append(flatness)
+        print(f"  {stop}/{n_samples} coordonnées générées...")
+    
+    scores = calculate_transmodal_score(entropies, compressions, flatnesses)
     
     return {
-        'scores': np.array(scores),
-        'entropies': np.array(entropies),
-        'compressions': np.array(compressions),
-        'flatnesses': np.array(flatnesses)
+        'scores': scores,
+        'entropies': entropies,
+        'compressions': compressions,
+        'flatnesses': flatnesses
     }
 
+# Code qui détermine la distribution nulle (clé du cache) : les fonctions de ce
+# script et, en entier, les modules de métriques et de compression qu'elles
+# appellent (aides internes, tables de niveaux, etc.)
+NULL_DISTRIBUTION_CODE = (
+    draw_random_coordinates,
+    bootstrap_null_distribution,
+    calculate_transmodal_score,
+    batch_metrics,
+    compression,
+)
+
+def get_null_distribution(resolution, n_samples=100000, seed=0):
+    """
+    Distribution nulle depuis le cache disque (experiments/results/null_cache),
+    calculée et enregistrée au premier appel. Les tableaux sont mappés en mémoire.
+    """
+    return cached_null_distribution(bootstrap_null_distribution, resolution, n_samples,
+                                    seed, NULL_DISTRIBUTION_CODE)
+
 def calculate_pvalue(observed_score, null_distribution):
     """
     Calcule la p-value : probabilité d'observer un score >= observed_score
@@ -103,14 +158,50 @@ def calculate_pvalue(observed_score, null_distribution):
     p_value = n_extreme / len(null_distribution)
     return p_value
 
-def main():
+def candidate_pvalues(candidates, resolution=8, n_samples=100000, seed=0, alpha=0.05,
+                      extrapolate_tail=False):
+    """
+    P-values des candidats d'une recherche de phares (beacon_search / parallel_search).
+    
+    Chaque candidat (générateur, valeur de la constante) est regénéré et noté avec
+    calculate_transmodal_score, puis toutes les p-values sont obtenues en un seul
+    appel vectorisé sur l'index de la distribution nulle en cache, avec les
+    corrections de Bonferroni et de Benjamini-Hochberg.
+    
+    Au-delà du maximum de la distribution nulle, la p-value empirique vaut 0
+    (borne : 1/(N+1)) ; avec extrapolate_tail=True elle vient d'une queue de
+    Pareto ajustée, signalée par le masque 'extrapolated'.
+    """
+    n = 3 * resolution * resolution
+    data = np.stack([generate_digits(c['generator'], c['constant_value'], n) for c in candidates])
+    images = data.reshape(len(candidates), resolution, resolution, 3)
+    
+    entropies = batch_entropy(images, eps=1e-10)
+    compressions = batch_compressed_sizes(data) / n
+    flatnesses = batch_spectral_flatness(images, eps=1e-10)
+    scores = calculate_transmodal_score(entropies, compressions, flatnesses)
+    
+    index = PValueIndex(get_null_distribution(resolution, n_samples, seed)['scores'],
+                        extrapolate_tail=extrapolate_tail)
+    result = index.query(scores, alpha)
+    result['scores'] = scores
+    return result
+
+def main(extrapolate_tail=False):
+    """
+    Avec extrapolate_tail=True, les scores au-delà du maximum de la
+    distribution nulle reçoivent une p-value extrapolée par une queue de
+    Pareto (modèle, pas données) ; sinon seule la borne empirique 1/(N+1)
+    est rapportée pour eux.
+    """
     print("="*70)
     print("VALIDATION STATISTIQUE : Bootstrap et P-Values")
     print("="*70)
     print()
     
-    # Résolutions à tester
-    resolutions = [8, 16]  # 32 trop lent pour 1000 échantillons
+    # Résolutions à tester (phares observés disponibles pour 8 et 16)
+    resolutions = [8, 16]
+    n_samples = 100000  # p-value minimale rapportable : 1e-5
     
     # Phares observés (scores du validation_multires.py)
     observed_beacons = {
@@ -138,7 +229,7 @@ def main():
         print(f"{'='*70}\n")
         
         # Génération de la distribution nulle
-        null_dist = bootstrap_null_distribution(n_samples=1000, resolution=resolution)
+        null_dist = get_null_distribution(resolution, n_samples=n_samples)
         
         print(f"\n✓ Distribution nulle générée pour {resolution}×{resolution}")
         print(f"\nStatistiques de la distribution nulle :")
@@ -155,9 +246,14 @@ def main():
         print("P-VALUES POUR LES PHARES-π OBSERVÉS")
         print(f"{'='*70}\n")
         
+        index = PValueIndex(null_dist['scores'], extrapolate_tail=extrapolate_tail)
+        query = index.query([score for _, score in observed_beacons[resolution]])
+        
         beacon_results = []
-        for beacon_name, observed_score in observed_beacons[resolution]:
-            p_value = calculate_pvalue(observed_score, null_dist['scores'])
+        for j, (beacon_name, observed_score) in enumerate(observed_beacons[resolution]):
+            p_value = float(query['p_values'][j])
+            beyond_max = observed_score > index.max_score
+            extrapolated = bool(query['extrapolated'][j])
             
             # Signification statistique
             if p_value < 0.001:
@@ -174,7 +270,14 @@ def main():
                 interpretation = "Non significatif"
             
             print(f"{beacon_name:25s} : Score = {observed_score:5.2f}/100")
-            print(f"                            p-value = {p_value:.6f} {significance}")
+            if extrapolated:
+                print(f"                            p-value = {p_value:.3g} {significance} "
+                      f"(extrapolée, modèle de queue ; borne empirique {index.empirical_bound:.1e})")
+            elif beyond_max:
+                print(f"                            p-value < {index.empirical_bound:.1e} {significance} "
+                      f"(au-delà du maximum des {index.n} scores nuls)")
+            else:
+                print(f"                            p-value = {p_value:.6f} {significance}")
             print(f"                            {interpretation}")
             print()
             
@@ -182,6 +285,9 @@ def main():
                 'beacon': beacon_name,
                 'observed_score': observed_score,
                 'p_value': p_value,
+                'q_value_bh': float(query['q_bh'][j]),
+                'beyond_null_max': bool(beyond_max),
+                'extrapolated': extrapolated,
                 'significance': significance,
                 'interpretation': interpretation
             })
@@ -202,10 +308,14 @@ def main():
         print()
         
         for result in beacon_results:
+            if result['beyond_null_max'] and not result['extrapolated']:
+                p_label = f"p<{index.empirical_bound:.1e}"
+            else:
+                p_label = f"p={result['p_value']:.6f}"
             if result['p_value'] < bonferroni_alpha:
-                print(f"  ✓ {result['beacon']:25s} : p={result['p_value']:.6f} < {bonferroni_alpha:.6f}")
+                print(f"  ✓ {result['beacon']:25s} : {p_label} < {bonferroni_alpha:.6f}")
             else:
-                print(f"  ✗ {result['beacon']:25s} : p={result['p_value']:.6f} > {bonferroni_alpha:.6f}")
+                print(f"  ✗ {result['beacon']:25s} : {p_label} > {bonferroni_alpha:.6f}")
         
         # Stocker les résultats
         all_results[resolution] = {
@@ -219,8 +329,11 @@ def main():
                 'percentile_999': float(np.percentile(null_dist['scores'], 99.9))
             },
             'beacons': beacon_results,
+            'empirical_bound': index.empirical_bound,
+            'extrapolate_tail': extrapolate_tail,
             'bonferroni_alpha': bonferroni_alpha,
-            'n_significant_bonferroni': n_significant
+            'n_significant_bonferroni': n_significant,
+            'n_significant_bh': int(np.sum(query['significant_bh']))
         }
         
         # Visualisation
@@ -250,7 +363,12 @@ def main():
         print(f"  {n_sig}/{n_total} phares significatifs après correction de Bonferroni")
         
         min_pvalue = min(r['p_value'] for r in results['beacons'])
-        print(f"  P-value minimale : {min_pvalue:.6f}")
+        if any(r['beyond_null_max'] and not r['extrapolated'] for r in results['beacons']):
+            print(f"  P-value minimale : < {results['empirical_bound']:.1e} (borne empirique)")
+        else:
+            print(f"  P-value minimale : {min_pvalue:.6f}")
+        if any(r['extrapolated'] for r in results['beacons']):
+            print(f"  (p-values extrapolées par la queue de Pareto : modèle, pas données)")
         
         if n_sig == n_total:
             print(f"  → TOUS les phares-π sont statistiquement significatifs")
@@ -268,7 +386,7 @@ def create_visualization(null_scores, observed_beacons, resolution):
     
     # Histogramme de la distribution nulle
     plt.hist(null_scores, bins=50, alpha=0.7, color='gray', 
-             label='Distribution nulle (1000 coord. aléatoires)', edgecolor='black')
+             label=f'Distribution nulle ({len(null_scores)} coord. aléatoires)', edgecolor='black')
     
     # Lignes verticales pour les phares observés
     colors = plt.cm.rainbow(np.linspace(0, 1, len(observed_beacons)))
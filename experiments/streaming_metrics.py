@@ -0,0 +1,152 @@
+"""
+OMNIOPSIS - Streaming Tile-Wise Metrics
+========================================
+
+compute_metrics for images that do not fit in memory.
+
+The image arrives as horizontal tiles (generators.generate_tiles) and every
+metric is updated incrementally:
+- histogram / Shannon entropy / unique values: bincount accumulation
+- compression ratio: incremental compressor (compression.make_compressor)
+- pixel std / range: exact integer sums of x and x², running min / max
+- spectral flatness: out-of-core 2D FFT. The row FFTs of each tile are
+  written to a scratch memmap on disk, then the column FFTs are taken one
+  column block at a time while the log- and linear magnitude sums are
+  accumulated.
+
+Peak memory is bounded by the tile budget (plus the scratch file on disk,
+16 bytes per pixel), which allows beacons at 16k×16k without swapping.
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import math
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from compression import make_compressor, default_level
+from generators import generate_tiles
+
+# Working bytes per pixel while a tile is processed (uint8 RGB, grayscale,
+# complex row FFT and temporaries)
+BYTES_PER_PIXEL = 48
+
+# ============================================================================
+# STREAMING METRICS
+# ============================================================================
+
+def tile_rows_for_budget(width, tile_bytes):
+    """Number of image rows per tile that fit in tile_bytes."""
+    return max(1, tile_bytes // (BYTES_PER_PIXEL * width))
+
+def _spectral_flatness_out_of_core(fft_rows, tile_bytes):
+    """Column FFTs of the row-transformed image, accumulated block by block."""
+    height, width = fft_rows.shape
+    block_width = max(1, tile_bytes // (BYTES_PER_PIXEL * height))
+
+    log_sum = 0.0
+    magnitude_sum = 0.0
+    count = 0
+    for x0 in range(0, width, block_width):
+        block = np.fft.fft(fft_rows[:, x0:x0 + block_width], axis=0)
+        magnitude = np.abs(block)
+        magnitude = magnitude[magnitude > 1e-10]
+        log_sum += float(np.sum(np.log(magnitude)))
+        magnitude_sum += float(np.sum(magnitude))
+        count += magnitude.size
+
+    geometric_mean = math.exp(log_sum / count)
+    arithmetic_mean = magnitude_sum / count
+    return geometric_mean / arithmetic_mean
+
+def streaming_compute_metrics(tiles, shape, compression_backend='gzip', level=None,
+                              spectral=True, tile_bytes=64 * 2**20, scratch_dir=None):
+    """
+    Metrics of an image given as an iterable of uint8 tiles of shape (rows, w, 3).
+
+    Args:
+        tiles: Iterable of horizontal tiles, top to bottom
+        shape: (h, w) of the full image
+        compression_backend: See compression.py
+        spectral: Compute the (out-of-core) spectral flatness
+        tile_bytes: Memory budget for the column pass of the FFT
+        scratch_dir: Directory of the temporary FFT memmap
+
+    Returns:
+        dict: Same keys and values as beacon_search.compute_metrics
+    """
+    height, width = shape
+    n_components = 3 * height * width
+    if level is None:
+        level = default_level(compression_backend, n_components)
+
+    histogram = np.zeros(256, dtype=np.int64)
+    compressor = make_compressor(compression_backend, level)
+    compressed_size = 0
+    total = 0
+    total_squares = 0
+    lowest, highest = 255, 0
+
+    with tempfile.TemporaryDirectory(dir=scratch_dir) as scratch:
+        fft_rows = None
+        if spectral:
+            fft_rows = np.lib.format.open_memmap(Path(scratch) / 'fft_rows.npy', mode='w+',
+                                                 dtype=np.complex128, shape=(height, width))
+
+        y = 0
+        for tile in tiles:
+            flat = tile.reshape(-1)
+            counts = np.bincount(flat, minlength=256)
+            histogram += counts
+
+            compressed_size += len(compressor.compress(flat.tobytes()))
+
+            # Exact sums: Σx and Σx² over the histogram of the tile
+            values = np.arange(256, dtype=np.int64)
+            total += int(counts @ values)
+            total_squares += int(counts @ (values * values))
+            lowest = min(lowest, int(flat.min()))
+            highest = max(highest, int(flat.max()))
+
+            if spectral:
+                fft_rows[y:y + len(tile)] = np.fft.fft(tile.mean(axis=2), axis=1)
+            y += len(tile)
+
+        compressed_size += len(compressor.flush())
+        if y != height:
+            raise ValueError(f"Tiles cover {y} rows, expected {height}")
+
+        spectral_flatness = float('nan')
+        if spectral:
+            fft_rows.flush()
+            spectral_flatness = _spectral_flatness_out_of_core(fft_rows, tile_bytes)
+            del fft_rows
+
+    # Shannon entropy
+    hist = histogram[histogram > 0]
+    prob = hist / hist.sum()
+    shannon_entropy = -np.sum(prob * np.log2(prob))
+
+    # Pixel statistics (variance from exact integer moments)
+    variance = (n_components * total_squares - total * total) / n_components**2
+
+    return {
+        'shannon_entropy': float(shannon_entropy),
+        'compression_ratio': compressed_size / n_components,
+        'spectral_flatness': float(spectral_flatness),
+        'pixel_std': math.sqrt(variance),
+        'pixel_range': highest - lowest,
+        'unique_values': int(np.count_nonzero(histogram)),
+    }
+
+def streaming_beacon_metrics(generator, constant, resolution, compression_backend='gzip',
+                             spectral=True, tile_bytes=64 * 2**20, scratch_dir=None):
+    """Metrics of the resolution×resolution beacon (generator, constant), generated tile by tile."""
+    tile_rows = tile_rows_for_budget(resolution, tile_bytes)
+    tiles = generate_tiles(generator, constant, resolution, tile_rows)
+    return streaming_compute_metrics(tiles, (resolution, resolution), compression_backend,
+                                     spectral=spectral, tile_bytes=tile_bytes,
+                                     scratch_dir=scratch_dir)
@@ -0,0 +1,172 @@
+"""
+OMNIOPSIS - Point-Cloud Subsampling
+====================================
+
+Seeded subsampling strategies for persistent homology.
+
+- 'random': uniform choice without replacement (the historical behaviour,
+  now with an explicit seed)
+- 'maxmin': greedy permutation / farthest-point landmarks. Every point of
+  the cloud lies within the covering radius of a landmark, so the sample
+  keeps the shape of the cloud instead of its density
+- 'density': random choice weighted by the k-NN distance, which thins out
+  dense regions (duplicates, clusters) and keeps sparse ones
+- 'witness': maxmin landmarks plus the lazy witness complex distances,
+  where all points act as witnesses for the landmark edges
+
+Sample sizes follow a compute budget: a Rips complex on n points up to
+dimension d has about n^(d+2) / (d+2)! simplices of top dimension, and n is
+chosen so that this stays within the budget (500 points at d = 2 by default).
+
+Author: Diego Morales Magri
+Date: October 2026
+"""
+
+import math
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+SUBSAMPLE_METHODS = ['random', 'maxmin', 'density', 'witness']
+
+# (d + 2)-simplices that 500 points produce for maxdim d = 2
+DEFAULT_SIMPLEX_BUDGET = 500**4 / math.factorial(4)
+
+# ============================================================================
+# SAMPLE SIZE
+# ============================================================================
+
+def sample_size(n_points, max_dimension=2, budget=DEFAULT_SIMPLEX_BUDGET):
+    """Number of points whose Rips complex up to max_dimension fits in budget."""
+    k = max_dimension + 2
+    n = int((budget * math.factorial(k)) ** (1.0 / k))
+    return max(1, min(n_points, n))
+
+# ============================================================================
+# STRATEGIES
+# ============================================================================
+
+def random_subsample(points, n, seed=0):
+    """Indices of n points chosen uniformly without replacement."""
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(len(points), n, replace=False))
+
+def maxmin_landmarks(points, n, seed=0):
+    """
+    Greedy permutation (farthest-point sampling).
+
+    Starts from a seeded random point and repeatedly adds the point farthest
+    from the current landmarks. Stops early once every distinct point is a
+    landmark (covering radius 0).
+
+    Returns:
+        tuple: (landmark indices in selection order, covering radius)
+    """
+    rng = np.random.default_rng(seed)
+    first = int(rng.integers(len(points)))
+    landmarks = [first]
+    min_dist = np.linalg.norm(points - points[first], axis=1)
+
+    while len(landmarks) < n:
+        farthest = int(np.argmax(min_dist))
+        if min_dist[farthest] == 0:
+            break
+        landmarks.append(farthest)
+        np.minimum(min_dist, np.linalg.norm(points - points[farthest], axis=1), out=min_dist)
+
+    return np.array(landmarks), float(np.max(min_dist))
+
+def density_subsample(points, n, seed=0, k=8, alpha=1.0):
+    """
+    Indices of n points drawn with probability ∝ (k-NN distance)^alpha.
+
+    Points in dense regions (small k-NN distance) are drawn less often;
+    exact duplicates get a small floor weight so that they remain possible.
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, len(points) - 1)
+    if k < 1:
+        return np.arange(len(points))[:n]
+
+    distances, _ = cKDTree(points).query(points, k=k + 1)
+    knn = distances[:, -1]
+    weights = (knn + 1e-3 * (knn.max() or 1.0)) ** alpha
+    return np.sort(rng.choice(len(points), n, replace=False, p=weights / weights.sum()))
+
+def witness_distance_matrix(points, landmarks, nu=2, block_bytes=32 * 2**20):
+    """
+    Lazy witness complex filtration on the landmarks, as a distance matrix.
+
+    The edge (a, b) enters at
+        min_w  max(d(w, a), d(w, b)) - m_ν(w)
+    where w ranges over all points and m_ν(w) is the distance from w to its
+    ν-th nearest landmark (ν = 0 gives the plain lazy witness complex).
+    Feeding this matrix to a Rips backend yields the witness persistence.
+
+    Witnesses are streamed in chunks, folded into the L×L result with
+    np.minimum: memory is O(L² + block_bytes), independent of N.
+    """
+    landmark_points = points[landmarks]
+    tree = cKDTree(landmark_points)
+
+    L = len(landmarks)
+    W = np.full((L, L), np.inf)
+    # One (witnesses, rows, L) slab of max(d(w, a), d(w, b)) - m(w) stays within block_bytes
+    chunk = max(1, block_bytes // (8 * L * L))
+    rows = max(1, min(L, block_bytes // (8 * chunk * L)))
+    for w0 in range(0, len(points), chunk):
+        witnesses = points[w0:w0 + chunk]
+        D = np.linalg.norm(witnesses[:, None, :] - landmark_points[None, :, :], axis=2)
+        if nu > 0:
+            m, _ = tree.query(witnesses, k=nu)
+            m = m.reshape(len(witnesses), -1)[:, -1]
+        else:
+            m = np.zeros(len(witnesses))
+
+        for a0 in range(0, L, rows):
+            a1 = min(a0 + rows, L)
+            pair = np.maximum(D[:, a0:a1, None], D[:, None, :]) - m[:, None, None]
+            np.minimum(W[a0:a1], pair.min(axis=0), out=W[a0:a1])
+
+    W = np.maximum(W, 0.0)
+    np.fill_diagonal(W, 0.0)
+    return W
+
+# ============================================================================
+# DISPATCH
+# ============================================================================
+
+def subsample(points, n=None, method='maxmin', seed=0, max_dimension=2,
+              budget=DEFAULT_SIMPLEX_BUDGET):
+    """
+    Subsample a point cloud for persistent homology.
+
+    Args:
+        points: (N, D) array
+        n: Sample size (default: from the compute budget)
+        method: One of SUBSAMPLE_METHODS
+        seed: Seed of the sampling RNG
+
+    Returns:
+        dict: 'points' (sampled points), 'indices', 'method', and for
+              'witness' the landmark 'distance_matrix'
+    """
+    if method not in SUBSAMPLE_METHODS:
+        raise ValueError(f"Unknown subsampling method: {method!r}")
+
+    n = sample_size(len(points), max_dimension, budget) if n is None else min(n, len(points))
+    result = {'method': method}
+
+    if method == 'random':
+        indices = random_subsample(points, n, seed) if n < len(points) else np.arange(len(points))
+    elif method == 'density':
+        indices = density_subsample(points, n, seed) if n < len(points) else np.arange(len(points))
+    else:
+        indices, radius = maxmin_landmarks(points, n, seed)
+        result['covering_radius'] = radius
+        if method == 'witness':
+            result['distance_matrix'] = witness_distance_matrix(points, indices)
+
+    result['indices'] = indices
+    result['points'] = points[indices]
+    return result
@@ -14,13 +14,17 @@ sys.set_int_max_str_digits(500000)
 
 import numpy as np
 import matplotlib.pyplot as plt
-from PIL import Image
 import json
 from pathlib import Path
 from datetime import datetime
-import gzip
 import hashlib
 
+from generators import generate_digits
+from compression import compressed_size as compressed_length
+from image_store import ImageStore
+from registry import CONSTANTS
+from enumeration import digits_to_coordinate, coordinate_prefix, coordinate_num_digits
+
 # ============================================================================
 # PHASE 1: IMAGE GENERATION
 # ============================================================================
@@ -38,22 +42,18 @@ def generate_phantom_image(constant, name, resolution=8):
         tuple: (coordinate k, image array, digit array)
     """
     n = 3 * resolution * resolution  # RGB dimensions
-    digits = []
     
     print(f"\n[GENERATING] {name} with constant {constant:.6f}")
     
-    for i in range(n):
-        val = 128 + 127 * np.sin(i**2 * constant)
-        digit = int(np.floor(val))
-        digits.append(digit)
+    digits = generate_digits('sin_i2', constant, n)
     
     # Convert to coordinate k
-    k = sum(d * (256**i) for i, d in enumerate(digits))
+    k = digits_to_coordinate(digits)
     
     # Create RGB image
-    img_array = np.array(digits, dtype=np.uint8).reshape(resolution, resolution, 3)
+    img_array = digits.reshape(resolution, resolution, 3)
     
-    print(f"  Coordinate k has {len(str(k))} decimal digits")
+    print(f"  Coordinate k has {coordinate_num_digits(k)} decimal digits")
     print(f"  Image shape: {img_array.shape}")
     print(f"  Pixel value range: [{img_array.min()}, {img_array.max()}]")
     
@@ -66,14 +66,14 @@ def generate_random_image(resolution=8, seed=42):
     n = 3 * resolution * resolution
     digits = np.random.randint(0, 256, size=n, dtype=np.uint8)
     
-    k = sum(int(d) * (256**i) for i, d in enumerate(digits))
+    k = digits_to_coordinate(digits)
     img_array = digits.reshape(resolution, resolution, 3)
     
     print(f"\n[GENERATING] Random baseline")
     print(f"  Image shape: {img_array.shape}")
     print(f"  Pixel value range: [{img_array.min()}, {img_array.max()}]")
     
-    return k, img_array, list(digits)
+    return k, img_array, digits
 
 
 # ============================================================================
@@ -113,19 +113,18 @@ def compute_basic_statistics(img_array, digits, name):
 # PHASE 3: KOLMOGOROV COMPLEXITY (COMPRESSION PROXY)
 # ============================================================================
 
-def estimate_kolmogorov_complexity(digits, name):
+def estimate_kolmogorov_complexity(digits, name, backend='gzip', level=None):
     """
     Estimate Kolmogorov complexity via compression.
     K(x) ≈ len(compress(x))
+    
+    backend: 'gzip' (default), 'zlib' (raw deflate), 'lzma' or 'bz2'
     """
     # Convert to bytes
     data = bytes(digits)
     
-    # Compress with gzip
-    compressed = gzip.compress(data, compresslevel=9)
-    
     original_size = len(data)
-    compressed_size = len(compressed)
+    compressed_size = compressed_length(data, backend, level)
     compression_ratio = compressed_size / original_size
     
     print(f"\n[COMPRESSION] {name}")
@@ -230,8 +229,15 @@ def compute_autocorrelation(img_array, name, max_lag=3):
 # MAIN EXPERIMENTAL PIPELINE
 # ============================================================================
 
-def run_full_validation(resolution=8):
-    """Run complete validation pipeline."""
+def run_full_validation(resolution=8, store=None, export_png=True):
+    """
+    Run complete validation pipeline.
+    
+    Images are kept in the shared image store (image_store.py) and analysed
+    from there; PNG export is optional.
+    """
+    
+    store = ImageStore() if store is None else store
     
     print("="*70)
     print("OMNIOPSIS TRANSMODAL STABILITY VALIDATION")
@@ -242,9 +248,9 @@ def run_full_validation(resolution=8):
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Universal constants
-    PHI = (1 + np.sqrt(5)) / 2
-    PI = np.pi
-    E = np.e
+    PHI = CONSTANTS['golden_phi']
+    PI = CONSTANTS['pi']
+    E = CONSTANTS['e']
     
     # Generate all images
     print("\n" + "="*70)
@@ -256,23 +262,31 @@ def run_full_validation(resolution=8):
     k_pi, img_pi, digits_pi = generate_phantom_image(PI, "Pi (Circular)", resolution)
     k_e, img_e, digits_e = generate_phantom_image(E, "e (Growth)", resolution)
     
-    images = {
-        'random': (k_random, img_random, digits_random),
-        'phi': (k_phi, img_phi, digits_phi),
-        'pi': (k_pi, img_pi, digits_pi),
-        'e': (k_e, img_e, digits_e)
+    # Store keys: (generator, constant or seed, resolution)
+    store_keys = {
+        'random': ('random', 42, resolution),
+        'phi': ('sin_i2', PHI, resolution),
+        'pi': ('sin_i2', PI, resolution),
+        'e': ('sin_i2', E, resolution)
     }
     
+    images = {}
+    for name, (k, img, digits) in [('random', (k_random, img_random, digits_random)),
+                                   ('phi', (k_phi, img_phi, digits_phi)),
+                                   ('pi', (k_pi, img_pi, digits_pi)),
+                                   ('e', (k_e, img_e, digits_e))]:
+        stored = store.put(*store_keys[name], img)
+        images[name] = (k, stored, stored.reshape(-1))
+    
     # Save images as PNG
-    print("\n[SAVING] Images to PNG...")
-    for name, (k, img, digits) in images.items():
-        # Save small version (8x8)
-        img_pil = Image.fromarray(img, 'RGB')
-        img_pil.save(output_dir / f"img_{name}_8x8.png")
-        
-        # Save upscaled version for visualization (64x64)
-        img_large = img_pil.resize((64, 64), Image.NEAREST)
-        img_large.save(output_dir / f"img_{name}_64x64.png")
+    if export_png:
+        print("\n[SAVING] Images to PNG...")
+        for name in images:
+            # Save small version (8x8)
+            store.export_png(*store_keys[name], output_dir / f"img_{name}_8x8.png")
+            
+            # Save upscaled version for visualization (64x64)
+            store.export_png(*store_keys[name], output_dir / f"img_{name}_64x64.png", size=64)
     
     # Collect all results
     results = {
@@ -287,10 +301,10 @@ def run_full_validation(resolution=8):
             }
         },
         'coordinates': {
-            'random': str(k_random)[:100] + "...",  # Truncated for JSON
-            'phi': str(k_phi)[:100] + "...",
-            'pi': str(k_pi)[:100] + "...",
-            'e': str(k_e)[:100] + "..."
+            'random': coordinate_prefix(k_random) + "...",  # Truncated for JSON
+            'phi': coordinate_prefix(k_phi) + "...",
+            'pi': coordinate_prefix(k_pi) + "...",
+            'e': coordinate_prefix(k_e) + "..."
         },
         'analyses': {}
     }
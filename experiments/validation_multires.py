@@ -6,48 +6,40 @@ Test si le phénomène de stabilité transmodale persiste à des résolutions pl
 Si l'effet disparaît à 16×16 → artéfact de petite taille (REJET de l'hypothèse)
 Si l'effet persiste → découverte robuste (VALIDATION de l'hypothèse)
 
-On teste les TOP 5 phares-π à résolutions 8×8, 16×16, 32×32
+On teste les TOP 5 phares-π par balayage adaptatif : la résolution double
+(8×8, 16×16, 32×32, ...) jusqu'à convergence du score transmodal ou
+épuisement du budget temps/mémoire, jusqu'à 1024×1024.
+
+Les générateurs dépendent seulement de l'indice i : les 3·r² premières
+valeurs sont communes à toutes les résolutions ≥ r. Chaque doublement ne
+génère donc que les nouvelles composantes, et chaque résultat est écrit
+(JSON Lines) dès qu'il est produit.
 """
 
 import numpy as np
 import json
 from pathlib import Path
-import gzip
 from scipy.fft import fft2, fftshift
 import time
 
+from registry import CONSTANTS
+from generation_cache import cached_digits
+from compression import compression_ratio
+
 # Constantes à tester (top performers from 8×8)
-TAU = 2 * np.pi
-PI = np.pi
-PI_HALF = np.pi / 2
-PI_QUARTER = np.pi / 4
+TAU = CONSTANTS['tau']
+PI = CONSTANTS['pi']
+PI_HALF = CONSTANTS['pi_2']
+PI_QUARTER = CONSTANTS['pi_4']
 
 # Constantes négatives (pour comparaison)
-PHI = (1 + np.sqrt(5)) / 2
-E = np.e
+PHI = CONSTANTS['golden_phi']
+E = CONSTANTS['e']
 
 def generate_coordinate(constant, generator_func, resolution=8):
-    """Génère une coordonnée transmodale à une résolution donnée"""
+    """Génère une coordonnée transmodale à une résolution donnée (préfixe en cache)"""
     n = 3 * resolution * resolution  # RGB channels
-    digits = []
-    
-    for i in range(n):
-        val = generator_func(i, constant)
-        digits.append(int(np.floor(val)))
-    
-    return np.array(digits, dtype=np.uint8)
-
-def sin_i2(i, c):
-    """Générateur sinus quadratique (meilleur performer à 8×8)"""
-    return 128 + 127 * np.sin(i**2 * c)
-
-def sin_i(i, c):
-    """Générateur sinus linéaire"""
-    return 128 + 127 * np.sin(i * c)
-
-def cos_i2(i, c):
-    """Générateur cosinus quadratique"""
-    return 128 + 127 * np.cos(i**2 * c)
+    return cached_digits(generator_func, constant, n)
 
 def calculate_entropy(data):
     """Entropie de Shannon en bits"""
@@ -56,12 +48,9 @@ def calculate_entropy(data):
     entropy = -np.sum(probabilities * np.log2(probabilities + 1e-10))
     return entropy
 
-def calculate_compression(data):
-    """Ratio de compression gzip"""
-    original_size = len(data)
-    compressed = gzip.compress(data.tobytes(), compresslevel=9)
-    compressed_size = len(compressed)
-    return compressed_size / original_size
+def calculate_compression(data, backend='gzip', level=None):
+    """Ratio de compression (gzip par défaut, autres backends : voir compression.py)"""
+    return compression_ratio(data.tobytes(), backend, level)
 
 def calculate_spectral_flatness(data, resolution):
     """Platitude spectrale FFT"""
@@ -91,33 +80,100 @@ def calculate_transmodal_score(entropy, compression, flatness):
     score = (0.4 * entropy_norm + 0.4 * compression_norm + 0.2 * flatness_norm) * 100
     return score
 
-def test_beacon_at_resolution(constant, constant_name, generator_func, generator_name, resolution):
-    """Test un phare à une résolution donnée"""
-    print(f"  Testing {constant_name} with {generator_name} at {resolution}×{resolution}...")
-    
-    # Génération
-    data = generate_coordinate(constant, generator_func, resolution)
-    
-    # Métriques
+def measure_coordinate(data, resolution):
+    """Métriques et score transmodal d'une coordonnée (3·r² composantes)"""
     entropy = calculate_entropy(data)
     compression = calculate_compression(data)
     flatness = calculate_spectral_flatness(data, resolution)
     score = calculate_transmodal_score(entropy, compression, flatness)
     
-    # Statistiques additionnelles
-    unique_values = len(np.unique(data))
-    
     return {
-        "constant": constant_name,
-        "generator": generator_name,
         "resolution": resolution,
         "entropy_bits": round(entropy, 2),
         "compression_ratio": round(compression, 2),
         "spectral_flatness": round(flatness, 3),
         "transmodal_score": round(score, 2),
-        "unique_values": unique_values,
+        "unique_values": len(np.unique(data)),
         "total_pixels": len(data)
-    }
+    }, score
+
+def test_beacon_at_resolution(constant, constant_name, generator_func, generator_name, resolution):
+    """Test un phare à une résolution donnée"""
+    print(f"  Testing {constant_name} with {generator_name} at {resolution}×{resolution}...")
+    
+    # Génération
+    data = generate_coordinate(constant, generator_func, resolution)
+    
+    # Métriques
+    result, _ = measure_coordinate(data, resolution)
+    return {"constant": constant_name, "generator": generator_name, **result}
+
+# ============================================================================
+# BALAYAGE ADAPTATIF
+# ============================================================================
+
+# Octets de travail par pixel (données, niveaux de gris, FFT complexe, temporaires)
+MEMORY_PER_PIXEL = 64
+
+def adaptive_resolution_sweep(extend, constant_name, generator_name, resolution=8,
+                              max_resolution=1024, tolerance=0.5, time_budget=60.0,
+                              memory_budget=2**30, stream=None):
+    """
+    Double la résolution jusqu'à convergence du score ou épuisement du budget.
+    
+    Args:
+        extend: extend(start, n) → composantes [start, start + n) (uint8)
+        tolerance: Convergence si |score(r) - score(r/2)| < tolerance (points)
+        time_budget: Secondes par phare ; on s'arrête si le prochain
+                     doublement (≈ 4× le pas courant) le dépasserait
+        memory_budget: Octets de travail maximum pour la prochaine résolution
+        stream: Fonction appelée sur chaque résultat dès qu'il est produit
+    
+    Returns:
+        list: Un résultat par résolution, le dernier avec 'stop_reason'
+    """
+    data = np.empty(0, dtype=np.uint8)
+    results = []
+    previous_score = None
+    start = time.perf_counter()
+    
+    while True:
+        step_start = time.perf_counter()
+        
+        # Seules les nouvelles composantes sont générées (préfixe réutilisé)
+        n = 3 * resolution * resolution
+        data = np.concatenate([data, extend(len(data), n - len(data))])
+        result, score = measure_coordinate(data, resolution)
+        
+        now = time.perf_counter()
+        step_time = now - step_start
+        next_resolution = 2 * resolution
+        
+        if previous_score is not None and abs(score - previous_score) < tolerance:
+            stop_reason = "converged"
+        elif next_resolution > max_resolution:
+            stop_reason = "max_resolution"
+        elif now - start + 4 * step_time > time_budget:
+            stop_reason = "time_budget"
+        elif MEMORY_PER_PIXEL * next_resolution**2 > memory_budget:
+            stop_reason = "memory_budget"
+        else:
+            stop_reason = None
+        
+        result = {"constant": constant_name, "generator": generator_name, **result,
+                  "elapsed_s": round(step_time, 3), "stop_reason": stop_reason}
+        results.append(result)
+        if stream is not None:
+            stream(result)
+        print(f"    {resolution}×{resolution}: Score={result['transmodal_score']}/100, "
+              f"Entropy={result['entropy_bits']} bits, "
+              f"Compression={result['compression_ratio']}")
+        
+        if stop_reason is not None:
+            print(f"    → arrêt : {stop_reason}")
+            return results
+        previous_score = score
+        resolution = next_resolution
 
 def main():
     print("="*70)
@@ -127,81 +183,58 @@ def main():
     
     # Configuration des tests
     beacons = [
-        (TAU, "τ=2π", sin_i2, "sin(i²·c)"),
-        (PI, "π", sin_i, "sin(i·c)"),
-        (PI, "π", sin_i2, "sin(i²·c)"),
-        (PI_HALF, "π/2", cos_i2, "cos(i²·c)"),
-        (PI_QUARTER, "π/4", sin_i2, "sin(i²·c)"),
+        (TAU, "τ=2π", 'sin_i2', "sin(i²·c)"),
+        (PI, "π", 'sin_i', "sin(i·c)"),
+        (PI, "π", 'sin_i2', "sin(i²·c)"),
+        (PI_HALF, "π/2", 'cos_i2', "cos(i²·c)"),
+        (PI_QUARTER, "π/4", 'sin_i2', "sin(i²·c)"),
     ]
     
     # Contrôles négatifs
     negatives = [
-        (PHI, "φ", sin_i2, "sin(i²·c)"),
-        (E, "e", sin_i2, "sin(i²·c)"),
+        (PHI, "φ", 'sin_i2', "sin(i²·c)"),
+        (E, "e", 'sin_i2', "sin(i²·c)"),
     ]
     
-    # Résolutions à tester
-    resolutions = [8, 16, 32]
-    
-    results = []
+    # Balayage adaptatif : 8×8 → 1024×1024 au maximum
+    sweep = dict(resolution=8, max_resolution=1024, tolerance=0.5, time_budget=60.0)
     
-    # Test des phares-π
-    print("\n--- TEST DES PHARES-π (Top 5) ---\n")
-    for constant, const_name, gen_func, gen_name in beacons:
-        print(f"\nBeacon: {const_name} with {gen_name}")
-        for res in resolutions:
-            result = test_beacon_at_resolution(constant, const_name, gen_func, gen_name, res)
-            results.append(result)
-            print(f"    {res}×{res}: Score={result['transmodal_score']}/100, "
-                  f"Entropy={result['entropy_bits']} bits, "
-                  f"Compression={result['compression_ratio']}")
+    output_dir = Path("experiments/results")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stream_file = output_dir / "multires_validation_results.jsonl"
     
-    # Test des contrôles négatifs
-    print("\n\n--- CONTRÔLES NÉGATIFS (φ, e) ---\n")
-    for constant, const_name, gen_func, gen_name in negatives:
-        print(f"\nNegative Control: {const_name} with {gen_name}")
-        for res in resolutions:
-            result = test_beacon_at_resolution(constant, const_name, gen_func, gen_name, res)
-            results.append(result)
-            print(f"    {res}×{res}: Score={result['transmodal_score']}/100, "
-                  f"Entropy={result['entropy_bits']} bits, "
-                  f"Compression={result['compression_ratio']}")
+    results = []
     
-    # Génération de contrôle aléatoire
-    print("\n\n--- CONTRÔLE ALÉATOIRE ---\n")
-    for res in resolutions:
-        n = 3 * res * res
-        random_data = np.random.randint(0, 256, n, dtype=np.uint8)
-        entropy = calculate_entropy(random_data)
-        compression = calculate_compression(random_data)
-        flatness = calculate_spectral_flatness(random_data, res)
-        score = calculate_transmodal_score(entropy, compression, flatness)
+    with open(stream_file, 'w') as f:
+        def stream(result):
+            f.write(json.dumps(result) + "\n")
+            f.flush()
         
-        result = {
-            "constant": "Random",
-            "generator": "np.random",
-            "resolution": res,
-            "entropy_bits": round(entropy, 2),
-            "compression_ratio": round(compression, 2),
-            "spectral_flatness": round(flatness, 3),
-            "transmodal_score": round(score, 2),
-            "unique_values": len(np.unique(random_data)),
-            "total_pixels": len(random_data)
-        }
-        results.append(result)
-        print(f"    {res}×{res}: Score={result['transmodal_score']}/100, "
-              f"Entropy={result['entropy_bits']} bits, "
-              f"Compression={result['compression_ratio']}")
+        # Test des phares-π
+        print("\n--- TEST DES PHARES-π (Top 5) ---\n")
+        for constant, const_name, gen_func, gen_name in beacons:
+            print(f"\nBeacon: {const_name} with {gen_name}")
+            extend = lambda start, n, c=constant, g=gen_func: cached_digits(g, c, start + n)[start:]
+            results += adaptive_resolution_sweep(extend, const_name, gen_name, stream=stream, **sweep)
+        
+        # Test des contrôles négatifs
+        print("\n\n--- CONTRÔLES NÉGATIFS (φ, e) ---\n")
+        for constant, const_name, gen_func, gen_name in negatives:
+            print(f"\nNegative Control: {const_name} with {gen_name}")
+            extend = lambda start, n, c=constant, g=gen_func: cached_digits(g, c, start + n)[start:]
+            results += adaptive_resolution_sweep(extend, const_name, gen_name, stream=stream, **sweep)
+        
+        # Génération de contrôle aléatoire
+        print("\n\n--- CONTRÔLE ALÉATOIRE ---\n")
+        extend = lambda start, n: np.random.randint(0, 256, n, dtype=np.uint8)
+        results += adaptive_resolution_sweep(extend, "Random", "np.random", stream=stream, **sweep)
     
     # Sauvegarde des résultats
-    output_dir = Path("experiments/results")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
     output_file = output_dir / "multires_validation_results.json"
     with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
     
-    print(f"\n\n✓ Résultats sauvegardés dans : {output_file}")
+    print(f"\n\n✓ Résultats sauvegardés dans : {output_file} (flux : {stream_file})")
     
     # Analyse de robustesse
     print("\n" + "="*70)
@@ -216,7 +249,7 @@ def main():
         beacon_results = [r for r in results 
                          if r['constant'] == const_name and r['generator'] == gen_name]
         
-        if len(beacon_results) == len(resolutions):
+        if beacon_results:
             scores = [r['transmodal_score'] for r in beacon_results]
             entropies = [r['entropy_bits'] for r in beacon_results]
             
@@ -230,7 +263,7 @@ def main():
                 print("  ✗ EFFET FAIBLE : Disparaît à haute résolution")
             
             for r in beacon_results:
-                print(f"    {r['resolution']:2d}×{r['resolution']:2d}: "
+                print(f"    {r['resolution']:4d}×{r['resolution']:4d}: "
                       f"Score={r['transmodal_score']:5.2f}, "
                       f"Entropy={r['entropy_bits']:4.2f} bits")
     
@@ -238,18 +271,33 @@ def main():
     print("CONCLUSION")
     print("="*70)
     
-    # Comparer moyenne des scores π vs φ/e à chaque résolution
-    for res in resolutions:
-        pi_scores = [r['transmodal_score'] for r in results 
-                     if r['resolution'] == res and r['constant'] in ['τ=2π', 'π', 'π/2', 'π/4']]
-        neg_scores = [r['transmodal_score'] for r in results 
-                      if r['resolution'] == res and r['constant'] in ['φ', 'e']]
+    # Chaque phare s'arrête à sa propre résolution (convergence ou budget) :
+    # les moyennes π vs φ/e ne portent que sur les résolutions atteintes par
+    # TOUS les phares des deux groupes, pour comparer les mêmes phares
+    pi_keys = [(c, g) for _, c, _, g in beacons]
+    neg_keys = [(c, g) for _, c, _, g in negatives]
+    by_beacon = {key: {r['resolution']: r for r in results if (r['constant'], r['generator']) == key}
+                 for key in pi_keys + neg_keys}
+    common = sorted(set.intersection(*(set(rows) for rows in by_beacon.values())))
+    
+    print(f"\nRésolutions atteintes par tous les phares : "
+          f"{', '.join(f'{res}×{res}' for res in common)}")
+    for res in common:
+        pi_scores = [by_beacon[key][res]['transmodal_score'] for key in pi_keys]
+        neg_scores = [by_beacon[key][res]['transmodal_score'] for key in neg_keys]
         
-        if pi_scores and neg_scores:
-            print(f"\nRésolution {res}×{res}:")
-            print(f"  Famille-π : Moyenne = {np.mean(pi_scores):.2f}/100")
-            print(f"  φ/e       : Moyenne = {np.mean(neg_scores):.2f}/100")
-            print(f"  Séparation : {np.mean(pi_scores) - np.mean(neg_scores):.2f} points")
+        print(f"\nRésolution {res}×{res}:")
+        print(f"  Famille-π : Moyenne = {np.mean(pi_scores):.2f}/100 ({len(pi_scores)} phares)")
+        print(f"  φ/e       : Moyenne = {np.mean(neg_scores):.2f}/100 ({len(neg_scores)} phares)")
+        print(f"  Séparation : {np.mean(pi_scores) - np.mean(neg_scores):.2f} points")
+    
+    # Score final de chaque phare, à la résolution où son balayage s'est arrêté
+    print("\nScore final par phare :")
+    for key in pi_keys + neg_keys:
+        final = by_beacon[key][max(by_beacon[key])]
+        group = "π" if key in pi_keys else "φ/e"
+        print(f"  [{group:3s}] {key[0]:5s} {key[1]:10s}: Score={final['transmodal_score']:5.2f} "
+              f"à {final['resolution']}×{final['resolution']} ({final['stop_reason']})")
     
     print("\n✓ Validation terminée.\n")
 
@@ -0,0 +1,10 @@
+"""
+Test configuration: the experiment modules import each other as siblings
+(they are run as scripts from experiments/), so the directory is put on
+sys.path.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "experiments"))
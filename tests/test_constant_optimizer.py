@@ -0,0 +1,22 @@
+"""Tests for the continuous-constant optimizer (experiments/constant_optimizer.py)."""
+
+import numpy as np
+
+from constant_optimizer import coarse_scan, continuous_search, score_constants
+
+def test_empty_batches_score_to_empty_arrays():
+    assert score_constants('sin_i2', []).shape == (0,)
+    scores, metrics = score_constants('sin_i2', np.empty(0), return_metrics=True)
+    assert scores.shape == (0,) and metrics == []
+
+    grid, scores = coarse_scan('sin_i2', n_points=0)
+    assert grid.shape == scores.shape == (0,)
+
+def test_evaluation_count_includes_refinement():
+    maxima, evaluations = continuous_search(['sin_i2'], interval=(3.0, 3.3), n_points=50,
+                                            n_peaks=2, top_n=1, workers=1,
+                                            return_evaluations=True)
+    assert len(maxima) == 1
+    assert evaluations > 50 + maxima[0]['evaluations']
+
+    assert continuous_search(['sin_i2'], n_points=0, workers=1) == []
@@ -0,0 +1,39 @@
+"""Tests for the native H0 persistence engine (experiments/h0_persistence.py)."""
+
+import time
+
+import numpy as np
+from scipy.spatial.distance import pdist, squareform
+
+from h0_persistence import euclidean_mst, h0_persistence, h0_persistence_from_distance_matrix
+
+def clustered_points(n, n_clusters, seed=0, spread=0.05):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, 100, (n_clusters, 3))
+    return centers[rng.integers(0, n_clusters, n)] + rng.normal(0, spread, (n, 3))
+
+def test_clustered_mst_is_exact():
+    points = clustered_points(3000, 50)
+    expected = h0_persistence_from_distance_matrix(squareform(pdist(points)))
+    np.testing.assert_allclose(h0_persistence(points), expected)
+
+def test_duplicate_points_mst_is_exact():
+    points = np.repeat(np.random.default_rng(1).random((40, 3)), 50, axis=0)
+    expected = h0_persistence_from_distance_matrix(squareform(pdist(points)))
+    np.testing.assert_allclose(h0_persistence(points), expected)
+
+def test_clustered_mst_has_no_timing_cliff():
+    n = 50_000
+    uniform = np.random.default_rng(0).uniform(0, 100, (n, 3))
+    clustered = clustered_points(n, 500)
+
+    start = time.perf_counter()
+    euclidean_mst(uniform)
+    uniform_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    edges, _ = euclidean_mst(clustered)
+    clustered_time = time.perf_counter() - start
+
+    assert len(edges) == n - 1
+    assert clustered_time < 5 * uniform_time + 1.0
@@ -0,0 +1,32 @@
+"""Tests for the memory-mapped image store (experiments/image_store.py)."""
+
+import numpy as np
+
+from generators import generate_image
+from image_store import ImageStore, image_key
+from registry import GENERATORS, register_generator
+
+def test_redefined_generator_is_not_served_stale(tmp_path):
+    store = ImageStore(tmp_path)
+    original = GENERATORS['sin_i']
+    try:
+        first = np.array(store.get_or_generate('sin_i', 1.0, 4))
+        register_generator('sin_i', '128 + 127*cos(i*c)')
+        second = store.get_or_generate('sin_i', 1.0, 4)
+        np.testing.assert_array_equal(second, generate_image('sin_i', 1.0, 4))
+        assert not np.array_equal(first, second)
+    finally:
+        GENERATORS['sin_i'] = original
+
+    # Reloaded from disk, the original definition finds its own entry again
+    reopened = ImageStore(tmp_path)
+    np.testing.assert_array_equal(reopened.get('sin_i', 1.0, 4), first)
+    assert len(reopened) == 2
+
+def test_precision_is_part_of_the_key(tmp_path):
+    store = ImageStore(tmp_path)
+    assert image_key('sin_i2', 1.0, 4) != image_key('sin_i2', 1.0, 4, precision='high')
+
+    high = store.get_or_generate('sin_i2', 1.0, 4, precision='high')
+    np.testing.assert_array_equal(high, generate_image('sin_i2', 1.0, 4, precision='high'))
+    assert store.get('sin_i2', 1.0, 4) is None
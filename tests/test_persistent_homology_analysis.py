@@ -0,0 +1,19 @@
+"""Tests for the point-cloud homology backends (experiments/persistent_homology_analysis.py)."""
+
+import numpy as np
+
+from persistent_homology_analysis import (compute_persistence_metrics,
+                                          compute_persistent_homology_manual)
+from point_cloud import collapse_duplicate_points, multiplicity_metrics
+
+def test_multiplicity_metrics_describe_the_full_cloud():
+    rng = np.random.default_rng(0)
+    points = np.repeat(rng.random((300, 3)), rng.integers(1, 5, 300), axis=0)
+    unique, counts = collapse_duplicate_points(points)
+    expected = multiplicity_metrics(counts)
+
+    for sampling, seed in [('random', 0), ('maxmin', 3), ('density', 1)]:
+        result = compute_persistent_homology_manual(unique, sampling, seed, 50, counts)
+        metrics = compute_persistence_metrics(result)
+        assert {key: metrics[key] for key in expected} == expected
+        assert len(result['weights']) == result['n_points'] == 50
@@ -0,0 +1,43 @@
+"""Tests for the bootstrap p-value index (experiments/pvalue_index.py)."""
+
+import numpy as np
+
+from pvalue_index import PValueIndex
+
+def test_scalar_score_beyond_the_sample_max():
+    # Exponential null: unbounded fitted tail, so p stays positive past the max
+    null = np.random.default_rng(0).exponential(size=10_000)
+    index = PValueIndex(null, extrapolate_tail=True)
+    assert index.tail is not None
+
+    score = index.max_score + 1.0
+    p = index.pvalues(score)
+    assert np.ndim(p) == 0
+    assert 0.0 < p < 1.0 / index.n
+    assert p == index.pvalues([score])[0]
+
+    result = index.query(score)
+    assert np.ndim(result['p_values']) == 0
+    assert result['p_values'] == p
+    assert result['extrapolated']
+    assert result['bonferroni_alpha'] == 0.05
+
+def test_pvalues_keep_the_input_shape():
+    null = np.random.default_rng(1).normal(size=10_000)
+    index = PValueIndex(null)
+    scores = np.array([[-1.0, 0.0], [1.0, 10.0]])
+
+    p = index.pvalues(scores)
+    assert p.shape == scores.shape
+    np.testing.assert_array_equal(p[:, :1].ravel(), [np.mean(null >= -1.0), np.mean(null >= 1.0)])
+    assert index.query(scores)['q_bh'].shape == scores.shape
+
+def test_tail_extrapolation_is_opt_in():
+    null = np.random.default_rng(2).exponential(size=10_000)
+    index = PValueIndex(null)
+    assert index.tail is None
+
+    result = index.query([1.0, index.max_score + 1.0])
+    np.testing.assert_array_equal(result['p_values'], [np.mean(null >= 1.0), 0.0])
+    np.testing.assert_array_equal(result['extrapolated'], [False, False])
+    assert result['empirical_bound'] == 1.0 / (len(null) + 1)
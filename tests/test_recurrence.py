@@ -0,0 +1,24 @@
+"""Tests for the recurrence generation backend (experiments/recurrence.py)."""
+
+import numpy as np
+
+from generators import generate_digits
+from recurrence import RECURRENCE_GENERATORS, recurrence_values
+
+def test_recurrence_digits_match_the_reference():
+    n = 3 * 256 * 256
+    for generator in RECURRENCE_GENERATORS:
+        for constant in (np.pi, np.e):
+            for precision in ('float64', 'high'):
+                np.testing.assert_array_equal(
+                    generate_digits(generator, constant, n, start=1000, precision=precision,
+                                    method='recurrence'),
+                    generate_digits(generator, constant, n, start=1000, precision=precision))
+
+def test_float64_reference_uses_the_direct_kernel():
+    values, direct = recurrence_values('sin_i2', np.pi, 1000, reference='float64',
+                                       return_fallback=True)
+    assert direct == 1000
+    # c = e keeps values away from integers (unlike c = π, where sin(i·π) ≈ 0)
+    _, fallback = recurrence_values('sin_i2', np.e, 100_000, reference='high', return_fallback=True)
+    assert fallback < 100
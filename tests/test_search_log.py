@@ -0,0 +1,54 @@
+"""Tests for the top-N heap and the resumable search log (experiments/search_log.py)."""
+
+import pytest
+
+from parallel_search import parallel_search
+from registry import GENERATORS, register_generator
+from search_log import SearchLog, TopN
+
+def scored(total):
+    return {'score': {'total': total}}
+
+def test_top_n_keeps_the_best_and_accepts_zero():
+    top = TopN(2)
+    for index, total in enumerate([1.0, 3.0, 2.0, 3.0]):
+        top.push(index, scored(total))
+    assert [r['score']['total'] for r in top.results()] == [3.0, 3.0]
+
+    empty = TopN(0)
+    empty.push(0, scored(1.0))
+    assert empty.results() == []
+
+def test_error_records_are_retried_on_resume(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    with SearchLog(path, {'grid': 1}, 3) as log:
+        log.open()
+        log.write(0, scored(1.0))
+        log.write(1, {'name': 'broken', 'error': 'boom'})
+        assert list(log.done) == [True, False, False]
+
+    top = TopN(5)
+    with SearchLog(path, {'grid': 1}, 3) as log:
+        assert log.open(top) == 1
+        assert list(log.done) == [True, False, False]
+    assert len(top) == 1
+
+def test_parallel_search_with_top_n_zero(tmp_path):
+    results = parallel_search(constants={'pi': 3.141592653589793, 'e': 2.718281828459045},
+                              generators=['sin_i2', 'mod_i'], top_n=0, workers=1,
+                              log_file=tmp_path / 'log.jsonl')
+    assert results == []
+
+def test_resume_refuses_a_redefined_generator(tmp_path):
+    constants = {'pi': 3.141592653589793}
+    log_file = tmp_path / 'log.jsonl'
+    parallel_search(constants=constants, generators=['sin_i'], workers=1, log_file=log_file)
+
+    original = GENERATORS['sin_i']
+    try:
+        register_generator('sin_i', '128 + 127*cos(i*c)')
+        with pytest.raises(ValueError, match='expressions'):
+            parallel_search(constants=constants, generators=['sin_i'], workers=1,
+                            log_file=log_file)
+    finally:
+        GENERATORS['sin_i'] = original
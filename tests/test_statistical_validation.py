@@ -0,0 +1,23 @@
+"""Tests for the bootstrap null distribution (experiments/statistical_validation.py)."""
+
+import tracemalloc
+
+import numpy as np
+
+from statistical_validation import bootstrap_null_distribution
+
+def test_block_memory_stays_within_budget():
+    budget = 8 * 2**20
+    for resolution, n_samples in ((8, 20_000), (32, 2_000)):
+        tracemalloc.start()
+        null = bootstrap_null_distribution(n_samples, resolution, max_block_bytes=budget)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        outputs = sum(array.nbytes for array in null.values())
+        assert peak < budget + outputs
+
+def test_scores_do_not_depend_on_the_block_size():
+    full = bootstrap_null_distribution(300, 8, seed=3)
+    blocked = bootstrap_null_distribution(300, 8, seed=3, block_size=7)
+    np.testing.assert_array_equal(full['scores'], blocked['scores'])
@@ -0,0 +1,34 @@
+"""Tests for point-cloud subsampling (experiments/subsampling.py)."""
+
+import tracemalloc
+
+import numpy as np
+
+from subsampling import maxmin_landmarks, witness_distance_matrix
+
+def brute_force_witness(points, landmarks, nu):
+    D = np.linalg.norm(points[:, None, :] - points[landmarks][None, :, :], axis=2)
+    m = np.sort(D, axis=1)[:, nu - 1] if nu > 0 else np.zeros(len(points))
+    W = (np.maximum(D[:, :, None], D[:, None, :]) - m[:, None, None]).min(axis=0)
+    W = np.maximum(W, 0.0)
+    np.fill_diagonal(W, 0.0)
+    return W
+
+def test_witness_matrix_matches_brute_force():
+    points = np.random.default_rng(0).random((600, 3))
+    landmarks, _ = maxmin_landmarks(points, 40, 0)
+    for nu in (0, 1, 2):
+        np.testing.assert_allclose(witness_distance_matrix(points, landmarks, nu, block_bytes=2**16),
+                                   brute_force_witness(points, landmarks, nu))
+
+def test_witness_matrix_memory_is_independent_of_witnesses():
+    points = np.random.default_rng(1).random((20_000, 3))
+    landmarks, _ = maxmin_landmarks(points, 300, 0)
+
+    tracemalloc.start()
+    witness_distance_matrix(points, landmarks, block_bytes=4 * 2**20)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # A dense N×L matrix alone would be 48 MB
+    assert peak < 16 * 2**20